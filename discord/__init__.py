@@ -48,7 +48,9 @@ from .enums import *
 from .embeds import *
 from .mentions import *
 from .shard import *
+from .cluster import *
 from .player import *
+from .receiver import *
 from .webhook import *
 from .voice_client import *
 from .audit_logs import *
@@ -60,6 +62,7 @@ from .interactions import *
 from .components import *
 from .threads import *
 from .application import *
+from .journal import *
 
 
 class VersionInfo(NamedTuple):
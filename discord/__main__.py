@@ -282,6 +282,303 @@ def add_newcog_args(subparser):
     parser.add_argument('--hide-commands', help='whether to hide all commands in the cog', action='store_true')
     parser.add_argument('--full', help='add all special methods as well', action='store_true')
 
+def bench_gateway(parser, args):
+    import asyncio
+    import json
+    from discord.testing.bench import run_gateway_benchmark
+
+    reports = []
+    for guilds in args.guilds:
+        coro = run_gateway_benchmark(
+            guilds,
+            members=args.members,
+            channels=args.channels,
+            messages=args.messages,
+            compress=not args.no_compress,
+            memory=not args.no_memory,
+        )
+        report = asyncio.run(coro)
+        reports.append(report)
+        if not args.json:
+            fmt = '{guilds:>7} guilds: {events_per_second:>9.0f} events/s, p50 {p50_us:.1f}us, p99 {p99_us:.1f}us'
+            line = fmt.format(**report)
+            if 'bytes_per_guild' in report:
+                line += f', {report["bytes_per_guild"]:.0f} B/guild'
+            if 'bytes_per_member' in report:
+                line += f', {report["bytes_per_member"]:.0f} B/member'
+            print(line)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_http(parser, args):
+    import asyncio
+    import json
+    from discord.testing.bench import run_http_benchmark
+
+    coro = run_http_benchmark(
+        channels=args.channels,
+        messages=args.messages,
+        edits=args.edits,
+        reactions=args.reactions,
+        global_limit=args.global_limit,
+        time_scale=args.time_scale,
+        latency=args.latency,
+    )
+    report = asyncio.run(coro)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    fmt = (
+        '{operations} operations over {channels} channels: {operations_per_second:.1f} ops/s, '
+        '{rate_limited_ratio:.2%} 429s ({rate_limited} bucket, {global_rate_limited} global), '
+        'p50 {p50_ms:.1f}ms, p99 {p99_ms:.1f}ms, queued p99 {queue_p99_ms:.1f}ms'
+    )
+    print(fmt.format(**report))
+
+def bench_shards(parser, args):
+    import asyncio
+    import json
+    from discord.testing.bench import run_shard_benchmark
+
+    reports = []
+    for threads in args.threads:
+        coro = run_shard_benchmark(
+            args.guilds,
+            shards=args.shards,
+            threads=threads,
+            members=args.members,
+            messages=args.messages,
+            handler_cost=args.handler_cost / 1e6,
+            compress=not args.no_compress,
+        )
+        report = asyncio.run(coro)
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{shards} shards, {threads} threads: {events} events in {wall_seconds:.2f}s, '
+                '{events_per_second:.0f} events/s, loop lag p50 {loop_lag_p50_ms:.1f}ms, p99 {loop_lag_p99_ms:.1f}ms'
+            )
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_voice(parser, args):
+    import asyncio
+    import json
+    from discord.testing.bench import run_voice_benchmark
+
+    reports = []
+    for streams in args.streams:
+        coro = run_voice_benchmark(streams, seconds=args.seconds, threads=args.threads, frame_size=args.frame_size)
+        report = asyncio.run(coro)
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{streams:>5} streams: {cpu_percent_per_stream:.3f}% CPU/stream, {frames}/{frames_expected} frames, '
+                'late p50 {late_p50_ms:.2f}ms, p99 {late_p99_ms:.2f}ms, {received} received, {lost} lost'
+            )
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_receive(parser, args):
+    import asyncio
+    import json
+    from discord import opus
+    from discord.testing.bench import run_receive_benchmark
+
+    if args.libopus:
+        opus.load_opus(args.libopus)
+
+    reports = []
+    for speakers in args.speakers:
+        coro = run_receive_benchmark(
+            speakers,
+            seconds=args.seconds,
+            threads=args.threads,
+            mode=args.mode,
+            loss=args.loss,
+            reorder=args.reorder,
+        )
+        report = asyncio.run(coro)
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{speakers:>5} speakers: {cpu_percent_per_speaker:.3f}% CPU/speaker, {frames}/{frames_expected} frames, '
+                '{lost} lost, latency p50 {latency_p50_ms:.2f}ms, p99 {latency_p99_ms:.2f}ms, '
+                'loop lag p99 {loop_lag_p99_ms:.2f}ms'
+            )
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_stringview(parser, args):
+    import json
+    from discord.testing.bench import run_stringview_benchmark
+
+    reports = []
+    for arguments in args.arguments:
+        report = run_stringview_benchmark(arguments=arguments, seconds=args.seconds)
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{arguments:>6} arguments ({characters} chars): {parse_ms:.2f}ms to parse, '
+                '{parse_us_per_argument:.2f}us/argument, {reparse_ms:.2f}ms reading every argument twice'
+            )
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_views(parser, args):
+    import asyncio
+    import json
+    from discord.testing.bench import run_views_benchmark
+
+    reports = []
+    for views in args.views:
+        report = asyncio.run(run_views_benchmark(views, dispatches=args.dispatches))
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{views:>7} views: add {add_us_per_view:.2f}us/view ({add_seconds:.2f}s), dispatch {dispatch_us:.2f}us, '
+                'stop {stop_us:.2f}us, {tasks_alive} task(s) alive, {keys_left} keys left after stopping'
+            )
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_crypto(parser, args):
+    import json
+    from discord.testing.bench import run_crypto_benchmark
+
+    reports = []
+    for mode in args.modes:
+        report = run_crypto_benchmark(mode, seconds=args.seconds, frame_size=args.frame_size)
+        reports.append(report)
+        if not args.json:
+            fmt = '{mode:>24}: {packets_per_second:>9.0f} packets/s per core, {us_per_packet:.2f}us/packet'
+            print(fmt.format(**report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def bench_pcm(parser, args):
+    import json
+    from discord.pcm import HAS_AUDIOOP, HAS_NUMPY
+    from discord.testing.bench import run_pcm_benchmark
+
+    reports = []
+    backends = []
+    if HAS_NUMPY and not args.no_numpy:
+        backends.append(('numpy', True, False))
+    if HAS_AUDIOOP:
+        backends.append(('audioop', False, True))
+    backends.append(('python', False, False))
+    for backend, use_numpy, use_audioop in backends:
+        report = run_pcm_benchmark(
+            sources=args.sources, seconds=args.seconds, use_numpy=use_numpy, use_audioop=use_audioop
+        )
+        reports.append(report)
+        if not args.json:
+            fmt = (
+                '{backend:>7}: volume {volume_us:.1f}us, fade {fade_us:.1f}us, mix of {sources} {mix_us:.1f}us, '
+                'resample 44.1KHz {resample_44100_stereo_us:.1f}us, 16KHz mono {resample_16000_mono_us:.1f}us per frame'
+            )
+            print(fmt.format(backend=backend, **report))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+def add_bench_args(subparser):
+    parser = subparser.add_parser('bench', help='runs offline performance benchmarks')
+    bench_subparser = parser.add_subparsers(dest='target', title='targets')
+
+    gateway = bench_subparser.add_parser('gateway', help='measures gateway event parsing against a fake gateway')
+    gateway.set_defaults(func=bench_gateway)
+    gateway.add_argument('--guilds', help='the guild counts to run at (default: 1000 10000)', type=int, nargs='+', default=[1000, 10000])
+    gateway.add_argument('--members', help='the members per guild (default: 10)', type=int, default=10)
+    gateway.add_argument('--channels', help='the channels per guild (default: 5)', type=int, default=5)
+    gateway.add_argument('--messages', help='the messages sent after startup (default: 10000)', type=int, default=10000)
+    gateway.add_argument('--no-compress', help='disable zlib-stream compression', action='store_true', dest='no_compress')
+    gateway.add_argument('--no-memory', help='skip the memory measurements', action='store_true', dest='no_memory')
+    gateway.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    http = bench_subparser.add_parser('http', help='measures HTTPClient rate limit handling against a fake API')
+    http.set_defaults(func=bench_http)
+    http.add_argument('--channels', help='the channels to spread the load over (default: 10)', type=int, default=10)
+    http.add_argument('--messages', help='the messages sent per channel (default: 20)', type=int, default=20)
+    http.add_argument('--edits', help='the edits per channel (default: 20)', type=int, default=20)
+    http.add_argument('--reactions', help='the reactions per channel (default: 20)', type=int, default=20)
+    http.add_argument('--global-limit', help='the global requests per second (default: 50)', type=int, default=50, dest='global_limit')
+    http.add_argument('--time-scale', help='the factor applied to rate limit windows (default: 0.1)', type=float, default=0.1, dest='time_scale')
+    http.add_argument('--latency', help='the simulated response latency in seconds (default: 0)', type=float, default=0.0)
+    http.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    shards = bench_subparser.add_parser('shards', help='measures AutoShardedClient with and without shard threads')
+    shards.set_defaults(func=bench_shards)
+    shards.add_argument('--guilds', help='the number of guilds (default: 4000)', type=int, default=4000)
+    shards.add_argument('--shards', help='the number of shards (default: 4)', type=int, default=4)
+    shards.add_argument('--threads', help='the shard thread counts to run with (default: 0 2 4)', type=int, nargs='+', default=[0, 2, 4])
+    shards.add_argument('--members', help='the members per guild (default: 10)', type=int, default=10)
+    shards.add_argument('--messages', help='the messages sent after startup (default: 20000)', type=int, default=20000)
+    shards.add_argument('--handler-cost', help='the CPU time an on_message handler takes in microseconds (default: 0)', type=float, default=0.0, dest='handler_cost')
+    shards.add_argument('--no-compress', help='disable zlib-stream compression', action='store_true', dest='no_compress')
+    shards.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    voice = bench_subparser.add_parser('voice', help='measures audio sending against a local UDP sink')
+    voice.set_defaults(func=bench_voice)
+    voice.add_argument('--streams', help='the stream counts to run at (default: 10 100 1000)', type=int, nargs='+', default=[10, 100, 1000])
+    voice.add_argument('--seconds', help='how long to play for (default: 5)', type=float, default=5.0)
+    voice.add_argument('--threads', help='the threads of the audio scheduler (default: 2)', type=int, default=2)
+    voice.add_argument('--frame-size', help='the size of every opus frame (default: 120)', type=int, default=120, dest='frame_size')
+    voice.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    receive = bench_subparser.add_parser('receive', help='measures voice receiving and decoding against a local packet generator')
+    receive.set_defaults(func=bench_receive)
+    receive.add_argument('--speakers', help='the speaker counts to run at (default: 10 50 200)', type=int, nargs='+', default=[10, 50, 200])
+    receive.add_argument('--seconds', help='how long to send audio for (default: 5)', type=float, default=5.0)
+    receive.add_argument('--threads', help='the decoder threads of the receiver (default: 2)', type=int, default=2)
+    receive.add_argument('--mode', help='the encryption mode (default: xsalsa20_poly1305_lite)', default='xsalsa20_poly1305_lite',
+                         choices=['xsalsa20_poly1305_lite', 'xsalsa20_poly1305_suffix', 'xsalsa20_poly1305'])
+    receive.add_argument('--loss', help='the chance of a packet being dropped (default: 0)', type=float, default=0.0)
+    receive.add_argument('--reorder', help='the chance of a packet arriving late (default: 0)', type=float, default=0.0)
+    receive.add_argument('--libopus', help='the path of the opus library to load, if it is not found on its own')
+    receive.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    stringview = bench_subparser.add_parser('stringview', help='measures command argument parsing of long messages')
+    stringview.set_defaults(func=bench_stringview)
+    stringview.add_argument('--arguments', help='the argument counts to run at (default: 100 2000 20000)', type=int, nargs='+', default=[100, 2000, 20000])
+    stringview.add_argument('--seconds', help='how long to repeat every parse for (default: 1)', type=float, default=1.0)
+    stringview.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    views = bench_subparser.add_parser('views', help='measures the view store with many live views')
+    views.set_defaults(func=bench_views)
+    views.add_argument('--views', help='the view counts to run at (default: 1000 10000 100000)', type=int, nargs='+', default=[1000, 10000, 100000])
+    views.add_argument('--dispatches', help='the number of interactions to dispatch (default: 10000)', type=int, default=10000)
+    views.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    pcm = bench_subparser.add_parser('pcm', help='measures the per frame cost of the PCM transformers')
+    pcm.set_defaults(func=bench_pcm)
+    pcm.add_argument('--sources', help='the number of sources to mix (default: 4)', type=int, default=4)
+    pcm.add_argument('--seconds', help='how long to repeat every operation for (default: 1)', type=float, default=1.0)
+    pcm.add_argument('--no-numpy', help='only measure the fallbacks used without NumPy', action='store_true', dest='no_numpy')
+    pcm.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    crypto = bench_subparser.add_parser('crypto', help='measures voice packet encryption for every mode')
+    crypto.set_defaults(func=bench_crypto)
+    modes = ['xsalsa20_poly1305_lite', 'xsalsa20_poly1305_suffix', 'xsalsa20_poly1305']
+    crypto.add_argument('--modes', help='the encryption modes to run (default: all)', nargs='+', choices=modes, default=modes)
+    crypto.add_argument('--seconds', help='how long to run every mode for (default: 2)', type=float, default=2.0)
+    crypto.add_argument('--frame-size', help='the size of every opus frame (default: 120)', type=int, default=120, dest='frame_size')
+    crypto.add_argument('--json', help='print the results as JSON', action='store_true')
+
 def parse_args():
     parser = argparse.ArgumentParser(prog='discord', description='Tools for helping with dis.py')
     parser.add_argument('-v', '--version', action='store_true', help='shows the library version')
@@ -290,6 +587,7 @@ def parse_args():
     subparser = parser.add_subparsers(dest='subcommand', title='subcommands')
     add_newbot_args(subparser)
     add_newcog_args(subparser)
+    add_bench_args(subparser)
     return parser, parser.parse_args()
 
 def main():
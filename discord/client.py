@@ -58,6 +58,7 @@ from .webhook import Webhook
 from .iterators import GuildIterator
 from .appinfo import AppInfo
 from .ui.view import View
+from .ui.router import ComponentRouter
 from .stage_instance import StageInstance
 from .threads import Thread
 from .sticker import GuildSticker, StandardSticker, StickerPack, _sticker_factory
@@ -192,6 +193,13 @@ class Client:
         this is ``False`` then those events will not be dispatched (due to performance considerations).
         To enable these events, this must be set to ``True``. Defaults to ``False``.
 
+        .. versionadded:: 2.0
+    event_journal: Optional[:class:`EventJournal`]
+        A journal that every gateway dispatch is appended to. If the journal
+        holds a resumable session when connecting, the cache is rebuilt from it
+        and the session is RESUMED rather than identifying again.
+        :func:`on_ready` is then dispatched once the RESUME succeeds.
+
         .. versionadded:: 2.0
 
     Attributes
@@ -245,6 +253,9 @@ class Client:
     def _get_websocket(self, guild_id: Optional[int] = None, *, shard_id: Optional[int] = None) -> DiscordWebSocket:
         return self.ws
 
+    async def _ws_connect(self, gateway: str, shard_id: Optional[int] = None) -> Any:
+        return await self.http.ws_connect(gateway)
+
     def _get_state(self, **options: Any) -> ConnectionState:
         return ConnectionState(dispatch=self.dispatch, handlers=self._handlers,
                                hooks=self._hooks, http=self.http, loop=self.loop, **options)
@@ -504,6 +515,11 @@ class Client:
             'initial': True,
             'shard_id': self.shard_id,
         }
+        journaled = self._connection._resume_from_journal(self.shard_id)
+        if journaled is not None:
+            session, sequence = journaled
+            ws_params.update(session=session, sequence=sequence, resume=True)
+
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
@@ -575,8 +591,14 @@ class Client:
                 # if an error happens during disconnects, disregard it.
                 pass
 
+        journal = self._connection._journal
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            # closing with 1000 ends the session, which would make
+            # the journaled session impossible to resume
+            await self.ws.close(code=4000 if journal is not None else 1000)
+
+        if journal is not None:
+            journal.flush()
 
         await self.http.close()
         self._ready.clear()
@@ -1711,3 +1733,51 @@ class Client:
         .. versionadded:: 2.0
         """
         return self._connection.persistent_views
+
+    def add_component_router(self, router: ComponentRouter) -> None:
+        """Registers a :class:`~discord.ui.ComponentRouter` for dispatching.
+
+        Component interactions that do not belong to a view added to the
+        client are matched against the routes of every registered router,
+        in the order the routers were added.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ------------
+        router: :class:`discord.ui.ComponentRouter`
+            The router to register for dispatching.
+
+        Raises
+        -------
+        TypeError
+            A router was not passed.
+        """
+
+        if not isinstance(router, ComponentRouter):
+            raise TypeError(f'expected an instance of ComponentRouter not {router.__class__!r}')
+
+        self._connection.store_component_router(router)
+
+    def remove_component_router(self, router: ComponentRouter) -> None:
+        """Removes a :class:`~discord.ui.ComponentRouter` from dispatching.
+
+        If the router is not registered then this does nothing.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ------------
+        router: :class:`discord.ui.ComponentRouter`
+            The router to remove from dispatching.
+        """
+
+        self._connection.remove_component_router(router)
+
+    @property
+    def component_routers(self) -> Sequence[ComponentRouter]:
+        """Sequence[:class:`~discord.ui.ComponentRouter`]: A sequence of component routers added to the client.
+
+        .. versionadded:: 2.0
+        """
+        return self._connection.component_routers
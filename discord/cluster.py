@@ -0,0 +1,755 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import inspect
+import itertools
+import logging
+import multiprocessing
+import os
+import secrets
+import struct
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union, TYPE_CHECKING
+
+from . import utils
+from .backoff import ExponentialBackoff
+from .errors import ClientException
+from .gateway import IdentifyRatelimiter
+from .utils import MISSING
+from .http import HTTPClient, Route
+
+if TYPE_CHECKING:
+    from .shard import AutoShardedClient
+
+    ClientFactory = Callable[['Cluster'], AutoShardedClient]
+    Handler = Callable[..., Union[Any, Awaitable[Any]]]
+
+__all__ = (
+    'Cluster',
+    'ClusterLauncher',
+)
+
+_log = logging.getLogger(__name__)
+
+H = TypeVar('H', bound='Handler')
+
+_FRAME = struct.Struct('>I')
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    header = await reader.readexactly(_FRAME.size)
+    body = await reader.readexactly(_FRAME.unpack(header)[0])
+    return utils._from_json(body)
+
+
+def _write_frame(writer: asyncio.StreamWriter, payload: Dict[str, Any]) -> None:
+    try:
+        data = utils._to_json(payload).encode('utf-8')
+    except TypeError:
+        # results of user handlers might not be serialisable
+        payload['data'] = repr(payload.get('data'))
+        data = utils._to_json(payload).encode('utf-8')
+    writer.write(_FRAME.pack(len(data)) + data)
+
+
+def _split_shards(shard_ids: Sequence[int], clusters: int) -> List[List[int]]:
+    size, extra = divmod(len(shard_ids), clusters)
+    ranges = []
+    start = 0
+    for index in range(clusters):
+        end = start + size + (index < extra)
+        ranges.append(list(shard_ids[start:end]))
+        start = end
+    return [shards for shards in ranges if shards]
+
+
+class _Peer:
+    __slots__ = ('cluster_id', 'reader', 'writer')
+
+    def __init__(self, cluster_id: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.cluster_id: int = cluster_id
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+
+
+class _Calls:
+    # request/response bookkeeping shared by both ends of the IPC channel
+    def __init__(self) -> None:
+        self._nonces = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    def create(self) -> Tuple[int, asyncio.Future]:
+        nonce = next(self._nonces)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[nonce] = future
+        return nonce, future
+
+    def discard(self, nonce: int) -> None:
+        self._pending.pop(nonce, None)
+
+    def resolve(self, payload: Dict[str, Any]) -> None:
+        future = self._pending.pop(payload['nonce'], None)
+        if future is None or future.done():
+            return
+        if 'error' in payload:
+            future.set_exception(ClientException(payload['error']))
+        else:
+            future.set_result(payload.get('data'))
+
+    def cancel_all(self) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ClientException('IPC connection closed'))
+        self._pending.clear()
+
+
+class Cluster:
+    """The view a worker process has of the cluster it belongs to.
+
+    An instance is handed to the client factory of a :class:`ClusterLauncher`,
+    which should create an :class:`AutoShardedClient` that launches
+    :attr:`shard_ids` out of :attr:`shard_count`.
+
+    Queries are answered by named handlers that every cluster registers.
+    ``guild_count``, ``guild`` and ``eval`` are built in, and more can be
+    added with :meth:`handler`. Handler arguments and results travel as
+    JSON; results that cannot be serialised are sent as their :func:`repr`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    id: :class:`int`
+        The ID of this cluster.
+    shard_ids: List[:class:`int`]
+        The shards this cluster is responsible for.
+    shard_count: :class:`int`
+        The total number of shards across every cluster.
+    clusters: Dict[:class:`int`, List[:class:`int`]]
+        The shards of every cluster, keyed by cluster ID.
+    client: Optional[:class:`AutoShardedClient`]
+        The client created for this cluster.
+    """
+
+    def __init__(self, cluster_id: int, shard_ids: List[int], shard_count: int, address: Tuple[str, int], secret: str) -> None:
+        self.id: int = cluster_id
+        self.shard_ids: List[int] = shard_ids
+        self.shard_count: int = shard_count
+        self.clusters: Dict[int, List[int]] = {}
+        self.client: Optional[AutoShardedClient] = None
+
+        self._address: Tuple[str, int] = address
+        self._secret: str = secret
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._calls: _Calls = _Calls()
+        self._handlers: Dict[str, Handler] = {
+            'guild_count': self._guild_count,
+            'guild': self._guild,
+            'eval': self._eval,
+        }
+
+    def __repr__(self) -> str:
+        return f'<Cluster id={self.id} shard_ids={self.shard_ids} shard_count={self.shard_count}>'
+
+    async def _connect(self) -> None:
+        reader, writer = await asyncio.open_connection(*self._address)
+        _write_frame(writer, {'op': 'hello', 'cluster': self.id, 'secret': self._secret})
+        await writer.drain()
+        ready = await _read_frame(reader)
+        self.clusters = {int(key): value for key, value in ready['clusters'].items()}
+        self._writer = writer
+        self._reader_task = asyncio.create_task(self._read(reader))
+
+    def _attach(self, client: AutoShardedClient) -> None:
+        self.client = client
+        # the launcher spaces out IDENTIFYs across every process instead of the client
+        client._hooks['before_identify'] = self._before_identify
+
+    async def _close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        self._calls.cancel_all()
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                op = payload.get('op')
+                if op == 'reply':
+                    self._calls.resolve(payload)
+                elif op == 'call':
+                    asyncio.create_task(self._answer(payload))
+                elif op == 'close':
+                    if self.client is not None:
+                        asyncio.create_task(self.client.close())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            _log.warning('Cluster %s lost its connection to the launcher.', self.id)
+            self._calls.cancel_all()
+            if self.client is not None and not self.client.is_closed():
+                await self.client.close()
+
+    async def _answer(self, payload: Dict[str, Any]) -> None:
+        reply: Dict[str, Any] = {'op': 'reply', 'nonce': payload['nonce']}
+        try:
+            handler = self._handlers[payload['name']]
+        except KeyError:
+            reply['error'] = f'cluster {self.id} has no handler named {payload["name"]!r}'
+        else:
+            try:
+                result = handler(*payload.get('args', ()))
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as exc:
+                reply['error'] = f'{exc.__class__.__name__}: {exc}'
+            else:
+                reply['data'] = result
+
+        if self._writer is not None:
+            _write_frame(self._writer, reply)
+
+    async def _send(self, payload: Dict[str, Any], timeout: Optional[float]) -> Any:
+        if self._writer is None:
+            raise ClientException('Cluster is not connected to its launcher')
+
+        nonce, future = self._calls.create()
+        payload['nonce'] = nonce
+        _write_frame(self._writer, payload)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._calls.discard(nonce)
+
+    async def _before_identify(self, shard_id: Optional[int], *, initial: bool = False) -> None:
+        await self._send({'op': 'identify', 'shard_id': shard_id or 0}, None)
+        if self.client is not None:
+            await self.client.before_identify_hook(shard_id, initial=initial)
+
+    def cluster_for(self, guild_id: int) -> int:
+        """Returns the ID of the cluster a guild belongs to.
+
+        Parameters
+        -----------
+        guild_id: :class:`int`
+            The guild ID.
+
+        Returns
+        --------
+        :class:`int`
+            The cluster ID.
+
+        Raises
+        -------
+        ValueError
+            No cluster owns the shard of the guild.
+        """
+        shard_id = (guild_id >> 22) % self.shard_count
+        for cluster_id, shard_ids in self.clusters.items():
+            if shard_id in shard_ids:
+                return cluster_id
+        raise ValueError(f'no cluster owns shard {shard_id}')
+
+    def handler(self, name: str) -> Callable[[H], H]:
+        """A decorator that registers a query handler under ``name``.
+
+        The handler can be a regular function or a coroutine function.
+
+        Parameters
+        -----------
+        name: :class:`str`
+            The name the handler is requested by.
+        """
+
+        def decorator(func: H) -> H:
+            self._handlers[name] = func
+            return func
+
+        return decorator
+
+    def remove_handler(self, name: str) -> None:
+        """Removes a query handler.
+
+        Parameters
+        -----------
+        name: :class:`str`
+            The name of the handler.
+        """
+        self._handlers.pop(name, None)
+
+    async def request(self, name: str, *args: Any, cluster: Optional[int] = None, timeout: Optional[float] = 30.0) -> Any:
+        """|coro|
+
+        Runs a handler on other clusters.
+
+        Parameters
+        -----------
+        name: :class:`str`
+            The name of the handler.
+        \\*args
+            The arguments passed to the handler.
+        cluster: Optional[:class:`int`]
+            The cluster to run the handler on. If not given, it runs on every
+            cluster, including this one.
+        timeout: Optional[:class:`float`]
+            How long to wait for the results.
+
+        Raises
+        -------
+        ClientException
+            The handler failed or does not exist.
+        asyncio.TimeoutError
+            The clusters did not answer in time.
+
+        Returns
+        --------
+        Any
+            The result of the handler, or a list of the results ordered by
+            cluster ID if ``cluster`` is not given.
+        """
+        return await self._send({'op': 'request', 'name': name, 'args': list(args), 'target': cluster}, timeout)
+
+    async def guild_count(self) -> int:
+        """|coro|
+
+        Returns the number of guilds cached across every cluster.
+        """
+        counts = await self.request('guild_count')
+        return sum(counts)
+
+    async def broadcast_eval(self, expression: str, *, timeout: Optional[float] = 30.0) -> List[Any]:
+        """|coro|
+
+        Evaluates a Python expression on every cluster.
+
+        The expression can use ``client``, ``cluster`` and ``discord``. If it
+        evaluates to an awaitable, the awaitable is awaited.
+
+        Parameters
+        -----------
+        expression: :class:`str`
+            The expression to evaluate.
+        timeout: Optional[:class:`float`]
+            How long to wait for the results.
+
+        Returns
+        --------
+        List[Any]
+            The results ordered by cluster ID.
+        """
+        return await self.request('eval', expression, timeout=timeout)
+
+    async def fetch_guild(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """|coro|
+
+        Retrieves a summary of a guild from the cluster that has it cached.
+
+        Parameters
+        -----------
+        guild_id: :class:`int`
+            The guild ID.
+
+        Returns
+        --------
+        Optional[Dict[:class:`str`, Any]]
+            The ``id``, ``name``, ``member_count``, ``shard_id`` and
+            ``cluster_id`` of the guild, or ``None`` if it is not cached.
+        """
+        return await self.request('guild', guild_id, cluster=self.cluster_for(guild_id))
+
+    def _guild_count(self) -> int:
+        return len(self.client.guilds) if self.client is not None else 0
+
+    def _guild(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        guild = self.client and self.client.get_guild(guild_id)
+        if guild is None:
+            return None
+        return {
+            'id': guild.id,
+            'name': guild.name,
+            'member_count': guild.member_count,
+            'shard_id': guild.shard_id,
+            'cluster_id': self.id,
+        }
+
+    async def _eval(self, expression: str) -> Any:
+        import discord
+
+        result = eval(expression, {'client': self.client, 'cluster': self, 'discord': discord})
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def _run_cluster(
+    factory: ClientFactory,
+    token: str,
+    cluster_id: int,
+    shard_ids: List[int],
+    shard_count: int,
+    address: Tuple[str, int],
+    secret: str,
+    api_base: Optional[str],
+) -> None:
+    async def runner() -> None:
+        cluster = Cluster(cluster_id, shard_ids, shard_count, address, secret)
+        await cluster._connect()
+        client = factory(cluster)
+        cluster._attach(client)
+        if api_base is not None:
+            client.http.api_base = api_base
+
+        try:
+            await client.start(token)
+        finally:
+            if not client.is_closed():
+                await client.close()
+            await cluster._close()
+
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        pass
+
+
+class ClusterLauncher:
+    """Runs the shards of a bot across multiple processes.
+
+    Every cluster is a process owning a contiguous range of shards, with its
+    own :class:`AutoShardedClient` created by ``factory``. The launcher
+    process does not connect to the gateway itself. Its jobs are:
+
+    - spacing out the IDENTIFYs of every cluster according to
+      ``max_concurrency``
+    - relaying queries between clusters, see :meth:`Cluster.request`
+    - restarting clusters that exit unexpectedly
+
+    The IPC channel listens on the loopback interface and requires a secret
+    that is only handed to the clusters.
+
+    ``factory`` is called in the cluster process with its :class:`Cluster`,
+    so it has to be picklable, e.g. a function defined at module level.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    factory: Callable[[:class:`Cluster`], :class:`AutoShardedClient`]
+        Creates the client of a cluster. The client must be created with
+        ``shard_ids=cluster.shard_ids`` and ``shard_count=cluster.shard_count``.
+    token: :class:`str`
+        The bot token.
+    clusters: Optional[:class:`int`]
+        The number of processes. Defaults to the number of CPUs.
+    shard_count: Optional[:class:`int`]
+        The total number of shards. If not given, it is fetched from Discord
+        along with ``max_concurrency``.
+    max_concurrency: Optional[:class:`int`]
+        The number of shards that may IDENTIFY at the same time.
+    identify_delay: :class:`float`
+        The number of seconds between IDENTIFYs of the same bucket.
+    api_base: Optional[:class:`str`]
+        The base URL of the REST API, for use with a local stand-in.
+    restart: :class:`bool`
+        Whether clusters that exit unexpectedly are restarted. A cluster
+        whose client was closed exits cleanly and is not restarted.
+    """
+
+    def __init__(
+        self,
+        factory: ClientFactory,
+        token: str,
+        *,
+        clusters: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        identify_delay: float = 5.0,
+        api_base: Optional[str] = None,
+        restart: bool = True,
+    ) -> None:
+        self.factory: ClientFactory = factory
+        self.token: str = token
+        self.cluster_count: int = clusters or os.cpu_count() or 1
+        self.shard_count: Optional[int] = shard_count
+        self.max_concurrency: Optional[int] = max_concurrency
+        self.identify_delay: float = identify_delay
+        self.api_base: Optional[str] = api_base
+        self.restart: bool = restart
+        self.clusters: Dict[int, List[int]] = {}
+
+        self._secret: str = secrets.token_hex(16)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._address: Optional[Tuple[str, int]] = None
+        self._identify_ratelimiter: Optional[IdentifyRatelimiter] = None
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._monitors: List[asyncio.Task] = []
+        self._peers: Dict[int, _Peer] = {}
+        self._calls: _Calls = _Calls()
+        self._closing: bool = False
+        self._connected: asyncio.Event = MISSING
+
+    async def _fetch_gateway(self) -> None:
+        http = HTTPClient(loop=asyncio.get_running_loop())
+        if self.api_base is not None:
+            http.api_base = self.api_base
+        http.token = self.token
+        http.recreate()
+        try:
+            data = await http.request(Route('GET', '/gateway/bot'))
+        finally:
+            await http.close()
+
+        if self.shard_count is None:
+            self.shard_count = data['shards']
+        if self.max_concurrency is None:
+            self.max_concurrency = data.get('session_start_limit', {}).get('max_concurrency', 1)
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts the IPC channel and spawns every cluster.
+        """
+        if self.shard_count is None or self.max_concurrency is None:
+            await self._fetch_gateway()
+
+        self._connected = asyncio.Event()
+        self._identify_ratelimiter = IdentifyRatelimiter(self.max_concurrency or 1, self.identify_delay)
+        self._server = await asyncio.start_server(self._handle_peer, '127.0.0.1', 0)
+        self._address = self._server.sockets[0].getsockname()[:2]
+
+        ranges = _split_shards(range(self.shard_count), self.cluster_count)  # type: ignore
+        self.clusters = dict(enumerate(ranges))
+        for cluster_id in self.clusters:
+            self._spawn(cluster_id)
+            self._monitors.append(asyncio.create_task(self._monitor(cluster_id)))
+
+        _log.info('Launched %d clusters for %d shards.', len(self.clusters), self.shard_count)
+
+    def _spawn(self, cluster_id: int) -> None:
+        context = multiprocessing.get_context('spawn')
+        args = (
+            self.factory,
+            self.token,
+            cluster_id,
+            self.clusters[cluster_id],
+            self.shard_count,
+            self._address,
+            self._secret,
+            self.api_base,
+        )
+        process = context.Process(target=_run_cluster, args=args, name=f'cluster-{cluster_id}')
+        process.start()
+        self._processes[cluster_id] = process
+
+    async def _monitor(self, cluster_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        backoff = ExponentialBackoff()
+        while True:
+            process = self._processes[cluster_id]
+            await loop.run_in_executor(None, process.join)
+            if self._closing:
+                return
+
+            self._peers.pop(cluster_id, None)
+            if process.exitcode == 0:
+                # the client was closed on purpose
+                _log.info('Cluster %s has shut down.', cluster_id)
+                return
+
+            if not self.restart:
+                _log.warning('Cluster %s exited with code %s.', cluster_id, process.exitcode)
+                return
+
+            retry = backoff.delay()
+            _log.warning('Cluster %s exited with code %s, restarting in %.2fs.', cluster_id, process.exitcode, retry)
+            await asyncio.sleep(retry)
+            if self._closing:
+                return
+            self._spawn(cluster_id)
+
+    async def _handle_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = await asyncio.wait_for(_read_frame(reader), timeout=10.0)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            writer.close()
+            return
+
+        if not isinstance(hello, dict):
+            writer.close()
+            return
+
+        secret = str(hello.get('secret', ''))
+        if hello.get('op') != 'hello' or not hmac.compare_digest(secret, self._secret):
+            _log.warning('Rejected an IPC connection with an invalid secret.')
+            writer.close()
+            return
+
+        cluster_id = hello.get('cluster')
+        if type(cluster_id) is not int or cluster_id not in self.clusters:
+            _log.warning('Rejected an IPC connection for unknown cluster %r.', cluster_id)
+            writer.close()
+            return
+
+        self._peers[cluster_id] = peer = _Peer(cluster_id, reader, writer)
+        clusters = {str(key): shard_ids for key, shard_ids in self.clusters.items()}
+        _write_frame(writer, {'op': 'ready', 'clusters': clusters})
+        if len(self._peers) == len(self.clusters):
+            self._connected.set()
+
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                op = payload.get('op')
+                if op == 'reply':
+                    self._calls.resolve(payload)
+                elif op == 'identify':
+                    asyncio.create_task(self._identify(peer, payload))
+                elif op == 'request':
+                    asyncio.create_task(self._relay(peer, payload))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._peers.get(cluster_id) is peer:
+                del self._peers[cluster_id]
+                self._connected.clear()
+            writer.close()
+
+    async def _identify(self, peer: _Peer, payload: Dict[str, Any]) -> None:
+        await self._identify_ratelimiter.block(payload['shard_id'])  # type: ignore
+        _write_frame(peer.writer, {'op': 'reply', 'nonce': payload['nonce'], 'data': None})
+
+    async def _relay(self, peer: _Peer, payload: Dict[str, Any]) -> None:
+        reply: Dict[str, Any] = {'op': 'reply', 'nonce': payload['nonce']}
+        try:
+            reply['data'] = await self.request(payload['name'], *payload.get('args', ()), cluster=payload.get('target'))
+        except Exception as exc:
+            reply['error'] = str(exc)
+        _write_frame(peer.writer, reply)
+
+    async def _call(self, peer: _Peer, name: str, args: Sequence[Any], timeout: Optional[float]) -> Any:
+        nonce, future = self._calls.create()
+        _write_frame(peer.writer, {'op': 'call', 'nonce': nonce, 'name': name, 'args': list(args)})
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._calls.discard(nonce)
+
+    async def wait_until_connected(self) -> None:
+        """|coro|
+
+        Waits until every cluster has connected to the IPC channel.
+        """
+        await self._connected.wait()
+
+    async def request(self, name: str, *args: Any, cluster: Optional[int] = None, timeout: Optional[float] = 30.0) -> Any:
+        """|coro|
+
+        Runs a handler on the clusters, see :meth:`Cluster.request`.
+
+        Parameters
+        -----------
+        name: :class:`str`
+            The name of the handler.
+        \\*args
+            The arguments passed to the handler.
+        cluster: Optional[:class:`int`]
+            The cluster to run the handler on. If not given, it runs on every
+            connected cluster.
+        timeout: Optional[:class:`float`]
+            How long to wait for the results.
+
+        Raises
+        -------
+        ClientException
+            The handler failed, does not exist, or the cluster is not connected.
+        asyncio.TimeoutError
+            The clusters did not answer in time.
+
+        Returns
+        --------
+        Any
+            The result of the handler, or a list of the results ordered by
+            cluster ID if ``cluster`` is not given.
+        """
+        if cluster is not None:
+            try:
+                peer = self._peers[cluster]
+            except KeyError:
+                raise ClientException(f'cluster {cluster} is not connected') from None
+            return await self._call(peer, name, args, timeout)
+
+        peers = [self._peers[key] for key in sorted(self._peers)]
+        return list(await asyncio.gather(*(self._call(peer, name, args, timeout) for peer in peers)))
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes every cluster and the IPC channel.
+        """
+        if self._closing:
+            return
+        self._closing = True
+
+        for peer in self._peers.values():
+            try:
+                _write_frame(peer.writer, {'op': 'close'})
+            except Exception:
+                pass
+
+        loop = asyncio.get_running_loop()
+        for process in self._processes.values():
+            await loop.run_in_executor(None, process.join, 10.0)
+            if process.is_alive():
+                process.terminate()
+
+        for task in self._monitors:
+            task.cancel()
+
+        self._calls.cancel_all()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def run(self) -> None:
+        """Starts the clusters and blocks until interrupted.
+
+        This is a shorthand for :meth:`start` and :meth:`close` that handles
+        the event loop.
+        """
+
+        async def runner() -> None:
+            await self.start()
+            try:
+                await asyncio.gather(*self._monitors)
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(runner())
+        except KeyboardInterrupt:
+            pass
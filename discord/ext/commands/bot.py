@@ -28,10 +28,14 @@ from __future__ import annotations
 import asyncio
 import collections
 import collections.abc
+import hashlib
 import inspect
 import importlib.util
+import json
 import logging
+import os
 import sys
+import time
 import traceback
 import types
 import typing
@@ -39,7 +43,7 @@ from typing import Any, Callable, Mapping, List, Dict, TYPE_CHECKING, Optional,
 
 import discord
 
-from .core import GroupMixin, AppCommand, AppGroup
+from .core import GroupMixin, AppCommand, AppGroup, _CheckCache, _run_checks
 from .view import StringView
 from .context import Context, InteractionContext
 from . import errors
@@ -66,6 +70,8 @@ __all__ = (
 
 MISSING: Any = discord.utils.MISSING
 
+_log = logging.getLogger(__name__)
+
 T = TypeVar('T')
 CFT = TypeVar('CFT', bound='CoroFunc')
 CXT = TypeVar('CXT', bound='Context')
@@ -118,6 +124,36 @@ def when_mentioned_or(*prefixes: str) -> Callable[[Union[Bot, AutoShardedBot], M
 def _is_submodule(parent: str, child: str) -> bool:
     return parent == child or child.startswith(parent + ".")
 
+def _normalize_app_command_option(option: Dict[str, Any]) -> Dict[str, Any]:
+    # brings locally built and API returned options into the same shape,
+    # the API omits falsy fields and adds a few of its own
+    ret: Dict[str, Any] = {
+        'type': option['type'],
+        'name': option['name'],
+        'description': option.get('description', ''),
+    }
+    if option.get('required'):
+        ret['required'] = True
+    if option.get('choices'):
+        ret['choices'] = [{'name': str(c['name']), 'value': c['value']} for c in option['choices']]
+    if option.get('channel_types'):
+        ret['channel_types'] = sorted(option['channel_types'])
+    if option.get('options'):
+        ret['options'] = [_normalize_app_command_option(o) for o in option['options']]
+    return ret
+
+def _normalize_app_command(command: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'name': command['name'],
+        'description': command.get('description', ''),
+        'default_permission': command.get('default_permission', True),
+        'options': [_normalize_app_command_option(o) for o in command.get('options') or []],
+    }
+
+def _hash_app_commands(payload: List[Any]) -> str:
+    data = sorted((_normalize_app_command(c) for c in payload), key=lambda c: c['name'])
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
 class _DefaultRepr:
     def __repr__(self):
         return '<default-help-command>'
@@ -133,11 +169,18 @@ class BotBase(GroupMixin):
         self.__extensions: Dict[str, types.ModuleType] = {}
         self._checks: List[Check] = []
         self._check_once = []
+        self._check_cache: _CheckCache = _CheckCache()
         self._before_invoke = None
         self._after_invoke = None
         self._help_command = None
         self.description = inspect.cleandoc(description) if description else ''
         self.testing_guild: Optional[int] = options.get('testing_guild')
+        self.app_command_sync_file: Optional[str] = options.get('app_command_sync_file')
+        self.app_command_sync_concurrency: int = options.get('app_command_sync_concurrency', 4)
+        self.app_command_defer_after: Optional[float] = options.get('app_command_defer_after')
+        # hash of the last command tree synced per scope, see _app_command_scope
+        self._synced_app_commands: Optional[Dict[str, str]] = None
+        self._synced_application_id: Optional[int] = None
         self.owner_id = options.get('owner_id')
         self.owner_ids = options.get('owner_ids', set())
         self.strip_after_prefix = options.get('strip_after_prefix', False)
@@ -342,8 +385,7 @@ class BotBase(GroupMixin):
         if len(data) == 0:
             return True
 
-        # type-checker doesn't distinguish between functions and methods
-        return await discord.utils.async_all(f(ctx) for f in data)  # type: ignore
+        return await _run_checks(ctx, data)
 
     async def is_owner(self, user: discord.User) -> bool:
         """|coro|
@@ -1081,6 +1123,7 @@ class BotBase(GroupMixin):
         """
         if ctx.command is not None:
             self.dispatch('app_command', ctx)
+            handle = self._schedule_auto_defer(ctx)
             try:
                 if await self.can_run(ctx, call_once=True):
                     await ctx.command.invoke(ctx)
@@ -1090,6 +1133,42 @@ class BotBase(GroupMixin):
                 await ctx.command.dispatch_error(ctx, exc)
             else:
                 self.dispatch('app_command_completion', ctx)
+            finally:
+                if handle is not None:
+                    handle.cancel()
+                # ctx.command is the innermost command that was prepared
+                ctx.command._latency['total'].record(time.perf_counter() - ctx._received_at)
+
+    def _schedule_auto_defer(self, ctx: InteractionContext) -> Optional[asyncio.TimerHandle]:
+        delay = self.app_command_defer_after
+        if delay is None:
+            return None
+
+        remaining = delay - (time.perf_counter() - ctx._received_at)
+        return asyncio.get_running_loop().call_later(max(remaining, 0.0), self._auto_defer, ctx)
+
+    def _auto_defer(self, ctx: InteractionContext) -> None:
+        if ctx.interaction.response.is_done():
+            return
+
+        ctx._auto_defer = asyncio.create_task(self._defer_interaction(ctx), name=f'discord-ext-commands-auto-defer-{ctx.interaction.id}')
+
+    async def _defer_interaction(self, ctx: InteractionContext) -> None:
+        try:
+            await ctx.interaction.response.defer()
+        except (discord.HTTPException, discord.InteractionResponded):
+            _log.debug('Failed to automatically defer interaction %s.', ctx.interaction.id, exc_info=True)
+
+    @property
+    def app_command_latencies(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Dict[:class:`str`, Dict[:class:`str`, Dict[:class:`str`, Any]]]: The latency histograms of every
+        application command, keyed by the command's qualified name.
+
+        See :meth:`.AppCommand.latency_stats` for the format of each entry.
+
+        .. versionadded:: 2.0
+        """
+        return {command.qualified_name: command.latency_stats() for command in self.walk_app_commands()}
 
     async def process_commands(self, message: Message) -> None:
         """|coro|
@@ -1276,6 +1355,25 @@ class Bot(BotBase, discord.Client):
         When set, application commands will only be updated / registered on the given guild, helpful for testing
         application commands
 
+        .. versionadded:: 2.0
+    app_command_sync_file: Optional[:class:`str`]
+        The path of a file used to remember which application commands have been
+        synced with Discord across restarts. The file is keyed by application, so
+        several bots may share it. See :meth:`.register_app_commands`.
+
+        .. versionadded:: 2.0
+    app_command_sync_concurrency: :class:`int`
+        The number of guilds whose application commands are synced at the same time.
+        Defaults to ``4``.
+
+        .. versionadded:: 2.0
+    app_command_defer_after: Optional[:class:`float`]
+        The number of seconds after receiving an application command interaction
+        after which it is deferred automatically if the command has not responded yet.
+        This keeps slow commands within Discord's 3 second deadline. Once deferred,
+        :meth:`.InteractionContext.reply` sends a followup message instead.
+        If ``None`` (the default), interactions are never deferred automatically.
+
         .. versionadded:: 2.0
     help_command: Optional[:class:`.HelpCommand`]
         The help command implementation to use. This can be dynamically
@@ -1300,38 +1398,178 @@ class Bot(BotBase, discord.Client):
 
         .. versionadded:: 1.7
     """
-    async def register_app_commands(self):
-        #ToDo remove old commands when not used anymore
-        if not self.testing_guild:
-            global_overwrites = []
-            guild_commands: Dict[int, List[EditApplicationCommand]] = {}
-            commands_ = await self.fetch_global_commands()
-            registered_commands = []
-            for command in commands_:
-                registered_commands.append(command.name)
-            for command in self.app_commands:
-                command_ = await self.convert_app_command(command)
-                if not command.guilds:
-                    global_overwrites.append(command_)
-                    # ToDo registered_commands.remove(command.name)
-                else:
-                    for guild_id in command.guilds:
-                        data = guild_commands.get(guild_id, list())
-                        data.append(command_)
-                        guild_commands[guild_id] = data
+    # application command syncing
+
+    @staticmethod
+    def _app_command_scope(guild_id: Optional[int], *, testing: bool) -> str:
+        # Scopes synced with a testing guild are remembered apart from the
+        # regular ones, so that each mode only ever clears what it synced itself
+        if testing:
+            return f'testing:{guild_id}'
+        return 'global' if guild_id is None else str(guild_id)
+
+    def _read_app_command_sync_file(self) -> Dict[str, Dict[str, str]]:
+        path = self.app_command_sync_file
+        if not path or not os.path.exists(path):
+            return {}
 
-            await self.http.bulk_upsert_global_commands(self.user.id, global_overwrites)
+        try:
+            with open(path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            _log.warning('Ignoring unreadable application command sync file %s.', path, exc_info=True)
+            return {}
+
+        # the file is keyed by application ID, anything else is from an older version
+        return {key: value for key, value in data.items() if key.isdigit() and isinstance(value, dict)}
+
+    def _load_synced_app_commands(self, application_id: int) -> Dict[str, str]:
+        if self._synced_app_commands is not None and self._synced_application_id == application_id:
+            return self._synced_app_commands
+
+        self._synced_application_id = application_id
+        self._synced_app_commands = synced = dict(self._read_app_command_sync_file().get(str(application_id), {}))
+        return synced
+
+    def _save_synced_app_commands(self) -> None:
+        path = self.app_command_sync_file
+        if not path or self._synced_app_commands is None:
+            return
+
+        # other applications may share the file
+        data = self._read_app_command_sync_file()
+        data[str(self._synced_application_id)] = self._synced_app_commands
+        tmp = f'{path}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fp:
+                json.dump(data, fp)
+            os.replace(tmp, path)
+        except OSError:
+            _log.warning('Failed to write application command sync file %s.', path, exc_info=True)
+
+    async def _build_app_command_payloads(self) -> Dict[Optional[int], List[EditApplicationCommand]]:
+        if self.testing_guild:
+            # If there is a testing guild, we just register all commands on this guild
+            return {self.testing_guild: [await self.convert_app_command(command) for command in self.app_commands]}
+
+        payloads: Dict[Optional[int], List[EditApplicationCommand]] = {None: []}
+        for command in self.app_commands:
+            command_ = await self.convert_app_command(command)
+            if not command.guilds:
+                payloads[None].append(command_)
+            else:
+                for guild_id in command.guilds:
+                    payloads.setdefault(guild_id, []).append(command_)
+        return payloads
+
+    async def _sync_app_command_scope(self, guild_id: Optional[int], payload: List[EditApplicationCommand]) -> int:
+        http = self.http
+        application_id = self.user.id  # type: ignore
+        if guild_id is None:
+            existing = await http.get_global_commands(application_id)
+        else:
+            existing = await http.get_guild_commands(application_id, guild_id)
 
-            for guild, guild_commands_ in guild_commands.items():
-                await self.http.bulk_upsert_guild_commands(self.user.id, guild, guild_commands_)
+        current = {command['name']: command for command in existing}
+        desired = {command['name']: command for command in payload}
 
-        #If there is a testing guild, we just upsert all commands on this guild
+        upserts = [
+            command for name, command in desired.items()
+            if name not in current or _normalize_app_command(current[name]) != _normalize_app_command(command)
+        ]
+        deletes = [command['id'] for name, command in current.items() if name not in desired]
+
+        changes = len(upserts) + len(deletes)
+        if changes == 0:
+            return 0
+
+        if changes > 1:
+            # a single bulk overwrite is cheaper than several individual requests
+            if guild_id is None:
+                await http.bulk_upsert_global_commands(application_id, payload)
+            else:
+                await http.bulk_upsert_guild_commands(application_id, guild_id, payload)
+            return 1
+
+        if guild_id is None:
+            for command in upserts:
+                await http.upsert_global_command(application_id, command)
+            for command_id in deletes:
+                await http.delete_global_command(application_id, command_id)
         else:
-            overwrites = []
-            for command in self.app_commands:
-                command_ = await self.convert_app_command(command)
-                overwrites.append(command_)
-            await self.http.bulk_upsert_guild_commands(self.user.id, self.testing_guild, overwrites)
+            for command in upserts:
+                await http.upsert_guild_command(application_id, guild_id, command)
+            for command_id in deletes:
+                await http.delete_guild_command(application_id, guild_id, command_id)
+        return changes
+
+    async def register_app_commands(self) -> None:
+        """|coro|
+
+        Synchronises the registered application commands with Discord.
+
+        The command tree of every scope (global or one guild) is hashed and
+        compared to the hash of the last successful sync, so unchanged scopes
+        do not make any request. Changed scopes fetch their existing commands
+        and only send the commands that differ, deleting the ones that are no
+        longer registered. Guilds are synced concurrently, up to
+        :attr:`app_command_sync_concurrency` at a time.
+
+        If :attr:`app_command_sync_file` is set, the hashes are persisted there
+        per application so that restarting the bot without changing any command
+        is free as well.
+
+        Guilds that had commands at the last sync but no longer do are cleared.
+        With a :attr:`testing_guild`, only that guild is synced and the global
+        and other guild commands are left alone.
+
+        This is called in :meth:`on_connect`.
+
+        .. versionchanged:: 2.0
+            Only changed scopes and commands are synced.
+        """
+        synced = self._load_synced_app_commands(self.user.id)  # type: ignore
+        payloads = await self._build_app_command_payloads()
+        testing = bool(self.testing_guild)
+
+        if not testing:
+            # guilds that had commands last time but no longer do must be cleared
+            for key in synced:
+                if key.isdigit():
+                    payloads.setdefault(int(key), [])
+
+        pending = {}
+        for guild_id, payload in payloads.items():
+            digest = _hash_app_commands(payload)
+            if synced.get(self._app_command_scope(guild_id, testing=testing)) != digest:
+                pending[guild_id] = (payload, digest)
+
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(self.app_command_sync_concurrency)
+
+        async def sync(guild_id: Optional[int], payload: List[EditApplicationCommand], digest: str) -> None:
+            async with semaphore:
+                try:
+                    requests = await self._sync_app_command_scope(guild_id, payload)
+                except discord.HTTPException:
+                    _log.exception('Failed to sync application commands for %s.', guild_id or 'the global scope')
+                    return
+
+            _log.debug('Synced application commands for %s with %s change request(s).', guild_id or 'the global scope', requests)
+            scope = self._app_command_scope(guild_id, testing=testing)
+            if payload or guild_id is None:
+                synced[scope] = digest
+            else:
+                # nothing left to remember for this guild
+                synced.pop(scope, None)
+            if guild_id is not None:
+                # the guild's commands were overwritten, what the other mode synced there is gone
+                synced.pop(self._app_command_scope(guild_id, testing=not testing), None)
+
+        await asyncio.gather(*(sync(guild_id, payload, digest) for guild_id, (payload, digest) in pending.items()))
+        self._save_synced_app_commands()
 
     async def on_connect(self):
         await self.register_app_commands()
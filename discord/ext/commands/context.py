@@ -23,8 +23,10 @@ DEALINGS IN THE SOFTWARE.
 """
 from __future__ import annotations
 
+import asyncio
 import inspect
 import re
+import time
 
 from typing import Any, Dict, Generic, List, Optional, TYPE_CHECKING, TypeVar, Union
 
@@ -154,6 +156,8 @@ class Context(discord.abc.Messageable, Generic[BotT]):
         self.command_failed: bool = command_failed
         self.current_parameter: Optional[inspect.Parameter] = current_parameter
         self._state: ConnectionState = self.message._state
+        # results of cacheable checks evaluated during this invocation
+        self._check_results: Dict[Any, asyncio.Future] = {}
 
     async def invoke(self, command: Command[CogT, P, T], /, *args: P.args, **kwargs: P.kwargs) -> T:
         r"""|coro|
@@ -476,6 +480,11 @@ class InteractionContext:
         self.command_failed: bool = command_failed
         self.current_parameter: Optional[inspect.Parameter] = current_parameter
         self._state: ConnectionState = self.interaction._state
+        # results of cacheable checks evaluated during this invocation
+        self._check_results: Dict[Any, asyncio.Future] = {}
+        self._received_at: float = time.perf_counter()
+        # set when the bot deferred the interaction on the command's behalf
+        self._auto_defer: Optional[asyncio.Task[None]] = None
         self.clean_prefix = "/" #Setting this to default / if we wanted to change this in the future
 
     async def invoke(self, command: AppCommand[CogT, P, T], /, *args: P.args, **kwargs: P.kwargs) -> T:
@@ -744,6 +753,12 @@ class InteractionContext:
             The message that was sent.
         """
 
+        if self._auto_defer is not None:
+            # The bot already deferred since the command took too long,
+            # so the initial response slot is gone and a followup is sent instead.
+            await self._auto_defer
+            return await self.interaction.followup.send(content, **kwargs)
+
         return await self.interaction.response.send_message(content, **kwargs)
 
     async def reply_followup(self, content: Optional[str] = None, **kwargs: Any) -> Message:
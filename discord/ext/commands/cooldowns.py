@@ -25,12 +25,23 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 
-from typing import Any, Callable, Deque, Dict, Optional, Type, TypeVar, TYPE_CHECKING
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple, Type, TypeVar, TYPE_CHECKING
 from discord.enums import Enum
 import time
 import asyncio
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
 from collections import deque
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
 from ...abc import PrivateChannel
 from .errors import MaxConcurrencyReached
 
@@ -43,6 +54,10 @@ __all__ = (
     'CooldownMapping',
     'DynamicCooldownMapping',
     'MaxConcurrency',
+    'CooldownBackend',
+    'ConcurrencyBackend',
+    'SharedCooldownBackend',
+    'SharedConcurrencyBackend',
 )
 
 C = TypeVar('C', bound='CooldownMapping')
@@ -90,7 +105,7 @@ class Cooldown:
         The length of the cooldown period in seconds.
     """
 
-    __slots__ = ('rate', 'per', '_window', '_tokens', '_last')
+    __slots__ = ('rate', 'per', '_window', '_tokens', '_last', '_backend', '_key')
 
     def __init__(self, rate: float, per: float) -> None:
         self.rate: int = int(rate)
@@ -98,6 +113,13 @@ class Cooldown:
         self._window: float = 0.0
         self._tokens: int = self.rate
         self._last: float = 0.0
+        self._backend: Optional[CooldownBackend] = None
+        self._key: Optional[str] = None
+
+    def _bind(self, backend: CooldownBackend, key: str) -> None:
+        # once bound, the token state lives in the backend rather than on this object
+        self._backend = backend
+        self._key = key
 
     def get_tokens(self, current: Optional[float] = None) -> int:
         """Returns the number of available tokens before rate limiting is applied.
@@ -116,6 +138,9 @@ class Cooldown:
         if not current:
             current = time.time()
 
+        if self._backend is not None:
+            return self._backend.get_tokens(self._key, self.rate, self.per, current)  # type: ignore
+
         tokens = self._tokens
 
         if current > self._window + self.per:
@@ -137,6 +162,10 @@ class Cooldown:
             The number of seconds to wait before this cooldown will be reset.
         """
         current = current or time.time()
+
+        if self._backend is not None:
+            return self._backend.get_retry_after(self._key, self.rate, self.per, current)  # type: ignore
+
         tokens = self.get_tokens(current)
 
         if tokens == 0:
@@ -159,6 +188,10 @@ class Cooldown:
             The retry-after time in seconds if rate limited.
         """
         current = current or time.time()
+
+        if self._backend is not None:
+            return self._backend.update_rate_limit(self._key, self.rate, self.per, current)  # type: ignore
+
         self._last = current
 
         self._tokens = self.get_tokens(current)
@@ -176,6 +209,10 @@ class Cooldown:
 
     def reset(self) -> None:
         """Reset the cooldown to its initial state."""
+        if self._backend is not None:
+            self._backend.reset(self._key, self.rate, self.per)  # type: ignore
+            return
+
         self._tokens = self.rate
         self._last = 0.0
 
@@ -197,6 +234,8 @@ class CooldownMapping:
         self,
         original: Optional[Cooldown],
         type: Callable[[Message], Any],
+        *,
+        backend: Optional[CooldownBackend] = None,
     ) -> None:
         if not callable(type):
             raise TypeError('Cooldown type must be a BucketType or callable')
@@ -204,10 +243,15 @@ class CooldownMapping:
         self._cache: Dict[Any, Cooldown] = {}
         self._cooldown: Optional[Cooldown] = original
         self._type: Callable[[Message], Any] = type
+        self._backend: Optional[CooldownBackend] = backend
+        # prefixes the bucket keys stored in the backend so that
+        # commands sharing a backend do not share their buckets
+        self.namespace: Optional[str] = None
 
     def copy(self) -> CooldownMapping:
-        ret = CooldownMapping(self._cooldown, self._type)
+        ret = CooldownMapping(self._cooldown, self._type, backend=self._backend)
         ret._cache = self._cache.copy()
+        ret.namespace = self.namespace
         return ret
 
     @property
@@ -218,9 +262,13 @@ class CooldownMapping:
     def type(self) -> Callable[[Message], Any]:
         return self._type
 
+    @property
+    def backend(self) -> Optional[CooldownBackend]:
+        return self._backend
+
     @classmethod
-    def from_cooldown(cls: Type[C], rate, per, type) -> C:
-        return cls(Cooldown(rate, per), type)
+    def from_cooldown(cls: Type[C], rate, per, type, *, backend: Optional[CooldownBackend] = None) -> C:
+        return cls(Cooldown(rate, per), type, backend=backend)
 
     def _bucket_key(self, msg: Message) -> Any:
         return self._type(msg)
@@ -237,7 +285,19 @@ class CooldownMapping:
     def create_bucket(self, message: Message) -> Cooldown:
         return self._cooldown.copy()  # type: ignore
 
+    def _get_shared_bucket(self, message: Message) -> Optional[Cooldown]:
+        bucket = self.create_bucket(message)
+        if bucket is not None:
+            # dynamic factories are free to hand out the same instance every time
+            bucket = bucket.copy()
+            key = self._bucket_key(message)
+            bucket._bind(self._backend, f'{self.namespace}:{key!r}')  # type: ignore
+        return bucket
+
     def get_bucket(self, message: Message, current: Optional[float] = None) -> Cooldown:
+        if self._backend is not None:
+            return self._get_shared_bucket(message)  # type: ignore
+
         if self._type is BucketType.default:
             return self._cooldown  # type: ignore
 
@@ -261,14 +321,17 @@ class DynamicCooldownMapping(CooldownMapping):
     def __init__(
         self,
         factory: Callable[[Message], Cooldown],
-        type: Callable[[Message], Any]
+        type: Callable[[Message], Any],
+        *,
+        backend: Optional[CooldownBackend] = None,
     ) -> None:
-        super().__init__(None, type)
+        super().__init__(None, type, backend=backend)
         self._factory: Callable[[Message], Cooldown] = factory
 
     def copy(self) -> DynamicCooldownMapping:
-        ret = DynamicCooldownMapping(self._factory, self._type)
+        ret = DynamicCooldownMapping(self._factory, self._type, backend=self._backend)
         ret._cache = self._cache.copy()
+        ret.namespace = self.namespace
         return ret
 
     @property
@@ -338,13 +401,15 @@ class _Semaphore:
         self.wake_up()
 
 class MaxConcurrency:
-    __slots__ = ('number', 'per', 'wait', '_mapping')
+    __slots__ = ('number', 'per', 'wait', 'namespace', '_mapping', '_backend')
 
-    def __init__(self, number: int, *, per: BucketType, wait: bool) -> None:
+    def __init__(self, number: int, *, per: BucketType, wait: bool, backend: Optional[ConcurrencyBackend] = None) -> None:
         self._mapping: Dict[Any, _Semaphore] = {}
+        self._backend: Optional[ConcurrencyBackend] = backend
         self.per: BucketType = per
         self.number: int = number
         self.wait: bool = wait
+        self.namespace: Optional[str] = None
 
         if number <= 0:
             raise ValueError('max_concurrency \'number\' cannot be less than 1')
@@ -353,17 +418,29 @@ class MaxConcurrency:
             raise TypeError(f'max_concurrency \'per\' must be of type BucketType not {type(per)!r}')
 
     def copy(self: MC) -> MC:
-        return self.__class__(self.number, per=self.per, wait=self.wait)
+        ret = self.__class__(self.number, per=self.per, wait=self.wait, backend=self._backend)
+        ret.namespace = self.namespace
+        return ret
 
     def __repr__(self) -> str:
         return f'<MaxConcurrency per={self.per!r} number={self.number} wait={self.wait}>'
 
+    @property
+    def backend(self) -> Optional[ConcurrencyBackend]:
+        return self._backend
+
     def get_key(self, message: Message) -> Any:
         return self.per.get_key(message)
 
     async def acquire(self, message: Message) -> None:
         key = self.get_key(message)
 
+        if self._backend is not None:
+            acquired = await self._backend.acquire(f'{self.namespace}:{key!r}', self.number, wait=self.wait)
+            if not acquired:
+                raise MaxConcurrencyReached(self.number, self.per)
+            return
+
         try:
             sem = self._mapping[key]
         except KeyError:
@@ -378,6 +455,10 @@ class MaxConcurrency:
         # But it might be more useful in the future
         key = self.get_key(message)
 
+        if self._backend is not None:
+            await self._backend.release(f'{self.namespace}:{key!r}', self.number)
+            return
+
         try:
             sem = self._mapping[key]
         except KeyError:
@@ -388,3 +469,317 @@ class MaxConcurrency:
 
         if sem.value >= self.number and not sem.is_active():
             del self._mapping[key]
+
+
+class CooldownBackend:
+    """An interface for storing the token state of :class:`Cooldown` buckets
+    outside of the current process.
+
+    By default cooldown buckets live in the memory of the process that
+    handles the command. Passing a backend to :func:`.cooldown` or
+    :func:`.dynamic_cooldown` moves that state into the backend so it can be
+    shared, e.g. between several processes each running a range of shards.
+
+    Every method receives the bucket ``key`` together with the ``rate`` and
+    ``per`` of the cooldown being applied. Implementations must perform
+    :meth:`update_rate_limit` as a single atomic check-and-consume.
+
+    .. versionadded:: 2.0
+    """
+
+    def get_tokens(self, key: str, rate: int, per: float, current: float) -> int:
+        """Returns the number of tokens left in the bucket at ``current``."""
+        raise NotImplementedError
+
+    def get_retry_after(self, key: str, rate: int, per: float, current: float) -> float:
+        """Returns the seconds until the bucket is refilled, or ``0.0`` if it has tokens left."""
+        raise NotImplementedError
+
+    def update_rate_limit(self, key: str, rate: int, per: float, current: float) -> Optional[float]:
+        """Consumes a token from the bucket, returning the retry-after time if it is empty."""
+        raise NotImplementedError
+
+    def reset(self, key: str, rate: int, per: float) -> None:
+        """Refills the bucket."""
+        raise NotImplementedError
+
+
+class ConcurrencyBackend:
+    """An interface for storing the semaphores used by :class:`MaxConcurrency`
+    outside of the current process.
+
+    .. versionadded:: 2.0
+    """
+
+    async def acquire(self, key: str, number: int, *, wait: bool) -> bool:
+        """Takes a slot out of the ``number`` available for ``key``.
+
+        If ``wait`` is ``False`` and no slot is available then ``False`` is
+        returned instead of waiting for one to be released.
+        """
+        raise NotImplementedError
+
+    async def release(self, key: str, number: int) -> None:
+        """Gives back a slot previously taken with :meth:`acquire`."""
+        raise NotImplementedError
+
+
+class _SharedTable:
+    """A fixed size, open addressing hash table stored in a memory mapped file.
+
+    Every record is laid out as ``(key hash, window, expires, value)``. A record
+    whose hash is zero has never been used, a record that is expired at the
+    current time may be reused by another key. All access must happen while
+    holding :meth:`lock`, which is an exclusive :func:`fcntl.flock` on the file
+    so that any local process opening the same path shares the table.
+    """
+
+    RECORD = struct.Struct('<Qddq')
+
+    __slots__ = ('path', 'capacity', '_fd', '_map')
+
+    def __init__(self, path: str, capacity: int) -> None:
+        if fcntl is None:
+            raise RuntimeError('shared backends require a POSIX system with fcntl support')
+
+        if capacity <= 0:
+            raise ValueError('capacity must be greater than 0')
+
+        self.path: str = path
+        self._fd: int = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                size = os.fstat(self._fd).st_size
+                if size == 0:
+                    size = capacity * self.RECORD.size
+                    os.ftruncate(self._fd, size)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+            # the first process to create the file decides the size of the table
+            self.capacity: int = size // self.RECORD.size
+            self._map: mmap.mmap = mmap.mmap(self._fd, self.capacity * self.RECORD.size)
+        except:
+            os.close(self._fd)
+            raise
+
+    def __repr__(self) -> str:
+        return f'<_SharedTable path={self.path!r} capacity={self.capacity}>'
+
+    @staticmethod
+    def hash_key(key: str) -> int:
+        value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+        # zero is reserved for slots that were never used
+        return value or 1
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def read(self, index: int) -> Tuple[int, float, float, int]:
+        return self.RECORD.unpack_from(self._map, index * self.RECORD.size)
+
+    def write(self, index: int, hashed: int, window: float, expires: float, value: int) -> None:
+        self.RECORD.pack_into(self._map, index * self.RECORD.size, hashed, window, expires, value)
+
+    def find(self, hashed: int, reusable: Callable[[Tuple[int, float, float, int]], bool]) -> Tuple[int, Optional[Tuple[float, float, int]]]:
+        # linear probing: the key is either somewhere in the probe sequence before
+        # the first never-used slot, or it isn't stored at all. In the latter case
+        # the first slot that can be reused is handed back for insertion.
+        free = -1
+        capacity = self.capacity
+        start = hashed % capacity
+        for offset in range(capacity):
+            index = (start + offset) % capacity
+            record = self.read(index)
+            if record[0] == hashed:
+                return index, record[1:]
+            if record[0] == 0:
+                return (index if free == -1 else free), None
+            if free == -1 and reusable(record):
+                free = index
+
+        if free == -1:
+            raise RuntimeError(f'shared table {self.path!r} is full')
+        return free, None
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def _default_shared_path(name: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f'discord-{name}.bin')
+
+
+class SharedCooldownBackend(CooldownBackend):
+    """A :class:`CooldownBackend` that shares cooldown buckets between local processes.
+
+    The buckets are stored in a memory mapped file, every process that creates
+    a backend with the same ``name`` (or ``path``) shares the same buckets.
+    Consuming a token happens while holding an exclusive lock on the file,
+    which makes the check-and-consume atomic across processes.
+
+    This is only available on POSIX systems.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    name: :class:`str`
+        The name of the shared table. Used to build the file path inside
+        :func:`tempfile.gettempdir` if ``path`` is not given.
+    path: Optional[:class:`str`]
+        The path of the file backing the table.
+    capacity: :class:`int`
+        The maximum number of buckets that can be alive at the same time.
+        Only used by the process that creates the file. Defaults to ``65536``.
+    """
+
+    def __init__(self, name: str, *, path: Optional[str] = None, capacity: int = 65536) -> None:
+        self._table: _SharedTable = _SharedTable(path or _default_shared_path(f'{name}-cooldowns'), capacity)
+
+    def __repr__(self) -> str:
+        return f'<SharedCooldownBackend path={self._table.path!r} capacity={self._table.capacity}>'
+
+    def _find(self, key: str, current: float) -> Tuple[int, int, Optional[Tuple[float, float, int]]]:
+        hashed = self._table.hash_key(key)
+        # a bucket that hasn't been used within its cooldown window can be reused by another key
+        index, record = self._table.find(hashed, lambda r: current > r[2])
+        return index, hashed, record
+
+    @staticmethod
+    def _get_state(record: Optional[Tuple[float, float, int]], rate: int, per: float, current: float) -> Tuple[float, int]:
+        if record is None:
+            return 0.0, rate
+
+        window, _, tokens = record
+        if current > window + per:
+            tokens = rate
+        return window, tokens
+
+    def get_tokens(self, key: str, rate: int, per: float, current: float) -> int:
+        with self._table.lock():
+            _, _, record = self._find(key, current)
+
+        _, tokens = self._get_state(record, rate, per, current)
+        return tokens
+
+    def get_retry_after(self, key: str, rate: int, per: float, current: float) -> float:
+        with self._table.lock():
+            _, _, record = self._find(key, current)
+
+        window, tokens = self._get_state(record, rate, per, current)
+        if tokens == 0:
+            return per - (current - window)
+        return 0.0
+
+    def update_rate_limit(self, key: str, rate: int, per: float, current: float) -> Optional[float]:
+        with self._table.lock():
+            index, hashed, record = self._find(key, current)
+            window, tokens = self._get_state(record, rate, per, current)
+
+            # first token used means that we start a new rate limit window
+            if tokens == rate:
+                window = current
+
+            if tokens == 0:
+                self._table.write(index, hashed, window, current + per, tokens)
+                return per - (current - window)
+
+            self._table.write(index, hashed, window, current + per, tokens - 1)
+
+    def reset(self, key: str, rate: int, per: float) -> None:
+        with self._table.lock():
+            index, hashed, record = self._find(key, time.time())
+            if record is not None:
+                # an expiry in the past lets another key take over the slot
+                self._table.write(index, hashed, 0.0, 0.0, rate)
+
+    def close(self) -> None:
+        """Unmaps the shared table. The backend must not be used afterwards."""
+        self._table.close()
+
+
+class SharedConcurrencyBackend(ConcurrencyBackend):
+    """A :class:`ConcurrencyBackend` that shares :class:`MaxConcurrency`
+    semaphores between local processes.
+
+    The slots in use are counted in a memory mapped file, every process that
+    creates a backend with the same ``name`` (or ``path``) shares the same
+    counters. Taking a slot is an atomic check-and-increment done while holding
+    an exclusive lock on the file. Waiters poll the counter every
+    ``poll_interval`` seconds since there is no cross-process wake up.
+
+    Slots taken by a process that dies without releasing them are not
+    reclaimed, so a fresh ``name`` should be used after a crash.
+
+    This is only available on POSIX systems.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    name: :class:`str`
+        The name of the shared table. Used to build the file path inside
+        :func:`tempfile.gettempdir` if ``path`` is not given.
+    path: Optional[:class:`str`]
+        The path of the file backing the table.
+    capacity: :class:`int`
+        The maximum number of semaphores that can be held at the same time.
+        Only used by the process that creates the file. Defaults to ``16384``.
+    poll_interval: :class:`float`
+        How often, in seconds, waiters check for a free slot. Defaults to ``0.05``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        path: Optional[str] = None,
+        capacity: int = 16384,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self._table: _SharedTable = _SharedTable(path or _default_shared_path(f'{name}-concurrency'), capacity)
+        self.poll_interval: float = poll_interval
+
+    def __repr__(self) -> str:
+        return f'<SharedConcurrencyBackend path={self._table.path!r} capacity={self._table.capacity}>'
+
+    def _try_acquire(self, key: str, number: int) -> bool:
+        hashed = self._table.hash_key(key)
+        with self._table.lock():
+            # a semaphore without any holder can be reused by another key
+            index, record = self._table.find(hashed, lambda r: r[3] <= 0)
+            used = record[2] if record is not None else 0
+            if used >= number:
+                return False
+
+            self._table.write(index, hashed, 0.0, 0.0, used + 1)
+            return True
+
+    async def acquire(self, key: str, number: int, *, wait: bool) -> bool:
+        while not self._try_acquire(key, number):
+            if not wait:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    async def release(self, key: str, number: int) -> None:
+        hashed = self._table.hash_key(key)
+        with self._table.lock():
+            index, record = self._table.find(hashed, lambda r: r[3] <= 0)
+            if record is None:
+                # ...? peculiar
+                return
+
+            self._table.write(index, hashed, 0.0, 0.0, max(record[2] - 1, 0))
+
+    def close(self) -> None:
+        """Unmaps the shared table. The backend must not be used afterwards."""
+        self._table.close()
@@ -29,6 +29,7 @@ from typing import (
     Dict,
     Generator,
     Generic,
+    Iterable,
     Literal,
     List,
     Optional,
@@ -45,11 +46,12 @@ import functools
 import inspect
 import datetime
 import logging
+import time
 
 import discord
 
 from .errors import *
-from .cooldowns import Cooldown, BucketType, CooldownMapping, MaxConcurrency, DynamicCooldownMapping
+from .cooldowns import Cooldown, BucketType, CooldownMapping, MaxConcurrency, DynamicCooldownMapping, CooldownBackend, ConcurrencyBackend
 from .converter import run_converters, run_app_converters, get_converter, Greedy
 from ._types import _BaseCommand
 from .cog import Cog
@@ -103,6 +105,9 @@ __all__ = (
 
 MISSING: Any = discord.utils.MISSING
 
+# how long the result of a built-in check is reused for the same author and channel
+_BUILTIN_CHECK_TTL: float = 5.0
+
 T = TypeVar('T')
 CogT = TypeVar('CogT', bound='Cog')
 CommandT = TypeVar('CommandT', bound='Command')
@@ -154,6 +159,88 @@ def get_signature_parameters(function: Callable[..., Any], globalns: Dict[str, A
     return params
 
 
+def _callback_namespace(function: Callable[..., Any]) -> str:
+    # used to keep the buckets of different commands apart when they share a backend,
+    # so it has to be the same in every process that loads the command
+    function = unwrap_function(function)
+    return f'{function.__module__}.{function.__qualname__}'
+
+
+def _resolved_option_payload(ctx: InteractionContext, kind: str, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        return ctx.interaction.data['resolved'][kind][key]  # type: ignore
+    except (KeyError, TypeError):
+        return None
+
+
+def _resolve_app_user(ctx: InteractionContext, key: str) -> Optional[discord.User]:
+    data = _resolved_option_payload(ctx, 'users', key)
+    return ctx._state.store_user(data) if data is not None else None  # type: ignore
+
+
+def _resolve_app_member(ctx: InteractionContext, key: str) -> Optional[discord.Member]:
+    guild = ctx.interaction.guild
+    member = _resolved_option_payload(ctx, 'members', key)
+    user = _resolved_option_payload(ctx, 'users', key)
+    if guild is None or member is None or user is None:
+        return None
+    return discord.Member(data={**member, 'user': user}, guild=guild, state=ctx._state)  # type: ignore
+
+
+def _resolve_app_role(ctx: InteractionContext, key: str) -> Optional[discord.Role]:
+    guild = ctx.interaction.guild
+    if guild is None:
+        return None
+    role = guild.get_role(int(key))
+    if role is not None:
+        return role
+    data = _resolved_option_payload(ctx, 'roles', key)
+    return discord.Role(guild=guild, state=ctx._state, data=data) if data is not None else None  # type: ignore
+
+
+def _resolve_app_attachment(ctx: InteractionContext, key: str) -> Optional[discord.Attachment]:
+    data = _resolved_option_payload(ctx, 'attachments', key)
+    return discord.Attachment(data=data, state=ctx._state) if data is not None else None  # type: ignore
+
+
+def _app_channel_resolver(cls: Type[Any]) -> Callable[[InteractionContext, str], Any]:
+    def resolve(ctx: InteractionContext, key: str) -> Any:
+        guild = ctx.interaction.guild
+        if guild is None:
+            return None
+        channel = guild.get_channel_or_thread(int(key))
+        return channel if isinstance(channel, cls) else None
+
+    return resolve
+
+
+_APP_OPTION_RESOLVERS: Dict[Any, Callable[[InteractionContext, str], Any]] = {
+    discord.User: _resolve_app_user,
+    discord.Member: _resolve_app_member,
+    discord.Role: _resolve_app_role,
+    discord.Attachment: _resolve_app_attachment,
+}
+
+_APP_OPTION_PRIMITIVES = (str, int, float, bool)
+
+
+def _get_app_option_resolver(converter: Any) -> Optional[Callable[[InteractionContext, str], Any]]:
+    # Optional[X] is resolved like X, a missing value is handled before conversion
+    args = getattr(converter, '__args__', None)
+    if getattr(converter, '__origin__', None) is Union and args is not None and len(args) == 2 and type(None) in args:
+        converter = args[0] if args[1] is type(None) else args[1]
+
+    try:
+        resolver = _APP_OPTION_RESOLVERS.get(converter)
+    except TypeError:
+        return None
+
+    if resolver is None and inspect.isclass(converter):
+        if issubclass(converter, (discord.abc.GuildChannel, discord.Thread)):
+            resolver = _app_channel_resolver(converter)
+    return resolver
+
+
 def wrap_callback(coro):
     @functools.wraps(coro)
     async def wrapped(*args, **kwargs):
@@ -191,6 +278,136 @@ def hooked_wrapped_callback(command, ctx, coro):
     return wrapped
 
 
+class _CheckCache:
+    # results of cacheable checks shared between invocations, keyed by
+    # (predicate, author id, channel id) and kept until their TTL passes
+    __slots__ = ('_results', 'max_size')
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self._results: Dict[Any, Tuple[float, bool, Any]] = {}
+        self.max_size: int = max_size
+
+    def get(self, key: Any) -> Optional[Tuple[bool, Any]]:
+        try:
+            expires, failed, value = self._results[key]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            del self._results[key]
+            return None
+        return failed, value
+
+    def put(self, key: Any, ttl: float, failed: bool, value: Any) -> None:
+        now = time.monotonic()
+        if len(self._results) >= self.max_size:
+            self._results = {k: v for k, v in self._results.items() if v[0] >= now}
+            if len(self._results) >= self.max_size:
+                # everything is still alive, make room by dropping the oldest entries
+                for k in list(self._results)[:self.max_size // 4]:
+                    del self._results[k]
+        self._results[key] = (now + ttl, failed, value)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+
+def _copy_error(exc: BaseException) -> BaseException:
+    # a fresh instance with the same state, so a cached failure doesn't carry
+    # the traceback or attributes of earlier invocations. __init__ is skipped
+    # since many errors take other arguments than what ends up in args
+    copy = exc.__class__.__new__(exc.__class__, *exc.args)
+    copy.__dict__.update(exc.__dict__)
+    copy.args = exc.args
+    copy.__cause__ = exc.__cause__
+    copy.__suppress_context__ = exc.__suppress_context__
+    return copy
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    # a check started up front may fail after an earlier check already
+    # decided the outcome, nothing awaits it then
+    if not future.cancelled():
+        future.exception()
+
+
+def _start_cached_check(ctx: Union[Context, InteractionContext], predicate: Check, ttl: float) -> asyncio.Future:
+    check_key = getattr(predicate, '__commands_cache_key__', predicate)
+    try:
+        return ctx._check_results[check_key]
+    except KeyError:
+        pass
+
+    loop = asyncio.get_running_loop()
+    cache: Optional[_CheckCache] = getattr(ctx.bot, '_check_cache', None)
+    key = None
+    if ttl > 0 and cache is not None:
+        key = (check_key, getattr(ctx.author, 'id', None), getattr(ctx.channel, 'id', None))
+        cached = cache.get(key)
+        if cached is not None:
+            future = loop.create_future()
+            failed, value = cached
+            if failed:
+                future.set_exception(_copy_error(value))
+            else:
+                future.set_result(value)
+            future.add_done_callback(_retrieve_exception)
+            ctx._check_results[check_key] = future
+            return future
+
+    try:
+        ret = predicate(ctx)  # type: ignore
+    except Exception as exc:
+        future = loop.create_future()
+        future.set_exception(exc)
+    else:
+        if inspect.isawaitable(ret):
+            future = asyncio.ensure_future(ret)
+        else:
+            future = loop.create_future()
+            future.set_result(ret)
+
+    if key is not None:
+        def store(fut: asyncio.Future) -> None:
+            if fut.cancelled():
+                return
+            exc = fut.exception()
+            if exc is None:
+                cache.put(key, ttl, False, fut.result())  # type: ignore
+            elif isinstance(exc, CommandError):
+                cache.put(key, ttl, True, _copy_error(exc))  # type: ignore
+
+        # snapshot a failure before the first invocation's error handler sees it
+        if future.done():
+            store(future)
+        else:
+            future.add_done_callback(store)
+
+    future.add_done_callback(_retrieve_exception)
+    ctx._check_results[check_key] = future
+    return future
+
+
+async def _run_checks(ctx: Union[Context, InteractionContext], predicates: Iterable[Check]) -> bool:
+    # Checks marked as cacheable only depend on the author and channel and have no
+    # side effects, so all of them are started up front and run concurrently while
+    # the remaining checks are awaited in order. The outcome is the same as running
+    # everything sequentially: the first failing check in order decides the result.
+    started: List[Tuple[Check, Optional[asyncio.Future]]] = []
+    for predicate in predicates:
+        ttl = getattr(predicate, '__commands_cache_ttl__', None)
+        started.append((predicate, None if ttl is None else _start_cached_check(ctx, predicate, ttl)))
+
+    for predicate, future in started:
+        if future is None:
+            value = await discord.utils.maybe_coroutine(predicate, ctx)
+        else:
+            value = await asyncio.shield(future)
+        if not value:
+            return False
+    return True
+
+
 class _CaseInsensitiveDict(dict):
     def __contains__(self, k):
         return super().__contains__(k.casefold())
@@ -359,6 +576,8 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
             buckets = cooldown
         else:
             raise TypeError("Cooldown must be a an instance of CooldownMapping or None.")
+        if buckets.namespace is None:
+            buckets.namespace = _callback_namespace(func)
         self._buckets: CooldownMapping = buckets
 
         try:
@@ -366,6 +585,8 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         except AttributeError:
             max_concurrency = kwargs.get('max_concurrency')
 
+        if max_concurrency is not None and max_concurrency.namespace is None:
+            max_concurrency.namespace = _callback_namespace(func)
         self._max_concurrency: Optional[MaxConcurrency] = max_concurrency
 
         self.require_var_positional: bool = kwargs.get('require_var_positional', False)
@@ -406,6 +627,7 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
             Callable[Concatenate[Context, P], Coro[T]],
         ]) -> None:
         self._callback = function
+        self._signature_cache: Optional[Tuple[bool, str]] = None
         unwrap = unwrap_function(function)
         self.module = unwrap.__module__
 
@@ -458,6 +680,7 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         subclass constructors, sans the name and callback.
         """
         self.__init__(self.callback, **dict(self.__original_kwargs__, **kwargs))
+        GroupMixin._commands_version += 1
 
     async def __call__(self, context: Context, *args: P.args, **kwargs: P.kwargs) -> T:
         """|coro|
@@ -1031,6 +1254,16 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         if self.usage is not None:
             return self.usage
 
+        # the parameters only change when the callback is replaced, which clears the cache
+        cached = self._signature_cache
+        if cached is not None and cached[0] is self.require_var_positional:
+            return cached[1]
+
+        signature = self._build_signature()
+        self._signature_cache = (self.require_var_positional, signature)
+        return signature
+
+    def _build_signature(self) -> str:
         params = self.clean_params
         if not params:
             return ''
@@ -1131,7 +1364,7 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
                 # since we have no checks, then we just return True.
                 return True
 
-            return await discord.utils.async_all(predicate(ctx) for predicate in predicates)  # type: ignore
+            return await _run_checks(ctx, predicates)
         finally:
             ctx.command = original
 
@@ -1239,6 +1472,12 @@ class AppCommand(Command):
         self.arg_descriptions: Optional[Dict[str, str]] = kwargs.get("arg_descriptions", {})
 
         self.callback = func
+        # (params, has_cog) the option table was built for, and the table itself
+        self._app_options_cache: Optional[Tuple[Tuple[Dict[str, inspect.Parameter], bool], List[Tuple[str, inspect.Parameter, Any, Any]]]] = None
+        self._latency: Dict[str, discord.utils._LatencyHistogram] = {
+            'prepare': discord.utils._LatencyHistogram(),
+            'total': discord.utils._LatencyHistogram(),
+        }
         self.enabled: bool = kwargs.get('enabled', True)
 
         self.usage: Optional[str] = kwargs.get('usage')
@@ -1275,6 +1514,8 @@ class AppCommand(Command):
             buckets = cooldown
         else:
             raise TypeError("Cooldown must be a an instance of CooldownMapping or None.")
+        if buckets.namespace is None:
+            buckets.namespace = _callback_namespace(func)
         self._buckets: CooldownMapping = buckets
 
         try:
@@ -1282,6 +1523,8 @@ class AppCommand(Command):
         except AttributeError:
             max_concurrency = kwargs.get('max_concurrency')
 
+        if max_concurrency is not None and max_concurrency.namespace is None:
+            max_concurrency.namespace = _callback_namespace(func)
         self._max_concurrency: Optional[MaxConcurrency] = max_concurrency
 
         self.require_var_positional: bool = kwargs.get('require_var_positional', False)
@@ -1340,6 +1583,27 @@ class AppCommand(Command):
         """
         return self.description
 
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the latency histograms recorded for this application command.
+
+        Two histograms are kept. ``prepare`` measures the time from receiving the
+        interaction until the callback is about to be called, which covers checks,
+        cooldowns and argument conversion. ``total`` measures the time until the
+        invocation finished, including the callback itself.
+
+        Each histogram is a :class:`dict` with the ``count``, ``mean``, ``max``,
+        ``p50``, ``p90`` and ``p99`` latencies in seconds, and ``buckets``, a list of
+        ``(upper_bound, count)`` pairs where the last upper bound is ``None``.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, Dict[:class:`str`, Any]]
+            The histograms keyed by ``prepare`` and ``total``.
+        """
+        return {name: histogram.to_dict() for name, histogram in self._latency.items()}
+
     async def __call__(self, context: InteractionContext, *args: P.args, **kwargs: P.kwargs) -> T:
         """|coro|
 
@@ -1408,18 +1672,15 @@ class AppCommand(Command):
         # type-checker fails to narrow argument
         return await run_app_converters(ctx, converter, str(argument), param)  # type: ignore
 
-    async def _parse_arguments(self, ctx: InteractionContext) -> None:
-        ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
-        ctx.kwargs = {}
-        args = ctx.args
-        kwargs = ctx.kwargs
+    def _get_app_options(self) -> List[Tuple[str, inspect.Parameter, Any, Any]]:
+        # The option table only depends on the signature and whether the command
+        # lives in a cog, so it is built once rather than on every invocation.
+        key = (self.params, self.cog is not None)
+        cached = self._app_options_cache
+        if cached is not None and cached[0][0] is key[0] and cached[0][1] == key[1]:
+            return cached[1]
 
-        # Todo Make better together with 2193 (ToDo)
-        view_iterator = (iter(ctx.options_passed if len(ctx.options_passed) else {})
-                         if ctx.options_passed is not None else
-                         iter(ctx.interaction.data.get('options', ())))
         iterator = iter(self.params.items())
-
         if self.cog is not None:
             # we have 'self' as the first parameter so just advance
             # the iterator and resume parsing
@@ -1434,32 +1695,65 @@ class AppCommand(Command):
         except StopIteration:
             raise discord.ClientException(f'Callback for {self.name} command is missing "ctx" parameter.')
 
+        options: List[Tuple[str, inspect.Parameter, Any, Any]] = []
         for name, param in iterator:
-            #ToDo add fallback when view item name not in param and return old viewiterator
-            # and check next param
-            try:
-                view_item = next(view_iterator)
-            except StopIteration:
-                if param.kind is not param.KEYWORD_ONLY:
-                    raise TooManyArguments('Too many arguments passed to ' + self.qualified_name)
-                view_item = {}
-            if str(view_item.get('name')) == str(name):
-                #Testing
-                ctx.view_item = view_item['value']
-                try:
-                    ctx.view_item = int(ctx.view_item)
-                except ValueError:
-                    pass
-                #args.append(view_item['value'])
-                if param.kind in (param.POSITIONAL_OR_KEYWORD, param.POSITIONAL_ONLY):
-                    transformed = await self.transform(ctx, param)
-                    args.append(transformed)
-                elif param.kind == param.KEYWORD_ONLY:
-                    kwargs[name] = await self.transform(ctx, param)
-                    break
-                elif param.kind == param.VAR_POSITIONAL:
+            converter = get_converter(param)
+            if converter in _APP_OPTION_PRIMITIVES:
+                resolver = converter
+            else:
+                resolver = _get_app_option_resolver(converter)
+            options.append((name, param, converter, resolver))
+
+        self._app_options_cache = (key, options)
+        return options
+
+    async def _parse_arguments(self, ctx: InteractionContext) -> None:
+        ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
+        ctx.kwargs = {}
+        args = ctx.args
+        kwargs = ctx.kwargs
+
+        if ctx.options_passed is not None:
+            passed = ctx.options_passed or ()
+        else:
+            passed = ctx.interaction.data.get('options', ())
+        # Discord leaves out options that weren't given, so match them by name
+        values = {option['name']: option.get('value') for option in passed}
+
+        for name, param, converter, resolver in self._get_app_options():
+            ctx.current_parameter = param
+            if name not in values:
+                if param.kind == param.VAR_POSITIONAL:
+                    continue
+                if param.default is param.empty:
+                    raise MissingRequiredArgument(param)
+                transformed = param.default
+            else:
+                value = values[name]
+                transformed = MISSING
+                if resolver is converter:
+                    # Option values of primitive types are already typed by Discord
+                    if converter is float and isinstance(value, int) and not isinstance(value, bool):
+                        transformed = float(value)
+                    elif type(value) is converter:
+                        transformed = value
+                elif resolver is not None:
+                    resolved = resolver(ctx, str(value))
+                    if resolved is not None:
+                        transformed = resolved
+
+                if transformed is MISSING:
+                    ctx.view_item = value
+                    try:
+                        ctx.view_item = int(value)
+                    except (TypeError, ValueError):
+                        pass
                     transformed = await self.transform(ctx, param)
-                    args.append(transformed)
+
+            if param.kind == param.KEYWORD_ONLY:
+                kwargs[name] = transformed
+            else:
+                args.append(transformed)
 
     async def call_before_hooks(self, ctx: InteractionContext) -> None:
         # now that we're done preparing we can call the pre-command hooks
@@ -1598,6 +1892,7 @@ class AppCommand(Command):
 
     async def invoke(self, ctx: InteractionContext) -> None:
         await self.prepare(ctx)
+        self._latency['prepare'].record(time.perf_counter() - ctx._received_at)
         # terminate the invoked_subcommand chain.
         # since we're in a regular command (and not a group) then
         # the invoked subcommand is None.)
@@ -1638,6 +1933,11 @@ class GroupMixin(Generic[CogT]):
     case_insensitive: :class:`bool`
         Whether the commands should be case insensitive. Defaults to ``False``.
     """
+
+    # bumped whenever a command is added or removed anywhere, used
+    # to invalidate what has been rendered from the registered commands
+    _commands_version: int = 0
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         case_insensitive = kwargs.get('case_insensitive', False)
         self.all_commands: Dict[str, Command[CogT, Any, Any]] = _CaseInsensitiveDict() if case_insensitive else {}
@@ -1698,6 +1998,7 @@ class GroupMixin(Generic[CogT]):
         if command.name in self.all_commands:
             raise CommandRegistrationError(command.name)
 
+        GroupMixin._commands_version += 1
         self.all_commands[command.name] = command
         for alias in command.aliases:
             if alias in self.all_commands:
@@ -1736,6 +2037,7 @@ class GroupMixin(Generic[CogT]):
         if command.name in self.all_app_commands:
             raise CommandRegistrationError(command.name)
 
+        GroupMixin._commands_version += 1
         self.all_app_commands[command.name] = command
 
     def remove_command(self, name: str) -> Optional[Command[CogT, Any, Any]]:
@@ -1761,6 +2063,7 @@ class GroupMixin(Generic[CogT]):
         if command is None:
             return None
 
+        GroupMixin._commands_version += 1
         if name in command.aliases:
             # we're removing an alias so we don't want to remove the rest
             return command
@@ -1796,6 +2099,8 @@ class GroupMixin(Generic[CogT]):
         if command is None:
             return None
 
+        GroupMixin._commands_version += 1
+
     def walk_commands(self) -> Generator[Command[CogT, Any, Any], None, None]:
         """An iterator that recursively walks through all commands and subcommands.
 
@@ -2468,7 +2773,7 @@ def slash_group(
     return slash_command(name=name, cls=cls, **attrs)  # type: ignore
 
 
-def check(predicate: Check) -> Callable[[T], T]:
+def check(predicate: Check, *, cache_ttl: Optional[float] = None) -> Callable[[T], T]:
     r"""A decorator that adds a check to the :class:`.Command` or its
     subclasses. These checks could be accessed via :attr:`.Command.checks`.
 
@@ -2537,8 +2842,28 @@ def check(predicate: Check) -> Callable[[T], T]:
     -----------
     predicate: Callable[[:class:`Context`], :class:`bool`]
         The predicate to check if the command should be invoked.
+    cache_ttl: Optional[:class:`float`]
+        Marks the predicate as cacheable, i.e. its result only depends on the
+        author and the channel of the context and it has no side effects.
+
+        Cacheable checks are evaluated at most once per invocation, even when
+        the help command checks every command, and are run concurrently with
+        the other checks of the command. If this is greater than ``0`` the
+        result is also reused by later invocations of the same author in the
+        same channel for that many seconds.
+
+        The built-in checks such as :func:`.has_permissions` or :func:`.guild_only`
+        are cached for 5 seconds.
+
+        .. versionadded:: 2.0
     """
 
+    if cache_ttl is not None:
+        try:
+            predicate.__commands_cache_ttl__ = cache_ttl  # type: ignore
+        except AttributeError:
+            raise TypeError(f'{predicate!r} does not support attribute assignment and cannot be cached') from None
+
     def decorator(func: Union[Command, AppCommand, CoroFunc]) -> Union[Command, AppCommand, CoroFunc]:
         if isinstance(func, Command):
             func.checks.append(predicate)
@@ -2560,6 +2885,12 @@ def check(predicate: Check) -> Callable[[T], T]:
 
     return decorator  # type: ignore
 
+def _builtin_check(predicate: Check, *key: Any) -> Callable[[T], T]:
+    # built-in checks created with the same arguments are interchangeable,
+    # so they share their cached results across commands
+    predicate.__commands_cache_key__ = key  # type: ignore
+    return check(predicate, cache_ttl=_BUILTIN_CHECK_TTL)
+
 def check_any(*checks: Check) -> Callable[[T], T]:
     r"""A :func:`check` that is added that checks if any of the checks passed
     will pass, i.e. using logical OR.
@@ -2626,6 +2957,10 @@ def check_any(*checks: Check) -> Callable[[T], T]:
         # if we're here, all checks failed
         raise CheckAnyFailure(unwrapped, errors)
 
+    # only cacheable if every check it is made of is
+    ttls = [getattr(wrapped, '__commands_cache_ttl__', None) for wrapped in checks]
+    if ttls and None not in ttls:
+        return check(predicate, cache_ttl=min(ttls))  # type: ignore
     return check(predicate)
 
 def has_role(item: Union[int, str]) -> Callable[[T], T]:
@@ -2668,7 +3003,7 @@ def has_role(item: Union[int, str]) -> Callable[[T], T]:
             raise MissingRole(item)
         return True
 
-    return check(predicate)
+    return _builtin_check(predicate, 'has_role', item)
 
 def has_any_role(*items: Union[int, str]) -> Callable[[T], T]:
     r"""A :func:`.check` that is added that checks if the member invoking the
@@ -2711,7 +3046,7 @@ def has_any_role(*items: Union[int, str]) -> Callable[[T], T]:
             return True
         raise MissingAnyRole(list(items))
 
-    return check(predicate)
+    return _builtin_check(predicate, 'has_any_role', items)
 
 def bot_has_role(item: int) -> Callable[[T], T]:
     """Similar to :func:`.has_role` except checks if the bot itself has the
@@ -2739,7 +3074,7 @@ def bot_has_role(item: int) -> Callable[[T], T]:
         if role is None:
             raise BotMissingRole(item)
         return True
-    return check(predicate)
+    return _builtin_check(predicate, 'bot_has_role', item)
 
 def bot_has_any_role(*items: int) -> Callable[[T], T]:
     """Similar to :func:`.has_any_role` except checks if the bot itself has
@@ -2763,7 +3098,7 @@ def bot_has_any_role(*items: int) -> Callable[[T], T]:
         if any(getter(id=item) is not None if isinstance(item, int) else getter(name=item) is not None for item in items):
             return True
         raise BotMissingAnyRole(list(items))
-    return check(predicate)
+    return _builtin_check(predicate, 'bot_has_any_role', items)
 
 def has_permissions(**perms: bool) -> Callable[[T], T]:
     """A :func:`.check` that is added that checks if the member has all of
@@ -2810,7 +3145,7 @@ def has_permissions(**perms: bool) -> Callable[[T], T]:
 
         raise MissingPermissions(missing)
 
-    return check(predicate)
+    return _builtin_check(predicate, 'has_permissions', tuple(sorted(perms.items())))
 
 def bot_has_permissions(**perms: bool) -> Callable[[T], T]:
     """Similar to :func:`.has_permissions` except checks if the bot itself has
@@ -2836,7 +3171,7 @@ def bot_has_permissions(**perms: bool) -> Callable[[T], T]:
 
         raise BotMissingPermissions(missing)
 
-    return check(predicate)
+    return _builtin_check(predicate, 'bot_has_permissions', tuple(sorted(perms.items())))
 
 def has_guild_permissions(**perms: bool) -> Callable[[T], T]:
     """Similar to :func:`.has_permissions`, but operates on guild wide
@@ -2864,7 +3199,7 @@ def has_guild_permissions(**perms: bool) -> Callable[[T], T]:
 
         raise MissingPermissions(missing)
 
-    return check(predicate)
+    return _builtin_check(predicate, 'has_guild_permissions', tuple(sorted(perms.items())))
 
 def bot_has_guild_permissions(**perms: bool) -> Callable[[T], T]:
     """Similar to :func:`.has_guild_permissions`, but checks the bot
@@ -2889,7 +3224,7 @@ def bot_has_guild_permissions(**perms: bool) -> Callable[[T], T]:
 
         raise BotMissingPermissions(missing)
 
-    return check(predicate)
+    return _builtin_check(predicate, 'bot_has_guild_permissions', tuple(sorted(perms.items())))
 
 def dm_only() -> Callable[[T], T]:
     """A :func:`.check` that indicates this command must only be used in a
@@ -2907,7 +3242,7 @@ def dm_only() -> Callable[[T], T]:
             raise PrivateMessageOnly()
         return True
 
-    return check(predicate)
+    return _builtin_check(predicate, 'dm_only')
 
 def guild_only() -> Callable[[T], T]:
     """A :func:`.check` that indicates this command must only be used in a
@@ -2923,7 +3258,7 @@ def guild_only() -> Callable[[T], T]:
             raise NoPrivateMessage()
         return True
 
-    return check(predicate)
+    return _builtin_check(predicate, 'guild_only')
 
 def is_owner() -> Callable[[T], T]:
     """A :func:`.check` that checks if the person invoking this command is the
@@ -2940,7 +3275,7 @@ def is_owner() -> Callable[[T], T]:
             raise NotOwner('You do not own this bot.')
         return True
 
-    return check(predicate)
+    return _builtin_check(predicate, 'is_owner')
 
 def is_nsfw() -> Callable[[T], T]:
     """A :func:`.check` that checks if the channel is a NSFW channel.
@@ -2958,9 +3293,15 @@ def is_nsfw() -> Callable[[T], T]:
         if ctx.guild is None or (isinstance(ch, (discord.TextChannel, discord.Thread)) and ch.is_nsfw()):
             return True
         raise NSFWChannelRequired(ch)  # type: ignore
-    return check(pred)
-
-def cooldown(rate: int, per: float, type: Union[BucketType, Callable[[Message], Any]] = BucketType.default) -> Callable[[T], T]:
+    return _builtin_check(pred, 'is_nsfw')
+
+def cooldown(
+    rate: int,
+    per: float,
+    type: Union[BucketType, Callable[[Message], Any]] = BucketType.default,
+    *,
+    backend: Optional[CooldownBackend] = None,
+) -> Callable[[T], T]:
     """A decorator that adds a cooldown to a :class:`.Command`
 
     A cooldown allows a command to only be used a specific amount
@@ -2985,17 +3326,29 @@ def cooldown(rate: int, per: float, type: Union[BucketType, Callable[[Message],
 
         .. versionchanged:: 1.7
             Callables are now supported for custom bucket types.
+    backend: Optional[:class:`.CooldownBackend`]
+        Where to store the cooldown buckets, e.g. a :class:`.SharedCooldownBackend`
+        to share them between processes. If ``None`` the buckets are kept in memory.
+
+        .. versionadded:: 2.0
     """
 
     def decorator(func: Union[Command, AppCommand, CoroFunc]) -> Union[Command, AppCommand, CoroFunc]:
+        mapping = CooldownMapping(Cooldown(rate, per), type, backend=backend)
         if isinstance(func, Command):
-            func._buckets = CooldownMapping(Cooldown(rate, per), type)
+            mapping.namespace = _callback_namespace(func.callback)
+            func._buckets = mapping
         else:
-            func.__commands_cooldown__ = CooldownMapping(Cooldown(rate, per), type)
+            func.__commands_cooldown__ = mapping
         return func
     return decorator  # type: ignore
 
-def dynamic_cooldown(cooldown: Union[BucketType, Callable[[Message], Any]], type: BucketType = BucketType.default) -> Callable[[T], T]:
+def dynamic_cooldown(
+    cooldown: Union[BucketType, Callable[[Message], Any]],
+    type: BucketType = BucketType.default,
+    *,
+    backend: Optional[CooldownBackend] = None,
+) -> Callable[[T], T]:
     """A decorator that adds a dynamic cooldown to a :class:`.Command`
 
     This differs from :func:`.cooldown` in that it takes a function that
@@ -3023,19 +3376,29 @@ def dynamic_cooldown(cooldown: Union[BucketType, Callable[[Message], Any]], type
         apply to this invocation or ``None`` if the cooldown should be bypassed.
     type: :class:`.BucketType`
         The type of cooldown to have.
+    backend: Optional[:class:`.CooldownBackend`]
+        Where to store the cooldown buckets. If ``None`` the buckets are kept in memory.
     """
     if not callable(cooldown):
         raise TypeError("A callable must be provided")
 
     def decorator(func: Union[Command, AppCommand, CoroFunc]) -> Union[Command, AppCommand, CoroFunc]:
+        mapping = DynamicCooldownMapping(cooldown, type, backend=backend)
         if isinstance(func, Command):
-            func._buckets = DynamicCooldownMapping(cooldown, type)
+            mapping.namespace = _callback_namespace(func.callback)
+            func._buckets = mapping
         else:
-            func.__commands_cooldown__ = DynamicCooldownMapping(cooldown, type)
+            func.__commands_cooldown__ = mapping
         return func
     return decorator  # type: ignore
 
-def max_concurrency(number: int, per: BucketType = BucketType.default, *, wait: bool = False) -> Callable[[T], T]:
+def max_concurrency(
+    number: int,
+    per: BucketType = BucketType.default,
+    *,
+    wait: bool = False,
+    backend: Optional[ConcurrencyBackend] = None,
+) -> Callable[[T], T]:
     """A decorator that adds a maximum concurrency to a :class:`.Command` or its subclasses.
 
     This enables you to only allow a certain number of command invocations at the same time,
@@ -3057,11 +3420,17 @@ def max_concurrency(number: int, per: BucketType = BucketType.default, *, wait:
         then instead of waiting until the command can run again, the command raises
         :exc:`.MaxConcurrencyReached` to its error handler. If this is set to ``True``
         then the command waits until it can be executed.
+    backend: Optional[:class:`.ConcurrencyBackend`]
+        Where to keep track of the running invocations, e.g. a :class:`.SharedConcurrencyBackend`
+        to limit them across processes. If ``None`` they are tracked in memory.
+
+        .. versionadded:: 2.0
     """
 
     def decorator(func: Union[Command, AppCommand, CoroFunc]) -> Union[Command, AppCommand, CoroFunc]:
-        value = MaxConcurrency(number, per=per, wait=wait)
+        value = MaxConcurrency(number, per=per, wait=wait, backend=backend)
         if isinstance(func, Command):
+            value.namespace = _callback_namespace(func.callback)
             func._max_concurrency = value
         else:
             func.__commands_max_concurrency__ = value
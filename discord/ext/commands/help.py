@@ -22,6 +22,7 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import asyncio
 import itertools
 import copy
 import functools
@@ -34,7 +35,7 @@ import setuptools.wheel
 
 import discord.utils
 
-from .core import Group, Command, AppGroup
+from .core import Group, Command, AppGroup, GroupMixin
 from .errors import CommandError
 
 if TYPE_CHECKING:
@@ -192,6 +193,9 @@ class _HelpCommandImpl(Command):
         super().__init__(inject.command_callback, *args, **kwargs)
         self._original = inject
         self._injected = inject
+        # rendered paginator state, shared between the copies made for every invocation
+        self._cached_pages = {}
+        self._cached_pages_version = -1
 
     async def prepare(self, ctx):
         self._injected = injected = self._original.copy()
@@ -290,6 +294,19 @@ class HelpCommand:
         If ``False``, never calls :attr:`.Command.checks`. Defaults to ``True``.
 
         .. versionchanged:: 1.7
+    max_concurrent_checks: :class:`int`
+        The maximum number of commands whose checks are verified at the same
+        time by :meth:`filter_commands`. Defaults to ``10``.
+
+        .. versionadded:: 2.0
+    cache_pages: :class:`bool`
+        Whether the rendered pages of the built-in help commands are reused
+        when the same list of commands is shown again with the same prefix.
+        The cache is cleared whenever a command is added or removed. This should
+        be disabled if the output of a subclass depends on anything else, e.g.
+        the author. Defaults to ``True``.
+
+        .. versionadded:: 2.0
     command_attrs: :class:`dict`
         A dictionary of options to pass in for the construction of the help command.
         This allows you to change the command behaviour without actually changing
@@ -325,6 +342,8 @@ class HelpCommand:
     def __init__(self, **options):
         self.show_hidden = options.pop('show_hidden', False)
         self.verify_checks = options.pop('verify_checks', True)
+        self.max_concurrent_checks = options.pop('max_concurrent_checks', 10)
+        self.cache_pages = options.pop('cache_pages', True)
         self.command_attrs = attrs = options.pop('command_attrs', {})
         attrs.setdefault('name', 'help')
         attrs.setdefault('help', 'Shows this message')
@@ -574,23 +593,68 @@ class HelpCommand:
             # if verify_checks is None and we're in a DM, don't verify
             return sorted(iterator, key=key) if sort else list(iterator)
 
-        # if we're here then we need to check every command if it can run
+        # if we're here then we need to check every command if it can run.
+        # can_run swaps ctx.command while running, so every command gets its own
+        # shallow copy of the context to be able to run the checks concurrently.
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+
         async def predicate(cmd):
-            try:
-                return await cmd.can_run(self.context)
-            except CommandError:
-                return False
+            async with semaphore:
+                try:
+                    return await cmd.can_run(copy.copy(self.context))
+                except CommandError:
+                    return False
 
-        ret = []
-        for cmd in iterator:
-            valid = await predicate(cmd)
-            if valid:
-                ret.append(cmd)
+        commands = list(iterator)
+        results = await asyncio.gather(*(predicate(cmd) for cmd in commands))
+        ret = [cmd for cmd, valid in zip(commands, results) if valid]
 
         if sort:
             ret.sort(key=key)
         return ret
 
+    # used by the paginator based implementations below
+
+    def _restore_pages(self, kind, commands):
+        # Returns True if the paginator was filled from the cache. The key is made of
+        # the commands that passed the checks, which keeps users with different
+        # permissions apart, and of the prefix and name used since they're rendered.
+        if not self.cache_pages:
+            return False
+
+        impl = self._command_impl
+        if impl._cached_pages_version != GroupMixin._commands_version:
+            impl._cached_pages.clear()
+            impl._cached_pages_version = GroupMixin._commands_version
+            return False
+
+        key = (kind, tuple(c.qualified_name for c in commands), self.context.clean_prefix, self.invoked_with)
+        try:
+            pages, current_page, count = impl._cached_pages[key]
+        except KeyError:
+            return False
+
+        paginator = self.paginator
+        paginator._pages = pages.copy()
+        paginator._current_page = current_page.copy()
+        paginator._count = count
+        return True
+
+    def _store_pages(self, kind, commands):
+        if not self.cache_pages:
+            return
+
+        impl = self._command_impl
+        if impl._cached_pages_version != GroupMixin._commands_version:
+            impl._cached_pages.clear()
+            impl._cached_pages_version = GroupMixin._commands_version
+        elif len(impl._cached_pages) >= 256:
+            impl._cached_pages.clear()
+
+        paginator = self.paginator
+        key = (kind, tuple(c.qualified_name for c in commands), self.context.clean_prefix, self.invoked_with)
+        impl._cached_pages[key] = (paginator._pages.copy(), paginator._current_page.copy(), paginator._count)
+
     def get_max_size(self, commands):
         """Returns the largest name length of the specified command list.
 
@@ -1024,10 +1088,6 @@ class DefaultHelpCommand(HelpCommand):
         ctx = self.context
         bot = ctx.bot
 
-        if bot.description:
-            # <description> portion
-            self.paginator.add_line(bot.description, empty=True)
-
         no_category = f'\u200b{self.no_category}:'
 
         def get_category(command, *, no_category=no_category):
@@ -1036,6 +1096,13 @@ class DefaultHelpCommand(HelpCommand):
 
         commands = set.union(bot.commands, bot.app_commands)
         filtered = await self.filter_commands(commands, sort=True, key=get_category)
+        if self._restore_pages('bot', filtered):
+            return await self.send_pages()
+
+        if bot.description:
+            # <description> portion
+            self.paginator.add_line(bot.description, empty=True)
+
         max_size = self.get_max_size(filtered)
         to_iterate = itertools.groupby(filtered, key=get_category)
 
@@ -1049,6 +1116,7 @@ class DefaultHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages('bot', filtered)
         await self.send_pages()
 
     async def send_command_help(self, command):
@@ -1057,9 +1125,12 @@ class DefaultHelpCommand(HelpCommand):
         await self.send_pages()
 
     async def send_group_help(self, group):
-        self.add_command_formatting(group)
-
         filtered = await self.filter_commands(group.commands or group.app_commands, sort=self.sort_commands)
+        kind = ('group', group.qualified_name)
+        if self._restore_pages(kind, filtered):
+            return await self.send_pages()
+
+        self.add_command_formatting(group)
         self.add_indented_commands(filtered, heading=self.commands_heading)
 
         if filtered:
@@ -1068,13 +1139,18 @@ class DefaultHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(kind, filtered)
         await self.send_pages()
 
     async def send_cog_help(self, cog):
+        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
+        kind = ('cog', cog.qualified_name)
+        if self._restore_pages(kind, filtered):
+            return await self.send_pages()
+
         if cog.description:
             self.paginator.add_line(cog.description, empty=True)
 
-        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
         self.add_indented_commands(filtered, heading=self.commands_heading)
 
         note = self.get_ending_note()
@@ -1082,6 +1158,7 @@ class DefaultHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages(kind, filtered)
         await self.send_pages()
 
 
@@ -1269,13 +1346,6 @@ class MinimalHelpCommand(HelpCommand):
         ctx = self.context
         bot = ctx.bot
 
-        if bot.description:
-            self.paginator.add_line(bot.description, empty=True)
-
-        note = self.get_opening_note()
-        if note:
-            self.paginator.add_line(note, empty=True)
-
         no_category = f'\u200b{self.no_category}'
 
         def get_category(command, *, no_category=no_category):
@@ -1283,6 +1353,16 @@ class MinimalHelpCommand(HelpCommand):
             return cog.qualified_name if cog is not None else no_category
 
         filtered = await self.filter_commands(bot.commands, sort=True, key=get_category)
+        if self._restore_pages('bot', filtered):
+            return await self.send_pages()
+
+        if bot.description:
+            self.paginator.add_line(bot.description, empty=True)
+
+        note = self.get_opening_note()
+        if note:
+            self.paginator.add_line(note, empty=True)
+
         to_iterate = itertools.groupby(filtered, key=get_category)
 
         for category, commands in to_iterate:
@@ -1294,9 +1374,15 @@ class MinimalHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages('bot', filtered)
         await self.send_pages()
 
     async def send_cog_help(self, cog):
+        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
+        kind = ('cog', cog.qualified_name)
+        if self._restore_pages(kind, filtered):
+            return await self.send_pages()
+
         bot = self.context.bot
         if bot.description:
             self.paginator.add_line(bot.description, empty=True)
@@ -1308,7 +1394,6 @@ class MinimalHelpCommand(HelpCommand):
         if cog.description:
             self.paginator.add_line(cog.description, empty=True)
 
-        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
         if filtered:
             self.paginator.add_line(f'**{cog.qualified_name} {self.commands_heading}**')
             for command in filtered:
@@ -1319,12 +1404,17 @@ class MinimalHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(kind, filtered)
         await self.send_pages()
 
     async def send_group_help(self, group):
+        filtered = await self.filter_commands(group.commands, sort=self.sort_commands)
+        kind = ('group', group.qualified_name)
+        if self._restore_pages(kind, filtered):
+            return await self.send_pages()
+
         self.add_command_formatting(group)
 
-        filtered = await self.filter_commands(group.commands, sort=self.sort_commands)
         if filtered:
             note = self.get_opening_note()
             if note:
@@ -1339,6 +1429,7 @@ class MinimalHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(kind, filtered)
         await self.send_pages()
 
     async def send_command_help(self, command):
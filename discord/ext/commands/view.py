@@ -22,6 +22,8 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import re
+
 from .errors import UnexpectedQuoteError, InvalidEndOfQuotedStringError, ExpectedClosingQuoteError
 
 # map from opening quotes to closing quotes
@@ -46,12 +48,27 @@ _quotes = {
 }
 _all_quotes = set(_quotes.keys()) | set(_quotes.values())
 
+# the characters that end a run of plain characters inside an unquoted word
+_unquoted_special = re.compile('[\\s\\\\%s]' % re.escape(''.join(_all_quotes)))
+# ditto for quoted words, keyed by the closing quote
+_quoted_special = {close: re.compile('[\\\\%s]' % re.escape(close)) for close in set(_quotes.values())}
+_whitespace = re.compile(r'\s*')
+_word = re.compile(r'\S*')
+
+
 class StringView:
+    # Rather than walking the buffer one character at a time, every operation
+    # jumps straight to the next character that matters using a precompiled
+    # pattern and only slices out the parts that end up in the result.
+    # Parsed quoted words are remembered by their starting index, since the
+    # argument parser rewinds and reads the same token again on converter failures.
+
     def __init__(self, buffer):
         self.index = 0
         self.buffer = buffer
         self.end = len(buffer)
         self.previous = 0
+        self._tokens = {}
 
     @property
     def current(self):
@@ -65,25 +82,15 @@ class StringView:
         self.index = self.previous
 
     def skip_ws(self):
-        pos = 0
-        while not self.eof:
-            try:
-                current = self.buffer[self.index + pos]
-                if not current.isspace():
-                    break
-                pos += 1
-            except IndexError:
-                break
-
         self.previous = self.index
-        self.index += pos
+        if self.index < self.end:
+            self.index = _whitespace.match(self.buffer, self.index).end()
         return self.previous != self.index
 
     def skip_string(self, string):
-        strlen = len(string)
-        if self.buffer[self.index:self.index + strlen] == string:
+        if self.buffer.startswith(string, self.index):
             self.previous = self.index
-            self.index += strlen
+            self.index += len(string)
             return True
         return False
 
@@ -110,83 +117,110 @@ class StringView:
         return result
 
     def get_word(self):
-        pos = 0
-        while not self.eof:
-            try:
-                current = self.buffer[self.index + pos]
-                if current.isspace():
-                    break
-                pos += 1
-            except IndexError:
-                break
         self.previous = self.index
-        result = self.buffer[self.index:self.index + pos]
-        self.index += pos
+        if self.index >= self.end:
+            return ''
+
+        pos = _word.match(self.buffer, self.index).end()
+        result = self.buffer[self.index:pos]
+        self.index = pos
         return result
 
     def get_quoted_word(self):
-        current = self.current
-        if current is None:
+        start = self.index
+        if start >= self.end:
             return None
 
+        try:
+            result, self.index, self.previous = self._tokens[start]
+        except KeyError:
+            pass
+        else:
+            return result
+
+        result = self._read_quoted_word(start)
+        self._tokens[start] = (result, self.index, self.previous)
+        return result
+
+    def _finish(self, index, previous):
+        self.index = index
+        self.previous = previous
+
+    def _read_quoted_word(self, start):
+        buffer = self.buffer
+        end = self.end
+        current = buffer[start]
+
         close_quote = _quotes.get(current)
         is_quoted = bool(close_quote)
         if is_quoted:
             result = []
             _escaped_quotes = (current, close_quote)
+            special = _quoted_special[close_quote]
         else:
+            # the first character is taken as-is, even if it is a quote
             result = [current]
             _escaped_quotes = _all_quotes
-
-        while not self.eof:
-            current = self.get()
-            if not current:
+            special = _unquoted_special
+
+        pos = start + 1
+        while True:
+            match = special.search(buffer, pos)
+            if match is None:
+                result.append(buffer[pos:])
+                self._finish(end, end - 1)
                 if is_quoted:
                     # unexpected EOF
                     raise ExpectedClosingQuoteError(close_quote)
                 return ''.join(result)
 
+            found = match.start()
+            if found != pos:
+                result.append(buffer[pos:found])
+            current = buffer[found]
+
             # currently we accept strings in the format of "hello world"
             # to embed a quote inside the string you must escape it: "a \"world\""
             if current == '\\':
-                next_char = self.get()
-                if not next_char:
+                if found + 1 >= end:
                     # string ends with \ and no character after it
+                    self._finish(found + 1, found)
                     if is_quoted:
                         # if we're quoted then we're expecting a closing quote
                         raise ExpectedClosingQuoteError(close_quote)
                     # if we aren't then we just let it through
                     return ''.join(result)
 
+                next_char = buffer[found + 1]
                 if next_char in _escaped_quotes:
                     # escaped quote
                     result.append(next_char)
+                    pos = found + 2
                 else:
-                    # different escape character, ignore it
-                    self.undo()
+                    # different escape character, ignore it and
+                    # handle the next character as a regular one
                     result.append(current)
+                    pos = found + 1
                 continue
 
-            if not is_quoted and current in _all_quotes:
-                # we aren't quoted
-                raise UnexpectedQuoteError(current)
-
-            # closing quote
-            if is_quoted and current == close_quote:
-                next_char = self.get()
-                valid_eof = not next_char or next_char.isspace()
-                if not valid_eof:
-                    raise InvalidEndOfQuotedStringError(next_char)
-
-                # we're quoted so it's okay
-                return ''.join(result)
+            if not is_quoted:
+                self._finish(found, found - 1)
+                if current in _all_quotes:
+                    # we aren't quoted
+                    raise UnexpectedQuoteError(current)
 
-            if current.isspace() and not is_quoted:
                 # end of word found
                 return ''.join(result)
 
-            result.append(current)
-
+            # closing quote
+            next_char = buffer[found + 1] if found + 1 < end else None
+            self._finish(found + 1, found)
+            valid_eof = not next_char or next_char.isspace()
+            if not valid_eof:
+                raise InvalidEndOfQuotedStringError(next_char)
+
+            # we're quoted so it's okay
+            return ''.join(result)
 
     def __repr__(self):
         return f'<StringView pos: {self.index} prev: {self.previous} end: {self.end} eof: {self.eof}>'
@@ -105,6 +105,224 @@ class GatewayRatelimiter:
                 await asyncio.sleep(delta)
 
 
+class IdentifyRatelimiter:
+    # Discord allows max_concurrency IDENTIFYs every 5 seconds, one for every
+    # bucket of shard_id % max_concurrency, so buckets are spaced out separately
+    def __init__(self, max_concurrency=1, per=5.0):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.per = per
+        self._buckets = {}
+
+    async def block(self, shard_id):
+        key = (shard_id or 0) % self.max_concurrency
+        try:
+            bucket = self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = [asyncio.Lock(), 0.0]
+
+        async with bucket[0]:
+            delta = bucket[1] + self.per - time.monotonic()
+            if delta > 0:
+                _log.debug('Shard ID %s is waiting %.2f seconds to IDENTIFY.', shard_id, delta)
+                await asyncio.sleep(delta)
+            bucket[1] = time.monotonic()
+
+
+class _FrameQueue:
+    # A bounded queue between the loop of a gateway thread, the only
+    # producer, and the client's loop, the only consumer. The deque operations
+    # are atomic so neither side takes a lock, a side only wakes the other
+    # through its loop when that side is waiting.
+    def __init__(self, maxsize, *, loop, producer_loop):
+        self.maxsize = maxsize
+        self.loop = loop
+        self.producer_loop = producer_loop
+        self._items = deque()
+        self._getter = None
+        self._putter = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def _wake(self, future):
+        if not future.done():
+            future.set_result(None)
+
+    async def put(self, item):
+        while len(self._items) >= self.maxsize:
+            self._putter = future = self.producer_loop.create_future()
+            # the consumer may have made room before the future was visible
+            if len(self._items) < self.maxsize:
+                self._putter = None
+                break
+            await future
+
+        self._items.append(item)
+        getter = self._getter
+        if getter is not None:
+            self._getter = None
+            self.loop.call_soon_threadsafe(self._wake, getter)
+
+    async def get(self):
+        while not self._items:
+            self._getter = future = self.loop.create_future()
+            if self._items:
+                self._getter = None
+                break
+            try:
+                await future
+            finally:
+                self._getter = None
+
+        item = self._items.popleft()
+        putter = self._putter
+        if putter is not None:
+            self._putter = None
+            self.producer_loop.call_soon_threadsafe(self._wake, putter)
+        return item
+
+
+class DecodedMessage:
+    # A gateway payload that was already inflated and decoded off the
+    # client's loop, the raw text is kept for the journal and debug events.
+    __slots__ = ('frame', 'text', 'payload')
+
+    def __init__(self, frame, text, payload):
+        self.frame = frame
+        self.text = text
+        self.payload = payload
+
+
+class ThreadedSocket:
+    """A gateway websocket that is read, inflated and decoded in a
+    :class:`GatewayThread`.
+
+    It stands in for the aiohttp websocket of a :class:`DiscordWebSocket`.
+    """
+
+    max_pending = 1024
+
+    def __init__(self, socket, thread, *, loop):
+        self.socket = socket
+        self.thread = thread
+        self.loop = loop
+        self.queue = _FrameQueue(self.max_pending, loop=loop, producer_loop=thread.loop)
+        self._zlib = zlib.decompressobj()
+        self._buffer = bytearray()
+        self._task = None
+
+    @property
+    def closed(self):
+        return self.socket.closed
+
+    @property
+    def close_code(self):
+        return self.socket.close_code
+
+    def _decode(self, msg):
+        if type(msg) is bytes:
+            self._buffer.extend(msg)
+
+            if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
+                return None
+            frame = self._zlib.decompress(self._buffer)
+            self._buffer = bytearray()
+            text = frame.decode('utf-8')
+        else:
+            frame = text = msg
+
+        return DecodedMessage(frame, text, utils._from_json(text))
+
+    async def _read(self):
+        # runs in the gateway thread
+        while True:
+            msg = await self.socket.receive()
+            if msg.type is aiohttp.WSMsgType.TEXT or msg.type is aiohttp.WSMsgType.BINARY:
+                try:
+                    decoded = self._decode(msg.data)
+                except Exception as exc:
+                    await self.queue.put(aiohttp.WSMessage(aiohttp.WSMsgType.ERROR, exc, None))
+                    return
+                if decoded is not None:
+                    await self.queue.put(decoded)
+            else:
+                await self.queue.put(msg)
+                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR):
+                    return
+
+    def start(self):
+        self._task = self.thread.loop.create_task(self._read())
+
+    async def receive(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+
+    async def send_str(self, data):
+        await self.thread.submit(self.socket.send_str(data))
+
+    async def close(self, *, code=1000):
+        return await self.thread.submit(self.socket.close(code=code))
+
+
+class GatewayThread(threading.Thread):
+    """A thread running its own event loop that reads gateway websockets.
+
+    Reading from the socket, inflating and decoding the payloads happen in
+    this thread, the decoded payloads are handed to the client's loop.
+    """
+
+    def __init__(self, http, *, name=None):
+        threading.Thread.__init__(self, name=name, daemon=True)
+        self.http = http
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        self._ready = threading.Event()
+
+    def submit(self, coro):
+        # called from the client's loop
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def _create_session(self):
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.session = self.loop.run_until_complete(self._create_session())
+        finally:
+            self._ready.set()
+
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.session.close())
+            self.loop.close()
+
+    def start(self):
+        threading.Thread.start(self)
+        self._ready.wait()
+
+    async def _connect(self, url, loop):
+        socket = await self.http.ws_connect(url, session=self.session)
+        threaded = ThreadedSocket(socket, self, loop=loop)
+        threaded.start()
+        return threaded
+
+    async def ws_connect(self, url):
+        return await self.submit(self._connect(url, asyncio.get_running_loop()))
+
+    def stop(self):
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.loop.stop()
+
+        if self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop)
+            self.join()
+
+
 class KeepAliveHandler(threading.Thread):
     def __init__(self, *args, **kwargs):
         ws = kwargs.pop('ws', None)
@@ -285,6 +503,7 @@ class DiscordWebSocket:
         self._buffer = bytearray()
         self._close_code = None
         self._rate_limiter = GatewayRatelimiter()
+        self._journal = None
 
     @property
     def open(self):
@@ -300,13 +519,13 @@ class DiscordWebSocket:
         pass
 
     @classmethod
-    async def from_client(cls, client, *, initial=False, gateway=None, shard_id=None, session=None, sequence=None, resume=False):
+    async def from_client(cls, client, *, initial=False, gateway=None, shard_id=None, session=None, sequence=None, resume=False, shard_count=None):
         """Creates a main websocket for Discord from a :class:`Client`.
 
         This is for internal use only.
         """
         gateway = gateway or await client.http.get_gateway()
-        socket = await client.http.ws_connect(gateway)
+        socket = await client._ws_connect(gateway, shard_id)
         ws = cls(socket, loop=client.loop)
 
         # dynamically add attributes needed
@@ -319,10 +538,11 @@ class DiscordWebSocket:
         ws._initial_identify = initial
         ws.shard_id = shard_id
         ws._rate_limiter.shard_id = shard_id
-        ws.shard_count = client._connection.shard_count
+        ws.shard_count = shard_count or client._connection.shard_count
         ws.session_id = session
         ws.sequence = sequence
         ws._max_heartbeat_timeout = client._connection.heartbeat_timeout
+        ws._journal = client._connection._journal
 
         if client._enable_debug_events:
             ws.send = ws.debug_send
@@ -426,12 +646,16 @@ class DiscordWebSocket:
             if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
                 return
             msg = self._zlib.decompress(self._buffer)
+            frame = msg
             msg = msg.decode('utf-8')
             self._buffer = bytearray()
+        else:
+            frame = msg
 
         self.log_receive(msg)
-        msg = utils._from_json(msg)
+        await self.received_payload(utils._from_json(msg), frame)
 
+    async def received_payload(self, msg, frame, /):
         _log.debug('For Shard ID %s: WebSocket Event: %s', self.shard_id, msg)
         event = msg.get('t')
         if event:
@@ -481,6 +705,8 @@ class DiscordWebSocket:
 
                 self.sequence = None
                 self.session_id = None
+                if self._journal is not None:
+                    self._journal.invalidate(self.shard_id)
                 _log.info('Shard ID %s session has been invalidated.', self.shard_id)
                 await self.close(code=1000)
                 raise ReconnectWebSocket(self.shard_id, resume=False)
@@ -504,6 +730,10 @@ class DiscordWebSocket:
             _log.info('Shard ID %s has successfully RESUMED session %s under trace %s.',
                      self.shard_id, self.session_id, ', '.join(trace))
 
+        if self._journal is not None:
+            session_id = self.session_id if event == 'READY' else None
+            self._journal.append(self.shard_id, self.sequence or 0, frame, session_id=session_id)
+
         try:
             func = self._discord_parsers[event]
         except KeyError:
@@ -556,7 +786,10 @@ class DiscordWebSocket:
         """
         try:
             msg = await self.socket.receive(timeout=self._max_heartbeat_timeout)
-            if msg.type is aiohttp.WSMsgType.TEXT:
+            if type(msg) is DecodedMessage:
+                self.log_receive(msg.text)
+                await self.received_payload(msg.payload, msg.frame)
+            elif msg.type is aiohttp.WSMsgType.TEXT:
                 await self.received_message(msg.data)
             elif msg.type is aiohttp.WSMsgType.BINARY:
                 await self.received_message(msg.data)
@@ -693,7 +926,8 @@ class DiscordVoiceWebSocket:
     SESSION_DESCRIPTION
         Receive only. Gives you the secret key required for voice.
     SPEAKING
-        Send only. Notifies the client if you are currently speaking.
+        Notifies the client if you are currently speaking. Received when
+        another user starts speaking, with the SSRC of their audio.
     HEARTBEAT_ACK
         Receive only. Tells you your heartbeat has been acknowledged.
     RESUME
@@ -837,6 +1071,13 @@ class DiscordVoiceWebSocket:
             interval = data['heartbeat_interval'] / 1000.0
             self._keep_alive = VoiceKeepAliveHandler(ws=self, interval=min(interval, 5.0))
             self._keep_alive.start()
+        elif op == self.SPEAKING:
+            self._connection._user_ids[int(data['ssrc'])] = int(data['user_id'])
+        elif op == self.CLIENT_DISCONNECT:
+            user_id = int(data['user_id'])
+            user_ids = self._connection._user_ids
+            for ssrc in [ssrc for ssrc, value in user_ids.items() if value == user_id]:
+                del user_ids[ssrc]
 
         await self._hook(self, msg)
 
@@ -25,9 +25,11 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
 import json
 import logging
 import sys
+import time
 from typing import (
     Any,
     ClassVar,
@@ -69,6 +71,7 @@ if TYPE_CHECKING:
         components,
         emoji,
         embed,
+        gateway,
         guild,
         integration,
         interactions,
@@ -127,7 +130,7 @@ class Route:
     @property
     def bucket(self) -> str:
         # the bucket is just method + path w/ major parameters
-        return f'{self.channel_id}:{self.guild_id}:{self.path}'
+        return f'{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.path}'
 
 
 class MaybeUnlock:
@@ -151,6 +154,117 @@ class MaybeUnlock:
             self.lock.release()
 
 
+class _BucketState:
+    __slots__ = ('lock', 'last_used')
+
+    def __init__(self) -> None:
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.last_used: float = time.monotonic()
+
+
+class RateLimiter:
+    """The rate limit bookkeeping shared by :class:`HTTPClient` and webhook adapters.
+
+    Every bucket gets a lock that is held for the duration of a request, and
+    released later rather than immediately once the bucket has been depleted.
+    Buckets that are idle for ``bucket_ttl`` seconds are dropped, and at most
+    ``max_buckets`` idle buckets are kept around.
+    """
+
+    def __init__(self, *, max_buckets: int = 4096, bucket_ttl: float = 300.0) -> None:
+        self.max_buckets: int = max_buckets
+        self.bucket_ttl: float = bucket_ttl
+        self._buckets: OrderedDict[Any, _BucketState] = OrderedDict()
+        # created on the first global rate limit, since a limiter can be created
+        # at import time and an event would bind to whatever loop is current then
+        self._global_over: Optional[asyncio.Event] = None
+
+        self.requests: int = 0
+        self.rate_limited: int = 0
+        self.global_rate_limited: int = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency: utils._LatencyHistogram = utils._LatencyHistogram()
+        self.queued: utils._LatencyHistogram = utils._LatencyHistogram()
+
+    def lock_for(self, bucket: Any) -> asyncio.Lock:
+        buckets = self._buckets
+        state = buckets.pop(bucket, None)
+        if state is None:
+            state = _BucketState()
+            self._prune()
+        state.last_used = time.monotonic()
+        buckets[bucket] = state
+        return state.lock
+
+    def _prune(self) -> None:
+        # Only the least recently used buckets are looked at, a bucket that is
+        # still locked is in use (or waiting on a rate limit) and is kept.
+        buckets = self._buckets
+        expiry = time.monotonic() - self.bucket_ttl
+        for _ in range(min(len(buckets), 8)):
+            key, state = next(iter(buckets.items()))
+            if len(buckets) < self.max_buckets and state.last_used > expiry:
+                return
+            if state.lock.locked():
+                buckets.move_to_end(key)
+                continue
+            del buckets[key]
+
+    async def wait_global(self) -> None:
+        global_over = self._global_over
+        if global_over is not None and not global_over.is_set():
+            # wait until the global lock is complete
+            await global_over.wait()
+
+    def release_later(self, lock: asyncio.Lock, delay: float) -> None:
+        # keeps the bucket locked until it has refilled without blocking the caller
+        asyncio.get_running_loop().call_later(delay, lock.release)
+
+    async def sleep_rate_limited(self, retry_after: float, *, is_global: bool = False) -> None:
+        self.rate_limited += 1
+        global_over = None
+        if is_global:
+            self.global_rate_limited += 1
+            _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+            global_over = self._global_over
+            if global_over is None or global_over.is_set():
+                # a new event every time, one from a previous loop can't be awaited
+                global_over = self._global_over = asyncio.Event()
+
+        await asyncio.sleep(retry_after)
+
+        # release the global lock now that the
+        # global rate limit has passed
+        if global_over is not None:
+            global_over.set()
+            _log.debug('Global rate limit is now over.')
+
+    def record(self, status: int, elapsed: float) -> None:
+        self.requests += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latency.record(elapsed)
+
+    def record_queued(self, elapsed: float) -> None:
+        # time spent waiting on the global and bucket locks before the first attempt
+        self.queued.record(elapsed)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+            'global_rate_limited': self.global_rate_limited,
+            'statuses': dict(self.statuses),
+            'buckets': len(self._buckets),
+            'latency': self.latency.to_dict(),
+            'queue_latency': self.queued.to_dict(),
+        }
+
+
+# The rate limiter of each HTTPClient session, so webhooks that were created from the
+# client's state (and thus share its session) also share its buckets and metrics.
+_session_rate_limiters: weakref.WeakKeyDictionary[aiohttp.ClientSession, RateLimiter] = weakref.WeakKeyDictionary()
+
+
 # For some reason, the Discord voice websocket expects this header to be
 # completely lowercase while aiohttp respects spec and does it as case-insensitive
 aiohttp.hdrs.WEBSOCKET = 'websocket'  # type: ignore
@@ -171,25 +285,25 @@ class HTTPClient:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
-        self._global_over: asyncio.Event = asyncio.Event()
-        self._global_over.set()
+        self._rate_limiter: RateLimiter = RateLimiter()
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
         self.use_clock: bool = not unsync_clock
+        self.api_base: str = Route.BASE
 
         user_agent = 'DiscordBot (https://github.com/CuzImSyntax/dis.py {0}) Python/{1[0]}.{1[1]} aiohttp/{2}'
         self.user_agent: str = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
 
     def recreate(self) -> None:
-        if self.__session.closed:
+        if self.__session is MISSING or self.__session.closed:
             self.__session = aiohttp.ClientSession(
                 connector=self.connector, ws_response_class=DiscordClientWebSocketResponse
             )
+            _session_rate_limiters[self.__session] = self._rate_limiter
 
-    async def ws_connect(self, url: str, *, compress: int = 0) -> Any:
+    async def ws_connect(self, url: str, *, compress: int = 0, session: Optional[aiohttp.ClientSession] = None) -> Any:
         kwargs = {
             'proxy_auth': self.proxy_auth,
             'proxy': self.proxy,
@@ -202,7 +316,9 @@ class HTTPClient:
             'compress': compress,
         }
 
-        return await self.__session.ws_connect(url, **kwargs)
+        if session is None:
+            session = self.__session
+        return await session.ws_connect(url, **kwargs)
 
     async def request(
         self,
@@ -215,12 +331,11 @@ class HTTPClient:
         bucket = route.bucket
         method = route.method
         url = route.url
+        if self.api_base != Route.BASE:
+            url = self.api_base + url[len(Route.BASE):]
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
+        rate_limiter = self._rate_limiter
+        lock = rate_limiter.lock_for(bucket)
 
         # header creation
         headers: Dict[str, str] = {
@@ -250,13 +365,13 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs['proxy_auth'] = self.proxy_auth
 
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
+        queued_at = time.perf_counter()
+        await rate_limiter.wait_global()
 
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
         await lock.acquire()
+        rate_limiter.record_queued(time.perf_counter() - queued_at)
         with MaybeUnlock(lock) as maybe_lock:
             for tries in range(5):
                 if files:
@@ -270,7 +385,9 @@ class HTTPClient:
                     kwargs['data'] = form_data
 
                 try:
+                    start = time.perf_counter()
                     async with self.__session.request(method, url, **kwargs) as response:
+                        rate_limiter.record(response.status, time.perf_counter() - start)
                         _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
 
                         # even errors have text involved in them so this is safe to call
@@ -283,7 +400,7 @@ class HTTPClient:
                             delta = utils._parse_ratelimit_header(response, use_clock=self.use_clock)
                             _log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
                             maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
+                            rate_limiter.release_later(lock, delta)
 
                         # the request was successful so just return the text/json
                         if 300 > response.status >= 200:
@@ -304,19 +421,8 @@ class HTTPClient:
 
                             # check if it's a global rate limit
                             is_global = data.get('global', False)
-                            if is_global:
-                                _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
-
-                            await asyncio.sleep(retry_after)
+                            await rate_limiter.sleep_rate_limited(retry_after, is_global=is_global)
                             _log.debug('Done sleeping for the rate limit. Retrying...')
-
-                            # release the global lock now that the
-                            # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug('Global rate limit is now over.')
-
                             continue
 
                         # we've received a 500, 502, or 504, unconditional retry
@@ -362,6 +468,9 @@ class HTTPClient:
             else:
                 raise HTTPException(resp, 'failed to get asset')
 
+    def metrics(self) -> Dict[str, Any]:
+        return self._rate_limiter.metrics()
+
     # state management
 
     async def close(self) -> None:
@@ -373,6 +482,7 @@ class HTTPClient:
     async def static_login(self, token: str) -> user.User:
         # Necessary to get aiohttp to stop complaining about session creation
         self.__session = aiohttp.ClientSession(connector=self.connector, ws_response_class=DiscordClientWebSocketResponse)
+        _session_rate_limiters[self.__session] = self._rate_limiter
         old_token = self.token
         self.token = token
 
@@ -1909,6 +2019,12 @@ class HTTPClient:
         return value.format(data['url'], encoding)
 
     async def get_bot_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str]:
+        shards, url, _ = await self.get_bot_gateway_info(encoding=encoding, zlib=zlib)
+        return shards, url
+
+    async def get_bot_gateway_info(
+        self, *, encoding: str = 'json', zlib: bool = True
+    ) -> Tuple[int, str, gateway.SessionStartLimit]:
         try:
             data = await self.request(Route('GET', '/gateway/bot'))
         except HTTPException as exc:
@@ -1918,7 +2034,8 @@ class HTTPClient:
             value = '{0}?encoding={1}&v=9&compress=zlib-stream'
         else:
             value = '{0}?encoding={1}&v=9'
-        return data['shards'], value.format(data['url'], encoding)
+        limits = data.get('session_start_limit') or {'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': 1}
+        return data['shards'], value.format(data['url'], encoding), limits
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route('GET', '/users/{user_id}', user_id=user_id))
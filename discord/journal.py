@@ -0,0 +1,450 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
+
+from . import utils
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__ = (
+    'EventJournal',
+    'JournalRecord',
+)
+
+_log = logging.getLogger(__name__)
+
+# crc32, length, sequence, shard_id, kind, padding
+# the crc covers everything after itself, including the payload
+_HEADER = struct.Struct('<IIqhBx')
+_HEADER_TAIL = struct.Struct('<IqhBx')
+
+_KIND_DISPATCH = 0
+_KIND_READY = 1
+_KIND_INVALIDATE = 2
+
+_SEGMENT_SUFFIX = '.seg'
+
+
+class JournalRecord(NamedTuple):
+    """A frame read back from an :class:`EventJournal`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    shard_id: Optional[:class:`int`]
+        The shard the frame was received on.
+    sequence: :class:`int`
+        The sequence number of the frame.
+    frame: :class:`bytes`
+        The raw JSON payload.
+    """
+
+    shard_id: Optional[int]
+    sequence: int
+    frame: bytes
+
+
+class _Session:
+    __slots__ = ('session_id', 'sequence', 'segment', 'offset')
+
+    def __init__(self, session_id: str, sequence: int, segment: int, offset: int) -> None:
+        self.session_id: str = session_id
+        self.sequence: int = sequence
+        self.segment: int = segment
+        self.offset: int = offset
+
+
+def _to_shard(value: Optional[int]) -> int:
+    return -1 if value is None else value
+
+
+def _from_shard(value: int) -> Optional[int]:
+    return None if value == -1 else value
+
+
+def _iter_records(
+    buffer: Union[mmap.mmap, bytes], start: int = 0, size: Optional[int] = None
+) -> Iterator[Tuple[int, int, int, int, int, int]]:
+    # yields (offset, length, sequence, shard, kind, payload_offset) until the
+    # end of the written area or the first torn record
+    if size is None:
+        size = len(buffer)
+    offset = start
+    header_size = _HEADER.size
+    while offset + header_size <= size:
+        crc, length, sequence, shard, kind = _HEADER.unpack_from(buffer, offset)
+        if length == 0 and crc == 0:
+            return
+
+        end = offset + header_size + length
+        if end > size:
+            return
+
+        if zlib.crc32(buffer[offset + 4:end]) != crc:
+            _log.warning('Discarding torn journal record at offset %d.', offset)
+            return
+
+        yield offset, length, sequence, shard, kind, offset + header_size
+        offset = end
+
+
+class EventJournal:
+    """An append-only log of raw gateway dispatch frames.
+
+    The journal is a directory of fixed size, memory-mapped segment files.
+    Every dispatch received by the gateway is appended along with its shard
+    ID and sequence number, which allows a :class:`Client` that was
+    restarted to rebuild its cache from the journal and RESUME the previous
+    session instead of sending a fresh IDENTIFY.
+
+    Records only reach the disk through the operating system's page cache,
+    meaning the journal survives the process crashing but not the machine
+    itself. A record that was only partially written is detected through its
+    checksum and discarded when the journal is opened.
+
+    Resuming is only possible as long as the ``READY`` of the session is
+    still part of the retained segments, otherwise the session is forgotten
+    and the client will IDENTIFY as usual.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The directory the segments are stored in. It is created if it
+        does not exist.
+    segment_size: :class:`int`
+        The size in bytes of a single segment. Frames larger than this
+        get a segment of their own. Defaults to 16 MiB.
+    max_segments: :class:`int`
+        The number of segments to retain before the oldest one is deleted.
+        Defaults to 8.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        segment_size: int = 16 * 1024 * 1024,
+        max_segments: int = 8,
+    ) -> None:
+        if segment_size <= _HEADER.size:
+            raise ValueError(f'segment_size must be greater than {_HEADER.size}')
+        if max_segments < 1:
+            raise ValueError('max_segments must be at least 1')
+
+        self.path: str = os.fspath(path)
+        self.segment_size: int = segment_size
+        self.max_segments: int = max_segments
+
+        self._segments: List[int] = []
+        self._sessions: Dict[int, _Session] = {}
+        self._file: Optional[Any] = None
+        self._map: Optional[mmap.mmap] = None
+        self._offset: int = 0
+        self._closed: bool = False
+
+        os.makedirs(self.path, exist_ok=True)
+        self._recover()
+
+    def __repr__(self) -> str:
+        return f'<EventJournal path={self.path!r} segments={len(self._segments)} sessions={len(self._sessions)}>'
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.path, f'{index:016d}{_SEGMENT_SUFFIX}')
+
+    def _recover(self) -> None:
+        indexes = []
+        for name in os.listdir(self.path):
+            if name.endswith(_SEGMENT_SUFFIX):
+                try:
+                    indexes.append(int(name[: -len(_SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+
+        indexes.sort()
+        self._segments = indexes
+        if not indexes:
+            self._open_segment(0, self.segment_size)
+            return
+
+        last = indexes[-1]
+        for index in indexes:
+            with open(self._segment_path(index), 'rb') as fp:
+                size = os.fstat(fp.fileno()).st_size
+                end = 0
+                if size:
+                    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                        end = self._scan(index, buffer)
+
+            if index == last:
+                self._open_segment(index, max(size, self.segment_size), offset=end)
+
+    def _scan(self, index: int, buffer: mmap.mmap) -> int:
+        end = 0
+        sessions = self._sessions
+        for offset, length, sequence, shard, kind, start in _iter_records(buffer):
+            end = start + length
+            if kind == _KIND_READY:
+                data = utils._from_json(buffer[start:end])
+                sessions[shard] = _Session(data['d']['session_id'], sequence, index, offset)
+            elif kind == _KIND_INVALIDATE:
+                sessions.pop(shard, None)
+            else:
+                session = sessions.get(shard)
+                if session is not None:
+                    session.sequence = sequence
+        return end
+
+    def _open_segment(self, index: int, size: int, *, offset: int = 0) -> None:
+        self._close_segment()
+        path = self._segment_path(index)
+        fp = open(path, 'a+b')
+        if os.fstat(fp.fileno()).st_size < size:
+            fp.truncate(size)
+
+        self._file = fp
+        self._map = mmap.mmap(fp.fileno(), 0)
+        self._offset = offset
+        if not self._segments or self._segments[-1] != index:
+            self._segments.append(index)
+
+        # a torn record might have been left behind by a crash, so make sure
+        # that the next read does not mistake it for written data
+        if offset + _HEADER.size <= len(self._map):
+            self._map[offset : offset + _HEADER.size] = bytes(_HEADER.size)
+
+    def _close_segment(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self, needed: int) -> None:
+        index = self._segments[-1] + 1 if self._segments else 0
+        self._open_segment(index, max(self.segment_size, needed))
+
+        while len(self._segments) > self.max_segments:
+            oldest = self._segments.pop(0)
+            try:
+                os.remove(self._segment_path(oldest))
+            except FileNotFoundError:
+                pass
+
+            expired = [shard for shard, session in self._sessions.items() if session.segment <= oldest]
+            for shard in expired:
+                _log.info('Journaled session for shard ID %s no longer fits in the journal.', _from_shard(shard))
+                del self._sessions[shard]
+
+    def _write(self, shard: int, sequence: int, kind: int, payload: bytes) -> Tuple[int, int]:
+        if self._closed:
+            raise ValueError('journal is closed')
+
+        length = len(payload)
+        needed = _HEADER.size + length
+        if self._map is None or self._offset + needed > len(self._map):
+            self._rotate(needed)
+
+        buffer = self._map
+        offset = self._offset
+        start = offset + _HEADER.size
+        crc = zlib.crc32(payload, zlib.crc32(_HEADER_TAIL.pack(length, sequence, shard, kind)))
+        buffer[start : start + length] = payload
+        _HEADER.pack_into(buffer, offset, crc, length, sequence, shard, kind)
+        self._offset = start + length
+        return self._segments[-1], offset
+
+    def append(
+        self,
+        shard_id: Optional[int],
+        sequence: int,
+        frame: Union[str, bytes],
+        *,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Appends a raw dispatch frame to the journal.
+
+        Parameters
+        -----------
+        shard_id: Optional[:class:`int`]
+            The shard the frame was received on.
+        sequence: :class:`int`
+            The sequence number of the frame.
+        frame: Union[:class:`str`, :class:`bytes`]
+            The raw JSON payload as received by the gateway.
+        session_id: Optional[:class:`str`]
+            The session ID if the frame is a ``READY``. This starts a new
+            session for the shard.
+        """
+        if isinstance(frame, str):
+            frame = frame.encode('utf-8')
+
+        shard = _to_shard(shard_id)
+        if session_id is not None:
+            segment, offset = self._write(shard, sequence, _KIND_READY, frame)
+            self._sessions[shard] = _Session(session_id, sequence, segment, offset)
+            return
+
+        self._write(shard, sequence, _KIND_DISPATCH, frame)
+        session = self._sessions.get(shard)
+        if session is not None:
+            session.sequence = sequence
+
+    def invalidate(self, shard_id: Optional[int]) -> None:
+        """Marks the current session of a shard as no longer resumable.
+
+        Parameters
+        -----------
+        shard_id: Optional[:class:`int`]
+            The shard whose session was invalidated.
+        """
+        shard = _to_shard(shard_id)
+        if self._sessions.pop(shard, None) is not None:
+            self._write(shard, 0, _KIND_INVALIDATE, b'')
+
+    def session(self, shard_id: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """Returns the resumable session of a shard, if any.
+
+        Parameters
+        -----------
+        shard_id: Optional[:class:`int`]
+            The shard to look up.
+
+        Returns
+        --------
+        Optional[Tuple[:class:`str`, :class:`int`]]
+            The session ID and the last journaled sequence number.
+        """
+        session = self._sessions.get(_to_shard(shard_id))
+        if session is None:
+            return None
+        return session.session_id, session.sequence
+
+    def _iter_segment(self, index: int, start: int) -> Iterator[Tuple[int, int, int, bytes]]:
+        if self._segments and index == self._segments[-1] and self._map is not None:
+            buffer = self._map
+            for _, length, sequence, shard, kind, offset in _iter_records(buffer, start, self._offset):
+                yield shard, sequence, kind, buffer[offset : offset + length]
+            return
+
+        try:
+            fp = open(self._segment_path(index), 'rb')
+        except FileNotFoundError:
+            return
+
+        with fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                return
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for _, length, sequence, shard, kind, offset in _iter_records(buffer, start):
+                    yield shard, sequence, kind, buffer[offset : offset + length]
+
+    def replay(self, shard_id: Optional[int] = None, *, all_shards: bool = False) -> Iterator[JournalRecord]:
+        """Iterates over the journaled frames in the order they were received.
+
+        By default only the frames belonging to the resumable session of
+        ``shard_id`` are returned, starting with its ``READY``.
+
+        Parameters
+        -----------
+        shard_id: Optional[:class:`int`]
+            The shard to replay.
+        all_shards: :class:`bool`
+            Whether to return every retained frame of every shard instead,
+            regardless of session boundaries.
+
+        Yields
+        -------
+        :class:`JournalRecord`
+            A journaled frame.
+        """
+        if all_shards:
+            for index in list(self._segments):
+                for shard, sequence, kind, payload in self._iter_segment(index, 0):
+                    if kind != _KIND_INVALIDATE:
+                        yield JournalRecord(_from_shard(shard), sequence, payload)
+            return
+
+        shard = _to_shard(shard_id)
+        session = self._sessions.get(shard)
+        if session is None:
+            return
+
+        segments = [index for index in self._segments if index >= session.segment]
+        for index in segments:
+            start = session.offset if index == session.segment else 0
+            for record_shard, sequence, kind, payload in self._iter_segment(index, start):
+                if record_shard != shard:
+                    continue
+                if kind == _KIND_INVALIDATE:
+                    return
+                yield JournalRecord(shard_id, sequence, payload)
+
+    def replay_into(self, client: Client, shard_id: Optional[int] = None) -> int:
+        """Rebuilds the cache of a client from the resumable session of a shard.
+
+        Events are not dispatched while replaying.
+
+        Parameters
+        -----------
+        client: :class:`Client`
+            The client whose cache should be populated.
+        shard_id: Optional[:class:`int`]
+            The shard to replay.
+
+        Returns
+        --------
+        :class:`int`
+            The number of frames that were replayed.
+        """
+        return client._connection._replay_journal(self, shard_id)
+
+    def flush(self) -> None:
+        """Asks the operating system to write the current segment to disk."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the journal."""
+        if self._closed:
+            return
+        self.flush()
+        self._close_segment()
+        self._closed = True
+
+    def is_closed(self) -> bool:
+        """:class:`bool`: Indicates if the journal is closed."""
+        return self._closed
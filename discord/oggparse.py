@@ -24,9 +24,11 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import array
+import bisect
 import struct
 
-from typing import TYPE_CHECKING, ClassVar, IO, Generator, Tuple, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, IO, Generator, Tuple, Optional
 
 from .errors import DiscordException
 
@@ -34,6 +36,7 @@ __all__ = (
     'OggError',
     'OggPage',
     'OggStream',
+    'OggIndex',
 )
 
 class OggError(DiscordException):
@@ -111,3 +114,56 @@ class OggStream:
                 if complete:
                     yield partial
                     partial = b''
+
+class OggIndex:
+    """The pages of the first logical stream in a seekable buffer, such as a
+    memory mapped file, by offset and granule position.
+
+    Only the page headers are read to build it.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self.buffer: Any = buffer
+        self.offsets: array.array[int] = array.array('Q')
+        # the granule position of the last packet that ended on or before the page
+        self.granules: array.array[int] = array.array('q')
+        self.continued: bytearray = bytearray()
+
+        header = OggPage._header
+        size = len(buffer)
+        offset = 0
+        granule = 0
+        serial = None
+        while offset + 27 <= size:
+            if buffer[offset:offset+4] != b'OggS':
+                raise OggError('invalid header magic')
+
+            flag, gran_pos, page_serial, _, _, segnum = header.unpack_from(buffer, offset + 4)
+            end = offset + 27 + segnum
+            if end > size:
+                break
+            end += sum(buffer[offset+27:end])
+            if end > size:
+                break
+
+            if serial is None:
+                serial = page_serial
+            if page_serial == serial:
+                # pages without a packet ending on them have a granule position of -1
+                if gran_pos != 0xFFFFFFFFFFFFFFFF:
+                    granule = gran_pos
+                self.offsets.append(offset)
+                self.granules.append(granule)
+                self.continued.append(flag & 0x01)
+            offset = end
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def page(self, index: int) -> OggPage:
+        self.buffer.seek(self.offsets[index] + 4)
+        return OggPage(self.buffer)
+
+    def find(self, granule: int) -> int:
+        """Returns the index of the first page a packet ending after ``granule`` ends on."""
+        return bisect.bisect_right(self.granules, granule)
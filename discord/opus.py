@@ -356,6 +356,12 @@ class Encoder(_OpusStruct):
 
     def encode(self, pcm: bytes, frame_size: int) -> bytes:
         max_data_bytes = len(pcm)
+        if not isinstance(pcm, bytes):
+            # the frames of the PCM transformers are views of writable buffers
+            try:
+                pcm = (ctypes.c_char * max_data_bytes).from_buffer(pcm)  # type: ignore
+            except TypeError:
+                pcm = bytes(pcm)
         # bytes can be used to reference pointer
         pcm_ptr = ctypes.cast(pcm, c_int16_ptr) # type: ignore
         data = (ctypes.c_char * max_data_bytes)()
@@ -437,18 +443,18 @@ class Decoder(_OpusStruct):
         if data is None and fec:
             raise InvalidArgument("Invalid arguments: FEC cannot be used with null data")
 
-        if data is None:
+        if data is None or fec:
+            # a lost packet is as long as the packet before it
             frame_size = self._get_last_packet_duration() or self.SAMPLES_PER_FRAME
-            channel_count = self.CHANNELS
         else:
             frames = self.packet_get_nb_frames(data)
-            channel_count = self.packet_get_nb_channels(data)
             samples_per_frame = self.packet_get_samples_per_frame(data)
             frame_size = frames * samples_per_frame
 
-        pcm = (ctypes.c_int16 * (frame_size * channel_count))()
+        # the decoder always outputs its own channel count, whatever the packet has
+        pcm = (ctypes.c_int16 * (frame_size * self.CHANNELS))()
         pcm_ptr = ctypes.cast(pcm, c_int16_ptr)
 
         ret = _lib.opus_decode(self._state, data, len(data) if data else 0, pcm_ptr, frame_size, fec)
 
-        return array.array('h', pcm[:ret * channel_count]).tobytes()
+        return ctypes.string_at(pcm, ret * self.CHANNELS * 2)
@@ -0,0 +1,267 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import array
+import operator
+import warnings
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ModuleNotFoundError:
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
+with warnings.catch_warnings():
+    # audioop is deprecated since 3.11 and was removed in 3.13
+    warnings.simplefilter('ignore', DeprecationWarning)
+    try:
+        import audioop
+    except ModuleNotFoundError:
+        audioop = None
+        HAS_AUDIOOP = False
+    else:
+        HAS_AUDIOOP = True
+
+__all__ = (
+    'FrameMixer',
+    'Resampler',
+)
+
+# Every frame is 20ms of 16-bit 48KHz stereo PCM. The NumPy paths work on
+# buffers allocated once per processor and only create views per frame.
+# Without NumPy, audioop is used where it can still be imported and the
+# array paths are the fallback when neither is available.
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+FRAME_LENGTH = SAMPLE_RATE // 50
+FRAME_SAMPLES = FRAME_LENGTH * CHANNELS
+FRAME_SIZE = FRAME_SAMPLES * 2
+
+# gains are applied in fixed point by the array path
+_SHIFT = 12
+_ONE = 1 << _SHIFT
+
+# the audioop path ramps a gain in 1ms steps
+_RAMP_STEPS = 20
+_RAMP_STEP_SIZE = FRAME_SIZE // _RAMP_STEPS
+
+
+def _padded(frame: Any, size: int) -> Any:
+    data = memoryview(frame).cast('B')[:size]
+    if len(data) < size:
+        return bytes(data).ljust(size, b'\0')
+    return data
+
+
+class FrameMixer:
+    """Scales and sums frames into one preallocated frame.
+
+    Every frame has a start and an end gain, the gain moves linearly between
+    them over the frame so that volume changes do not click.
+
+    The returned view is only valid until the next call.
+    """
+
+    def __init__(self, *, use_numpy: bool = HAS_NUMPY, use_audioop: bool = HAS_AUDIOOP) -> None:
+        self.use_numpy: bool = use_numpy
+        self.use_audioop: bool = use_audioop and not use_numpy
+        self._buffer: bytearray = bytearray(FRAME_SIZE)
+        self._view: memoryview = memoryview(self._buffer)
+        if use_numpy:
+            self._out: Any = numpy.frombuffer(self._buffer, dtype=numpy.int16)
+            self._total: Any = numpy.empty(FRAME_SAMPLES, dtype=numpy.float32)
+            self._scratch: Any = numpy.empty(FRAME_SAMPLES, dtype=numpy.float32)
+            # both samples of a stereo pair get the same gain
+            self._ramp: Any = numpy.repeat(numpy.arange(FRAME_LENGTH, dtype=numpy.float32) / FRAME_LENGTH, CHANNELS)
+        else:
+            self._samples: memoryview = self._view.cast('h')
+
+    def mix(self, frames: Sequence[Any], gains: Sequence[Tuple[float, float]]) -> memoryview:
+        if self.use_numpy:
+            self._mix_numpy(frames, gains)
+        elif self.use_audioop:
+            self._mix_audioop(frames, gains)
+        else:
+            self._mix_array(frames, gains)
+        return self._view
+
+    def _mix_numpy(self, frames: Sequence[Any], gains: Sequence[Tuple[float, float]]) -> None:
+        total = self._total
+        total.fill(0.0)
+        for frame, (start, end) in zip(frames, gains):
+            samples = numpy.frombuffer(frame, dtype=numpy.int16, count=min(len(frame) // 2, FRAME_SAMPLES))
+            length = len(samples)
+            scratch = self._scratch[:length]
+            if start == end:
+                numpy.multiply(samples, start, out=scratch)
+            else:
+                numpy.multiply(self._ramp[:length], end - start, out=scratch)
+                numpy.add(scratch, start, out=scratch)
+                numpy.multiply(scratch, samples, out=scratch)
+            numpy.add(total[:length], scratch, out=total[:length])
+
+        numpy.clip(total, -32768, 32767, out=total)
+        numpy.copyto(self._out, total, casting='unsafe')
+
+    def _mix_audioop(self, frames: Sequence[Any], gains: Sequence[Tuple[float, float]]) -> None:
+        total: Optional[bytes] = None
+        for frame, (start, end) in zip(frames, gains):
+            samples = _padded(frame, FRAME_SIZE)
+            if start == end:
+                scaled = audioop.mul(samples, 2, start)
+            else:
+                step = (end - start) / _RAMP_STEPS
+                scaled = b''.join(
+                    audioop.mul(samples[offset:offset + _RAMP_STEP_SIZE], 2, start + step * (index + 0.5))
+                    for index, offset in enumerate(range(0, FRAME_SIZE, _RAMP_STEP_SIZE))
+                )
+            total = scaled if total is None else audioop.add(total, scaled, 2)
+
+        self._view[:] = bytes(FRAME_SIZE) if total is None else total
+
+    def _mix_array(self, frames: Sequence[Any], gains: Sequence[Tuple[float, float]]) -> None:
+        total: Optional[List[int]] = None
+        for frame, (start, end) in zip(frames, gains):
+            samples = memoryview(frame).cast('B').cast('h')[:FRAME_SAMPLES]
+            if start == end:
+                gain = int(start * _ONE)
+                scaled = [sample * gain for sample in samples]
+            else:
+                step = (end - start) / FRAME_LENGTH
+                scaled = [sample * int((start + step * (index >> 1)) * _ONE) for index, sample in enumerate(samples)]
+            scaled.extend([0] * (FRAME_SAMPLES - len(scaled)))
+            total = scaled if total is None else list(map(operator.add, total, scaled))
+
+        if total is None:
+            total = [0] * FRAME_SAMPLES
+        shifted = [value >> _SHIFT for value in total]
+        self._samples[:] = array.array('h', [32767 if v > 32767 else -32768 if v < -32768 else v for v in shifted])
+
+
+class Resampler:
+    """Converts 20ms frames of 16-bit PCM at another sample rate and channel
+    count to 48KHz stereo by linear interpolation.
+
+    The last sample of every frame is carried over to interpolate the start
+    of the next one, which delays the audio by one input sample.
+
+    The returned view is only valid until the next call.
+    """
+
+    def __init__(self, rate: int, channels: int, *, use_numpy: bool = HAS_NUMPY, use_audioop: bool = HAS_AUDIOOP) -> None:
+        if rate <= 0 or rate % 50:
+            raise ValueError('rate must be a positive multiple of 50')
+        if channels not in (1, 2):
+            raise ValueError('channels must be 1 or 2')
+
+        self.rate: int = rate
+        self.channels: int = channels
+        self.use_numpy: bool = use_numpy
+        self.use_audioop: bool = use_audioop and not use_numpy
+        self.length: int = rate // 50
+        self.frame_size: int = self.length * channels * 2
+        self._buffer: bytearray = bytearray(FRAME_SIZE)
+        self._view: memoryview = memoryview(self._buffer)
+
+        # the position of every output sample in the input frame, which is
+        # preceded by the last sample of the previous frame
+        positions = [index * self.length / FRAME_LENGTH for index in range(FRAME_LENGTH)]
+        if use_numpy:
+            position = numpy.array(positions, dtype=numpy.float64)
+            self._first: Any = numpy.floor(position).astype(numpy.intp)
+            self._second: Any = self._first + 1
+            self._weight: Any = (position - self._first).astype(numpy.float32)[:, None]
+            self._input: Any = numpy.zeros((self.length + 1, channels), dtype=numpy.float32)
+            self._low: Any = numpy.empty((FRAME_LENGTH, channels), dtype=numpy.float32)
+            self._high: Any = numpy.empty((FRAME_LENGTH, channels), dtype=numpy.float32)
+            self._out: Any = numpy.frombuffer(self._buffer, dtype=numpy.int16).reshape(FRAME_LENGTH, CHANNELS)
+        elif self.use_audioop:
+            self._state: Any = None
+        else:
+            self._points: List[Tuple[int, int]] = [
+                (int(position), int((position - int(position)) * _ONE)) for position in positions
+            ]
+            self._previous: List[int] = [0] * channels
+            self._samples: memoryview = self._view.cast('h')
+
+    def convert(self, data: Any) -> memoryview:
+        if self.use_numpy:
+            self._convert_numpy(data)
+        elif self.use_audioop:
+            self._convert_audioop(data)
+        else:
+            self._convert_array(data)
+        return self._view
+
+    def _convert_numpy(self, data: Any) -> None:
+        count = min(len(data) // 2, self.length * self.channels)
+        samples = numpy.frombuffer(data, dtype=numpy.int16, count=count).reshape(-1, self.channels)
+        frame = self._input
+        frame[0] = frame[-1]
+        frame[1:len(samples) + 1] = samples
+        frame[len(samples) + 1:] = 0.0
+
+        low, high = self._low, self._high
+        numpy.take(frame, self._first, axis=0, out=low)
+        numpy.take(frame, self._second, axis=0, out=high)
+        numpy.subtract(high, low, out=high)
+        numpy.multiply(high, self._weight, out=high)
+        numpy.add(low, high, out=low)
+        # a mono frame is broadcast to both channels
+        numpy.copyto(self._out, low, casting='unsafe')
+
+    def _convert_audioop(self, data: Any) -> None:
+        samples = _padded(data, self.frame_size)
+        converted, self._state = audioop.ratecv(samples, 2, self.channels, self.rate, SAMPLE_RATE, self._state)
+        if self.channels == 1:
+            converted = audioop.tostereo(converted, 2, 1, 1)
+        # ratecv holds back a few samples of the first frame, they are made
+        # up for with silence at its start
+        missing = FRAME_SIZE - len(converted)
+        if missing > 0:
+            converted = bytes(missing) + converted
+        self._view[:] = converted[:FRAME_SIZE]
+
+    def _convert_array(self, data: Any) -> None:
+        channels = self.channels
+        samples = list(memoryview(data).cast('B').cast('h')[:self.length * channels])
+        samples.extend([0] * (self.length * channels - len(samples)))
+        previous = self._previous
+        frame = previous + samples
+        self._previous = samples[-channels:]
+
+        out = [
+            low + ((frame[index + channels] - low) * weight >> _SHIFT)
+            for base, weight in self._points
+            for index in range(base * channels, base * channels + channels)
+            for low in (frame[index],)
+        ]
+        if channels == 1:
+            out = [sample for sample in out for _ in range(CHANNELS)]
+        self._samples[:] = array.array('h', out)
@@ -26,22 +26,49 @@ from __future__ import annotations
 import threading
 import traceback
 import subprocess
-import audioop
 import asyncio
+import bisect
+import functools
+import array
+import heapq
+import mmap
 import logging
 import shlex
 import time
 import json
+import weakref
+import struct
 import sys
 import re
 import io
-
-from typing import Any, Callable,  Generic, IO, Optional, TYPE_CHECKING, Tuple, Type, TypeVar, Union
+import os
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generator,
+    Generic,
+    IO,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from .errors import ClientException
 from .opus import Encoder as OpusEncoder
-from .oggparse import OggStream
+from .oggparse import OggError, OggIndex, OggStream
+from .pcm import FrameMixer, Resampler, audioop
 from .utils import MISSING
+from . import utils
 
 if TYPE_CHECKING:
     from .voice_client import VoiceClient
@@ -49,6 +76,7 @@ if TYPE_CHECKING:
 
 AT = TypeVar('AT', bound='AudioSource')
 FT = TypeVar('FT', bound='FFmpegOpusAudio')
+FFT = TypeVar('FFT', bound='FFmpegAudio')
 
 _log = logging.getLogger(__name__)
 
@@ -58,7 +86,14 @@ __all__ = (
     'FFmpegAudio',
     'FFmpegPCMAudio',
     'FFmpegOpusAudio',
+    'OggOpusFileSource',
+    'OggOpusCache',
     'PCMVolumeTransformer',
+    'PCMMixer',
+    'MixerTrack',
+    'AudioBroadcast',
+    'BroadcastSource',
+    'AudioScheduler',
 )
 
 CREATE_NO_WINDOW: int
@@ -68,6 +103,54 @@ if sys.platform != 'win32':
 else:
     CREATE_NO_WINDOW = 0x08000000
 
+class _FFmpegMetrics:
+    # shared by every FFmpeg source, recorded from the event loop and the audio threads
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.spawn: utils._LatencyHistogram = utils._LatencyHistogram()
+        self.first_read: utils._LatencyHistogram = utils._LatencyHistogram()
+        self.probe: utils._LatencyHistogram = utils._LatencyHistogram()
+        self.prepared: int = 0
+        self.probe_cache_hits: int = 0
+        self.probe_cache_misses: int = 0
+
+    def record(self, histogram: utils._LatencyHistogram, elapsed: float) -> None:
+        with self.lock:
+            histogram.record(elapsed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'spawn': self.spawn.to_dict(),
+                'first_read': self.first_read.to_dict(),
+                'probe': self.probe.to_dict(),
+                'prepared': self.prepared,
+                'probe_cache_hits': self.probe_cache_hits,
+                'probe_cache_misses': self.probe_cache_misses,
+            }
+
+_ffmpeg_metrics = _FFmpegMetrics()
+
+async def _communicate(args: List[str], *, stderr: int, timeout: float) -> Tuple[int, bytes]:
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.PIPE, stderr=stderr, creationflags=CREATE_NO_WINDOW
+        )
+    except FileNotFoundError:
+        raise ClientException(args[0] + ' was not found.') from None
+
+    try:
+        output, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, output  # type: ignore
+
+def _cleanup_unclaimed(future: asyncio.Future[AudioSource]) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().cleanup()
+
 class AudioSource:
     """Represents an audio stream.
 
@@ -117,19 +200,50 @@ class AudioSource:
 class PCMAudio(AudioSource):
     """Represents raw 16-bit 48KHz stereo PCM audio source.
 
+    PCM at other sample rates or in mono can be read as well, it is then
+    converted to 48KHz stereo by linear interpolation.
+
+    Parameters
+    -----------
+    stream: :term:`py:file object`
+        A file-like object that reads byte data representing raw PCM.
+    rate: :class:`int`
+        The sample rate of the PCM. It must be a multiple of 50.
+
+        .. versionadded:: 2.0
+    channels: :class:`int`
+        The number of channels of the PCM, 1 or 2.
+
+        .. versionadded:: 2.0
+
     Attributes
     -----------
     stream: :term:`py:file object`
         A file-like object that reads byte data representing raw PCM.
+
+    Raises
+    -------
+    ValueError
+        The sample rate or channels are not supported.
     """
-    def __init__(self, stream: io.BufferedIOBase) -> None:
+    def __init__(self, stream: io.BufferedIOBase, *, rate: int = 48000, channels: int = 2) -> None:
         self.stream: io.BufferedIOBase = stream
+        self._resampler: Optional[Resampler] = None
+        if rate != 48000 or channels != 2:
+            self._resampler = Resampler(rate, channels)
 
     def read(self) -> bytes:
-        ret = self.stream.read(OpusEncoder.FRAME_SIZE)
-        if len(ret) != OpusEncoder.FRAME_SIZE:
+        resampler = self._resampler
+        if resampler is None:
+            ret = self.stream.read(OpusEncoder.FRAME_SIZE)
+            if len(ret) != OpusEncoder.FRAME_SIZE:
+                return b''
+            return ret
+
+        ret = self.stream.read(resampler.frame_size)
+        if len(ret) != resampler.frame_size:
             return b''
-        return ret
+        return resampler.convert(ret)  # type: ignore
 
 class FFmpegAudio(AudioSource):
     """Represents an FFmpeg (or AVConv) based AudioSource.
@@ -153,6 +267,7 @@ class FFmpegAudio(AudioSource):
         self._stdout: IO[bytes] = self._process.stdout  # type: ignore
         self._stdin: Optional[IO[Bytes]] = None
         self._pipe_thread: Optional[threading.Thread] = None
+        self._first_read: bool = True
 
         if piping:
             n = f'popen-stdin-writer:{id(self):#x}'
@@ -160,8 +275,102 @@ class FFmpegAudio(AudioSource):
             self._pipe_thread = threading.Thread(target=self._pipe_writer, args=(source,), daemon=True, name=n)
             self._pipe_thread.start()
 
+    @classmethod
+    async def prepare(cls: Type[FFT], *args: Any, timeout: float = 10.0, **kwargs: Any) -> FFT:
+        """|coro|
+
+        Creates the audio source in a separate thread and waits until FFmpeg
+        has written its first output, so that it starts playing right away.
+
+        This is meant for tracks that are queued behind the one playing, so
+        that spawning FFmpeg and opening the input overlap with playback
+        instead of delaying the next track.
+
+        Waiting for output is not supported on Windows, where this only
+        creates the source.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ------------
+        \*args
+            The arguments passed to the constructor.
+        timeout: :class:`float`
+            How long to wait for the first output at most. The source is
+            returned either way.
+        \*\*kwargs
+            The keyword arguments passed to the constructor.
+
+        Raises
+        --------
+        ClientException
+            The subprocess failed to be created.
+
+        Returns
+        --------
+        :class:`FFmpegAudio`
+            The audio source.
+        """
+        loop = asyncio.get_running_loop()
+        creating = loop.run_in_executor(None, functools.partial(cls, *args, **kwargs))
+        try:
+            source = await asyncio.shield(creating)
+        except asyncio.CancelledError:
+            # the constructor keeps running, its process is cleaned up once it returns
+            creating.add_done_callback(_cleanup_unclaimed)
+            raise
+        with _ffmpeg_metrics.lock:
+            _ffmpeg_metrics.prepared += 1
+
+        if sys.platform == 'win32':
+            return source
+
+        fd = source._stdout.fileno()
+        ready = loop.create_future()
+        try:
+            loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        except NotImplementedError:
+            return source
+
+        try:
+            try:
+                await asyncio.wait_for(ready, timeout=timeout)
+            finally:
+                loop.remove_reader(fd)
+        except asyncio.TimeoutError:
+            _log.info('ffmpeg process %s has not written anything after %.1fs.', source._process.pid, timeout)
+        except BaseException:
+            source.cleanup()
+            raise
+        return source
+
+    @staticmethod
+    def metrics() -> Dict[str, Any]:
+        """Returns how long starting FFmpeg has taken so far for every FFmpeg
+        based audio source.
+
+        ``spawn`` is the time it took to create the subprocess, ``first_read``
+        how long the first read of a source blocked, i.e. how long a track was
+        delayed by FFmpeg starting up, and ``probe`` the time probing took.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The latencies in seconds, the number of sources created with
+            :meth:`prepare` and the hits and misses of the probe cache of
+            :meth:`FFmpegOpusAudio.probe`.
+        """
+        return _ffmpeg_metrics.to_dict()
+
+    def _record_first_read(self, start: float) -> None:
+        self._first_read = False
+        _ffmpeg_metrics.record(_ffmpeg_metrics.first_read, time.perf_counter() - start)
+
     def _spawn_process(self, args: Any, **subprocess_kwargs: Any) -> subprocess.Popen:
         process = None
+        start = time.perf_counter()
         try:
             process = subprocess.Popen(args, creationflags=CREATE_NO_WINDOW, **subprocess_kwargs)
         except FileNotFoundError:
@@ -170,6 +379,7 @@ class FFmpegAudio(AudioSource):
         except subprocess.SubprocessError as exc:
             raise ClientException(f'Popen failed: {exc.__class__.__name__}: {exc}') from exc
         else:
+            _ffmpeg_metrics.record(_ffmpeg_metrics.spawn, time.perf_counter() - start)
             return process
 
     def _kill_process(self) -> None:
@@ -274,7 +484,10 @@ class FFmpegPCMAudio(FFmpegAudio):
         super().__init__(source, executable=executable, args=args, **subprocess_kwargs)
 
     def read(self) -> bytes:
+        start = time.perf_counter() if self._first_read else None
         ret = self._stdout.read(OpusEncoder.FRAME_SIZE)
+        if start is not None:
+            self._record_first_read(start)
         if len(ret) != OpusEncoder.FRAME_SIZE:
             return b''
         return ret
@@ -343,6 +556,17 @@ class FFmpegOpusAudio(FFmpegAudio):
         The subprocess failed to be created.
     """
 
+    #: The number of results :meth:`probe` keeps.
+    #:
+    #: .. versionadded:: 2.0
+    PROBE_CACHE_SIZE: ClassVar[int] = 256
+    _probe_cache: ClassVar[OrderedDict[Tuple[Any, ...], Tuple[Optional[str], Optional[int]]]] = OrderedDict()
+    _probe_pending: ClassVar[Dict[Tuple[Any, ...], asyncio.Task[Tuple[Optional[str], Optional[int]]]]] = {}
+    # spawning a subprocess blocks the event loop for a few milliseconds,
+    # so only this many probes run at once
+    _PROBE_CONCURRENCY: ClassVar[int] = 2
+    _probe_limit: ClassVar[Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]]] = None
+
     def __init__(
         self,
         source: Union[str, io.BufferedIOBase],
@@ -389,6 +613,7 @@ class FFmpegOpusAudio(FFmpegAudio):
         source: str,
         *,
         method: Optional[Union[str, Callable[[str, str], Tuple[Optional[str], Optional[int]]]]] = None,
+        cache: bool = True,
         **kwargs: Any,
     ) -> FT:
         """|coro|
@@ -429,6 +654,10 @@ class FFmpegOpusAudio(FFmpegAudio):
             (or avconv).  As a callable, it must take two string arguments, ``source`` and
             ``executable``.  Both parameters are the same values passed to this factory function.
             ``executable`` will default to ``ffmpeg`` if not provided as a keyword argument.
+        cache: :class:`bool`
+            Identical to the ``cache`` parameter for :meth:`FFmpegOpusAudio.probe`.
+
+            .. versionadded:: 2.0
         kwargs
             The remaining parameters to be passed to the :class:`FFmpegOpusAudio` constructor,
             excluding ``bitrate`` and ``codec``.
@@ -447,7 +676,7 @@ class FFmpegOpusAudio(FFmpegAudio):
         """
 
         executable = kwargs.get('executable')
-        codec, bitrate = await cls.probe(source, method=method, executable=executable)
+        codec, bitrate = await cls.probe(source, method=method, executable=executable, cache=cache)
         return cls(source, bitrate=bitrate, codec=codec, **kwargs)  # type: ignore
 
     @classmethod
@@ -457,11 +686,19 @@ class FFmpegOpusAudio(FFmpegAudio):
         *,
         method: Optional[Union[str, Callable[[str, str], Tuple[Optional[str], Optional[int]]]]] = None,
         executable: Optional[str] = None,
+        cache: bool = True,
     ) -> Tuple[Optional[str], Optional[int]]:
         """|coro|
 
         Probes the input source for bitrate and codec information.
 
+        .. versionchanged:: 2.0
+
+            The ``native`` and ``fallback`` methods run ffprobe and ffmpeg as
+            asyncio subprocesses rather than in an executor, and results
+            are cached. Spawning the subprocess blocks the event loop for a
+            few milliseconds, so only two probes run at once and the rest wait.
+
         Parameters
         ------------
         source
@@ -470,6 +707,13 @@ class FFmpegOpusAudio(FFmpegAudio):
             Identical to the ``method`` parameter for :meth:`FFmpegOpusAudio.from_probe`.
         executable: :class:`str`
             Identical to the ``executable`` parameter for :class:`FFmpegOpusAudio`.
+        cache: :class:`bool`
+            Whether to reuse the result of an earlier probe of the same source
+            with the same method and executable. A local file is probed again
+            if it was modified since. The last :attr:`PROBE_CACHE_SIZE` results
+            are kept.
+
+            .. versionadded:: 2.0
 
         Raises
         --------
@@ -503,32 +747,138 @@ class FFmpegOpusAudio(FFmpegAudio):
             raise TypeError("Expected str or callable for parameter 'probe', " \
                             f"not '{method.__class__.__name__}'")
 
+        key = cls._probe_cache_key(source, method, executable) if cache else None
+        if key is None:
+            return await cls._probe(source, method, executable, probefunc, fallback)
+
+        cached = cls._probe_cache.get(key)
+        with _ffmpeg_metrics.lock:
+            if cached is None:
+                _ffmpeg_metrics.probe_cache_misses += 1
+            else:
+                _ffmpeg_metrics.probe_cache_hits += 1
+        if cached is not None:
+            cls._probe_cache.move_to_end(key)
+            return cached
+
+        # sources queued at the same time share a single probe
+        loop = asyncio.get_running_loop()
+        pending = cls._probe_pending.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+
+        task = loop.create_task(cls._probe(source, method, executable, probefunc, fallback))
+        cls._probe_pending[key] = task
+        try:
+            codec, bitrate = await asyncio.shield(task)
+        finally:
+            if cls._probe_pending.get(key) is task:
+                del cls._probe_pending[key]
+
+        if codec is not None:
+            cls._probe_cache[key] = (codec, bitrate)
+            if len(cls._probe_cache) > cls.PROBE_CACHE_SIZE:
+                cls._probe_cache.popitem(last=False)
+        return codec, bitrate
+
+    @classmethod
+    async def _probe(
+        cls,
+        source: str,
+        method: Any,
+        executable: str,
+        probefunc: Callable[[str, str], Tuple[Optional[str], Optional[int]]],
+        fallback: Optional[Callable[[str, str], Tuple[Optional[str], Optional[int]]]],
+    ) -> Tuple[Optional[str], Optional[int]]:
         codec = bitrate = None
-        loop = asyncio.get_event_loop()
+        start = time.perf_counter()
         try:
-            codec, bitrate = await loop.run_in_executor(None, lambda: probefunc(source, executable))  # type: ignore
+            codec, bitrate = await cls._run_probe(probefunc, source, executable)
         except Exception:
             if not fallback:
                 _log.exception("Probe '%s' using '%s' failed", method, executable)
-                return  # type: ignore
+                return codec, bitrate
 
             _log.exception("Probe '%s' using '%s' failed, trying fallback", method, executable)
             try:
-                codec, bitrate = await loop.run_in_executor(None, lambda: fallback(source, executable))  # type: ignore
+                codec, bitrate = await cls._run_probe(fallback, source, executable)
             except Exception:
                 _log.exception("Fallback probe using '%s' failed", executable)
             else:
                 _log.info("Fallback probe found codec=%s, bitrate=%s", codec, bitrate)
         else:
             _log.info("Probe found codec=%s, bitrate=%s", codec, bitrate)
-        finally:
-            return codec, bitrate
+
+        _ffmpeg_metrics.record(_ffmpeg_metrics.probe, time.perf_counter() - start)
+        return codec, bitrate
+
+    @classmethod
+    def clear_probe_cache(cls) -> None:
+        """Forgets the results of every previous :meth:`probe`.
+
+        .. versionadded:: 2.0
+        """
+        cls._probe_cache.clear()
+
+    @staticmethod
+    def _probe_cache_key(source: str, method: Any, executable: str) -> Optional[Tuple[Any, ...]]:
+        if not isinstance(source, str):
+            return None
+
+        # a local file is probed again when it changes
+        try:
+            modified = os.stat(source).st_mtime_ns
+        except (OSError, ValueError):
+            modified = None
+
+        try:
+            key = (source, modified, method, executable)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def _probe_semaphore(cls) -> asyncio.Semaphore:
+        # created on the running loop rather than at import
+        loop = asyncio.get_running_loop()
+        limit = cls._probe_limit
+        if limit is None or limit[0] is not loop:
+            limit = cls._probe_limit = (loop, asyncio.Semaphore(cls._PROBE_CONCURRENCY))
+        return limit[1]
+
+    @classmethod
+    async def _run_probe(
+        cls, probefunc: Callable[[str, str], Tuple[Optional[str], Optional[int]]], source: str, executable: str
+    ) -> Tuple[Optional[str], Optional[int]]:
+        # the built-in methods run their subprocess on the event loop, custom ones in an executor
+        if probefunc is cls._probe_codec_native:
+            exe = executable[:2] + 'probe' if executable in ('ffmpeg', 'avconv') else executable
+            args = [exe, '-v', 'quiet', '-print_format', 'json', '-show_streams', '-select_streams', 'a:0', source]
+            async with cls._probe_semaphore():
+                returncode, output = await _communicate(args, stderr=subprocess.DEVNULL, timeout=20)
+            if returncode:
+                raise subprocess.CalledProcessError(returncode, args, output)
+            return cls._parse_probe_native(output)
+
+        if probefunc is cls._probe_codec_fallback:
+            args = [executable, '-hide_banner', '-i', source]
+            async with cls._probe_semaphore():
+                _, output = await _communicate(args, stderr=subprocess.STDOUT, timeout=20)
+            return cls._parse_probe_fallback(output)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: probefunc(source, executable))
 
     @staticmethod
     def _probe_codec_native(source, executable: str = 'ffmpeg') -> Tuple[Optional[str], Optional[int]]:
         exe = executable[:2] + 'probe' if executable in ('ffmpeg', 'avconv') else executable
         args = [exe, '-v', 'quiet', '-print_format', 'json', '-show_streams', '-select_streams', 'a:0', source]
         output = subprocess.check_output(args, timeout=20)
+        return FFmpegOpusAudio._parse_probe_native(output)
+
+    @staticmethod
+    def _parse_probe_native(output: bytes) -> Tuple[Optional[str], Optional[int]]:
         codec = bitrate = None
 
         if output:
@@ -546,6 +896,10 @@ class FFmpegOpusAudio(FFmpegAudio):
         args = [executable, '-hide_banner', '-i',  source]
         proc = subprocess.Popen(args, creationflags=CREATE_NO_WINDOW, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         out, _ = proc.communicate(timeout=20)
+        return FFmpegOpusAudio._parse_probe_fallback(out)
+
+    @staticmethod
+    def _parse_probe_fallback(out: bytes) -> Tuple[Optional[str], Optional[int]]:
         output = out.decode('utf8')
         codec = bitrate = None
 
@@ -560,11 +914,320 @@ class FFmpegOpusAudio(FFmpegAudio):
         return codec, bitrate
 
     def read(self) -> bytes:
-        return next(self._packet_iter, b'')
+        start = time.perf_counter() if self._first_read else None
+        ret = next(self._packet_iter, b'')
+        if start is not None:
+            self._record_first_read(start)
+        return ret
+
+    def is_opus(self) -> bool:
+        return True
+
+def _opus_samples(packet: bytes) -> int:
+    # the number of 48KHz samples in a packet, from its TOC byte (RFC 6716 3.1)
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame = (480, 960, 1920, 2880)[config & 3]
+    elif config < 16:
+        frame = (480, 960)[config & 1]
+    else:
+        frame = (120, 240, 480, 960)[config & 3]
+
+    code = toc & 3
+    if code == 0:
+        return frame
+    if code < 3:
+        return frame * 2
+    return frame * (packet[1] & 0x3F) if len(packet) > 1 else 0
+
+class _MappedOggOpus:
+    # an Ogg Opus file read page by page from a memory map
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, 'rb') as fp:
+            try:
+                self.buffer: mmap.mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise OggError('empty file') from None
+
+        if hasattr(self.buffer, 'madvise'):
+            self.buffer.madvise(mmap.MADV_SEQUENTIAL)
+
+        try:
+            self.index: OggIndex = OggIndex(self.buffer)
+            self._read_headers()
+        except Exception:
+            self.buffer.close()
+            raise
+
+    def _read_headers(self) -> None:
+        # the first page holds the ID header, the comment header ends a page and
+        # the audio starts on the page after it
+        headers: List[bytes] = []
+        partial = b''
+        for number in range(len(self.index)):
+            for data, complete in self.index.page(number).iter_packets():
+                partial += data
+                if complete:
+                    headers.append(partial)
+                    partial = b''
+            if len(headers) >= 2:
+                break
+        else:
+            raise OggError('missing Opus headers')
+
+        head = headers[0]
+        if head[:8] != b'OpusHead' or len(head) < 19:
+            raise OggError('not an Opus stream')
+
+        self.first: int = number + 1
+        self.pre_skip: int = struct.unpack_from('<H', head, 10)[0]
+        self.length: int = self.index.granules[-1] if self.index.granules else 0
+
+    def packets(self, granule: int) -> Generator[Tuple[int, bytes], None, None]:
+        index = self.index
+        number = max(index.find(granule), self.first)
+        if number >= len(index):
+            return
+
+        # start on the page the packet that ends first begins on
+        while number > self.first and index.continued[number]:
+            number -= 1
+
+        position = index.granules[number - 1]
+        skip = bool(index.continued[number])
+        partial = b''
+        for number in range(number, len(index)):
+            for data, complete in index.page(number).iter_packets():
+                if skip:
+                    skip = not complete
+                    continue
+
+                partial += data
+                if complete:
+                    packet, partial = partial, b''
+                    if not packet:
+                        continue
+                    position += _opus_samples(packet)
+                    if position > granule:
+                        yield position, packet
+
+    def close(self) -> None:
+        self.buffer.close()
+
+class _LoadedOggOpus:
+    # every packet of an Ogg Opus file, kept in memory
+    def __init__(self, track: _MappedOggOpus) -> None:
+        self.pre_skip: int = track.pre_skip
+        self.length: int = track.length
+        self.ends: array.array[int] = array.array('q')
+        self.packets: List[bytes] = []
+        for end, packet in track.packets(-1):
+            self.ends.append(end)
+            self.packets.append(packet)
+        self.size: int = sum(map(len, self.packets)) + len(self.packets) * (sys.getsizeof(b'') + 16)
+
+    def packets_from(self, granule: int) -> Generator[Tuple[int, bytes], None, None]:
+        ends = self.ends
+        packets = self.packets
+        for number in range(bisect.bisect_right(ends, granule), len(packets)):
+            yield ends[number], packets[number]
+
+class OggOpusCache:
+    """Keeps the packets of recently played Ogg Opus files in memory for
+    :class:`OggOpusFileSource`.
+
+    A file is read in full the first time it is played, after that every
+    source that plays it reads from the same packets without touching the
+    file. The least recently used files are dropped to stay under
+    :attr:`max_size`, a file that is larger on its own is never kept.
+
+    The cache may be shared by any number of sources and threads.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        The maximum number of bytes to keep.
+
+    Attributes
+    -----------
+    max_size: :class:`int`
+        The maximum number of bytes to keep.
+    hits: :class:`int`
+        The number of times a file was found in the cache.
+    misses: :class:`int`
+        The number of times a file had to be read.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024) -> None:
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._size: int = 0
+        self._tracks: OrderedDict[Tuple[str, int, int], _LoadedOggOpus] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    @property
+    def size(self) -> int:
+        """:class:`int`: The approximate number of bytes kept."""
+        return self._size
+
+    def _get(self, path: Union[str, os.PathLike]) -> _LoadedOggOpus:
+        stat = os.stat(path)
+        # a file that changed is read again
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is not None:
+                self._tracks.move_to_end(key)
+                self.hits += 1
+                return track
+            self.misses += 1
+
+        mapped = _MappedOggOpus(path)
+        try:
+            track = _LoadedOggOpus(mapped)
+        finally:
+            mapped.close()
+
+        if track.size > self.max_size:
+            return track
+
+        with self._lock:
+            if key not in self._tracks:
+                self._tracks[key] = track
+                self._size += track.size
+            while self._size > self.max_size:
+                _, dropped = self._tracks.popitem(last=False)
+                self._size -= dropped.size
+        return track
+
+    async def preload(self, path: Union[str, os.PathLike]) -> None:
+        """|coro|
+
+        Reads a file into the cache in a separate thread, so that creating
+        a source for it does not block.
+
+        Parameters
+        -----------
+        path: Union[:class:`str`, :class:`os.PathLike`]
+            The file to read.
+
+        Raises
+        -------
+        discord.oggparse.OggError
+            The file is not an Ogg Opus file.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._get, path)
+
+    def clear(self) -> None:
+        """Drops every file from the cache."""
+        with self._lock:
+            self._tracks.clear()
+            self._size = 0
+
+class OggOpusFileSource(AudioSource):
+    """An audio source that plays an Ogg Opus file without FFmpeg.
+
+    The file is memory mapped and only the page headers are read up front,
+    packets are then read page by page while playing. If a :class:`OggOpusCache`
+    is passed the packets are read from it instead, and the file is read
+    into it first if needed.
+
+    Only the first logical stream of the file is played and it must be
+    Opus, e.g. a ``.opus`` file. Files of any other codec have to be played
+    through :class:`FFmpegOpusAudio` instead.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The file to play.
+    cache: Optional[:class:`OggOpusCache`]
+        The cache to read the packets from.
+    start: :class:`float`
+        The position to start playing from in seconds.
+
+    Raises
+    -------
+    discord.oggparse.OggError
+        The file is not an Ogg Opus file.
+    OSError
+        The file could not be opened.
+    """
+
+    _mapped: Optional[_MappedOggOpus] = None
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        cache: Optional[OggOpusCache] = None,
+        start: float = 0.0,
+    ) -> None:
+        self.path: Union[str, os.PathLike] = path
+        self._track: Union[_MappedOggOpus, _LoadedOggOpus]
+        if cache is not None:
+            self._track = cache._get(path)
+        else:
+            self._track = self._mapped = _MappedOggOpus(path)
+        self._position: int = 0
+        self._packets: Iterator[Tuple[int, bytes]] = iter(())
+        self.seek(start)
+
+    @property
+    def duration(self) -> float:
+        """:class:`float`: The length of the file in seconds."""
+        return max(self._track.length - self._track.pre_skip, 0) / OpusEncoder.SAMPLING_RATE
+
+    @property
+    def position(self) -> float:
+        """:class:`float`: How far into the file the audio read so far reaches, in seconds."""
+        return max(self._position - self._track.pre_skip, 0) / OpusEncoder.SAMPLING_RATE
+
+    def seek(self, position: float) -> None:
+        """Continues playing from another position.
+
+        This is done by finding the page the position is on in the page
+        index, so it takes the same time anywhere in the file.
+
+        Parameters
+        -----------
+        position: :class:`float`
+            The position to play from in seconds. Past the end of the file
+            the source finishes.
+        """
+        granule = self._track.pre_skip + int(max(position, 0.0) * OpusEncoder.SAMPLING_RATE)
+        track = self._track
+        if isinstance(track, _MappedOggOpus):
+            self._packets = track.packets(granule)
+        else:
+            self._packets = track.packets_from(granule)
+        self._position = granule
+
+    def read(self) -> bytes:
+        try:
+            self._position, packet = next(self._packets)
+        except StopIteration:
+            return b''
+        return packet
 
     def is_opus(self) -> bool:
         return True
 
+    def cleanup(self) -> None:
+        mapped, self._mapped = self._mapped, None
+        if mapped is not None:
+            self._packets = iter(())
+            mapped.close()
+
 class PCMVolumeTransformer(AudioSource, Generic[AT]):
     """Transforms a previous :class:`AudioSource` to have volume controls.
 
@@ -596,6 +1259,8 @@ class PCMVolumeTransformer(AudioSource, Generic[AT]):
 
         self.original: AT = original
         self.volume = volume
+        self._applied: float = self._volume
+        self._mixer: FrameMixer = FrameMixer()
 
     @property
     def volume(self) -> float:
@@ -611,17 +1276,518 @@ class PCMVolumeTransformer(AudioSource, Generic[AT]):
 
     def read(self) -> bytes:
         ret = self.original.read()
-        return audioop.mul(ret, 2, min(self._volume, 2.0))
+        if not ret:
+            return ret
+
+        # a new volume is faded in over a frame
+        start, self._applied = self._applied, min(self._volume, 2.0)
+        if start == self._applied and self._mixer.use_audioop:
+            return audioop.mul(ret, 2, start)
+        return self._mixer.mix((ret,), ((start, self._applied),))  # type: ignore
+
+class MixerTrack:
+    """A source that is mixed by a :class:`PCMMixer`.
+
+    These are returned by :meth:`PCMMixer.add`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    source: :class:`AudioSource`
+        The source being mixed.
+    volume: :class:`float`
+        The volume of the source as a floating point percentage. Changes
+        are faded in over a frame.
+    ducks: :class:`bool`
+        Whether the other tracks are ducked while this one is playing.
+    """
+
+    __slots__ = ('source', 'volume', 'ducks', '_applied')
+
+    def __init__(self, source: AudioSource, volume: float, ducks: bool) -> None:
+        self.source: AudioSource = source
+        self.volume: float = volume
+        self.ducks: bool = ducks
+        self._applied: float = volume
+
+class PCMMixer(AudioSource):
+    """Mixes any number of PCM audio sources into one.
+
+    Tracks can be added and removed while playing. A track is removed once
+    its source has no more audio and the source is cleaned up.
+
+    While a track that ducks is playing, every other track is turned down to
+    :attr:`duck_volume`, e.g. to keep speech audible over music. The volume
+    is faded down and back up over :attr:`duck_fade` seconds.
+
+    If NumPy is installed it is used to mix, otherwise mixing happens in
+    pure Python which is considerably slower.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    \*sources: :class:`AudioSource`
+        The sources to start with, at full volume.
+    persistent: :class:`bool`
+        Whether silence is played while there is nothing to mix instead of
+        finishing.
+
+    Attributes
+    -----------
+    duck_volume: :class:`float`
+        The volume other tracks are turned down to while a track that ducks
+        is playing. Defaults to ``0.25``.
+    duck_fade: :class:`float`
+        How long turning the volume down or back up takes, in seconds.
+        Defaults to ``0.2``.
+
+    Raises
+    -------
+    TypeError
+        Not an audio source.
+    ClientException
+        The audio source is opus encoded.
+    """
+
+    def __init__(self, *sources: AudioSource, persistent: bool = False) -> None:
+        self.persistent: bool = persistent
+        self.duck_volume: float = 0.25
+        self.duck_fade: float = 0.2
+        # replaced rather than mutated since it is read from an audio thread
+        self._tracks: Tuple[MixerTrack, ...] = ()
+        self._ducking: float = 1.0
+        self._mixer: FrameMixer = FrameMixer()
+        self._silence: bytes = bytes(OpusEncoder.FRAME_SIZE)
+        for source in sources:
+            self.add(source)
+
+    @property
+    def tracks(self) -> List[MixerTrack]:
+        """List[:class:`MixerTrack`]: The tracks being mixed."""
+        return list(self._tracks)
+
+    def add(self, source: AudioSource, *, volume: float = 1.0, ducks: bool = False) -> MixerTrack:
+        """Adds a source to mix in from the next frame on.
+
+        Parameters
+        -----------
+        source: :class:`AudioSource`
+            The source to add.
+        volume: :class:`float`
+            The volume of the source as a floating point percentage.
+        ducks: :class:`bool`
+            Whether the other tracks are ducked while this one is playing.
+
+        Raises
+        -------
+        TypeError
+            Not an audio source.
+        ClientException
+            The audio source is opus encoded.
+
+        Returns
+        --------
+        :class:`MixerTrack`
+            The added track.
+        """
+        if not isinstance(source, AudioSource):
+            raise TypeError(f'expected AudioSource not {source.__class__.__name__}.')
+
+        if source.is_opus():
+            raise ClientException('AudioSource must not be Opus encoded.')
+
+        track = MixerTrack(source, max(volume, 0.0), ducks)
+        self._tracks = self._tracks + (track,)
+        return track
+
+    def remove(self, track: MixerTrack) -> None:
+        """Stops mixing a track and cleans up its source.
+
+        Parameters
+        -----------
+        track: :class:`MixerTrack`
+            The track to remove.
+        """
+        if track in self._tracks:
+            self._tracks = tuple(t for t in self._tracks if t is not track)
+            track.source.cleanup()
+
+    def cleanup(self) -> None:
+        tracks, self._tracks = self._tracks, ()
+        for track in tracks:
+            track.source.cleanup()
+
+    def read(self) -> bytes:
+        frames = []
+        playing = []
+        ducked = False
+        for track in self._tracks:
+            data = track.source.read()
+            if not data:
+                self.remove(track)
+                continue
+            frames.append(data)
+            playing.append(track)
+            ducked = ducked or track.ducks
+
+        if not frames:
+            return self._silence if self.persistent else b''
+
+        # move towards the ducked volume by at most a frame's share of the fade
+        start = self._ducking
+        target = self.duck_volume if ducked else 1.0
+        step = OpusEncoder.FRAME_LENGTH / 1000 / self.duck_fade if self.duck_fade > 0 else 1.0
+        end = max(start - step, target) if target < start else min(start + step, target)
+        self._ducking = end
+
+        gains = []
+        for track in playing:
+            volume = min(max(track.volume, 0.0), 2.0)
+            applied, track._applied = track._applied, volume
+            if track.ducks:
+                gains.append((applied, volume))
+            else:
+                gains.append((applied * start, volume * end))
+
+        return self._mixer.mix(frames, gains)  # type: ignore
+
+class AudioBroadcast:
+    """Reads an :class:`AudioSource` once and plays it to many voice clients.
+
+    Every listener gets its own :class:`BroadcastSource` from :meth:`subscribe`.
+    The first listener that needs a frame reads it from the source and, if the
+    source is not Opus encoded, encodes it with the broadcast's own encoder. The
+    frame is then kept in a ring buffer that every other listener reads from,
+    so the source is read and encoded once no matter how many listeners there are.
+
+    Listeners join live, i.e. they start with the next frame that is read from
+    the source. A listener that falls further behind than the ring buffer holds
+    skips ahead to the oldest frame that is still kept.
+
+    Since the audio is encoded once it cannot be transformed per listener, wrap
+    the source before it is passed instead.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    source: :class:`AudioSource`
+        The audio to broadcast.
+    capacity: :class:`int`
+        The number of frames to keep for listeners that are behind. Every
+        frame is 20ms worth of audio.
+
+    Raises
+    -------
+    TypeError
+        Not an audio source.
+    ValueError
+        ``capacity`` is less than 1.
+    """
+
+    def __init__(self, source: AudioSource, *, capacity: int = 50) -> None:
+        if not isinstance(source, AudioSource):
+            raise TypeError(f'expected AudioSource not {source.__class__.__name__}.')
+
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+
+        self.source: AudioSource = source
+        self.capacity: int = capacity
+        self._encoder: Optional[OpusEncoder] = None if source.is_opus() else OpusEncoder()
+        self._ring: List[Tuple[int, bytes]] = [(-1, b'')] * capacity
+        self._head: int = 0
+        self._ended: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._subscribers: weakref.WeakSet[BroadcastSource] = weakref.WeakSet()
+
+    @property
+    def frames(self) -> int:
+        """:class:`int`: The number of frames read from the source so far."""
+        return self._head
+
+    @property
+    def listeners(self) -> int:
+        """:class:`int`: The number of sources returned by :meth:`subscribe` that are still in use."""
+        return len(self._subscribers)
+
+    def is_done(self) -> bool:
+        """Indicates if the source has no more audio."""
+        return self._ended
+
+    def subscribe(self) -> BroadcastSource:
+        """Returns a new source that plays the broadcast from the next frame on.
+
+        Returns
+        --------
+        :class:`BroadcastSource`
+            The source to pass to :meth:`VoiceClient.play`.
+        """
+        source = BroadcastSource(self)
+        self._subscribers.add(source)
+        return source
+
+    def close(self) -> None:
+        """Stops reading from the source and cleans it up.
+
+        Listeners finish after playing the frames that were already read.
+        """
+        with self._lock:
+            self._end()
+
+    def _end(self) -> None:
+        if not self._ended:
+            self._ended = True
+            self.source.cleanup()
 
-class AudioPlayer(threading.Thread):
+    def _produce(self) -> bool:
+        # called with the lock held
+        if self._ended:
+            return False
+
+        try:
+            data = self.source.read()
+        except Exception:
+            self._end()
+            raise
+
+        if not data:
+            self._end()
+            return False
+
+        if self._encoder is not None:
+            data = self._encoder.encode(data, OpusEncoder.SAMPLES_PER_FRAME)
+
+        head = self._head
+        self._ring[head % self.capacity] = (head, data)
+        self._head = head + 1
+        return True
+
+    def _read(self, cursor: int) -> Tuple[int, bytes]:
+        while True:
+            if cursor >= self._head:
+                with self._lock:
+                    if cursor >= self._head and not self._produce():
+                        return cursor, b''
+
+            cursor = max(cursor, self._head - self.capacity)
+            index, data = self._ring[cursor % self.capacity]
+            if index == cursor:
+                return cursor + 1, data
+            # the frame was replaced while reading it, catch up and try again
+
+class BroadcastSource(AudioSource):
+    """An Opus encoded :class:`AudioSource` that plays an :class:`AudioBroadcast`.
+
+    These are returned by :meth:`AudioBroadcast.subscribe`, every voice client
+    needs its own.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    broadcast: :class:`AudioBroadcast`
+        The broadcast being played.
+    skipped: :class:`int`
+        The number of frames skipped because this source fell behind.
+    """
+
+    def __init__(self, broadcast: AudioBroadcast) -> None:
+        self.broadcast: AudioBroadcast = broadcast
+        self.skipped: int = 0
+        self._cursor: int = broadcast._head
+
+    def read(self) -> bytes:
+        cursor, data = self.broadcast._read(self._cursor)
+        if data:
+            self.skipped += cursor - 1 - self._cursor
+        self._cursor = cursor
+        return data
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        self.broadcast._subscribers.discard(self)
+
+class _SchedulerThread(threading.Thread):
+    def __init__(self, scheduler: AudioScheduler, index: int) -> None:
+        threading.Thread.__init__(self, name=f'discord-audio-{index}', daemon=True)
+        self.scheduler: AudioScheduler = scheduler
+        self.players: int = 0
+        self._heap: List[Tuple[float, int, AudioPlayer]] = []
+        self._counter: int = 0
+        self._closed: bool = False
+        self._cond: threading.Condition = threading.Condition()
+
+    def add(self, player: AudioPlayer, deadline: float) -> None:
+        with self._cond:
+            self._push(player, deadline)
+
+    def _push(self, player: AudioPlayer, deadline: float) -> None:
+        # the counter keeps players with the same deadline from being compared
+        self._counter += 1
+        heapq.heappush(self._heap, (deadline, self._counter, player))
+        if self._heap[0][2] is player:
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def run(self) -> None:
+        perf_counter = time.perf_counter
+        cond = self._cond
+        heap = self._heap
+        while True:
+            with cond:
+                while True:
+                    if self._closed:
+                        return
+                    if not heap:
+                        cond.wait()
+                        continue
+                    delay = heap[0][0] - perf_counter()
+                    if delay > 0:
+                        cond.wait(delay)
+                        continue
+                    deadline, _, player = heapq.heappop(heap)
+                    break
+
+            deadline = player._tick(deadline)
+            if deadline is not None:
+                with cond:
+                    self._push(player, deadline)
+
+
+class AudioScheduler:
+    """Sends the audio of every playing :class:`VoiceClient` from a fixed
+    number of threads.
+
+    Each thread keeps its players ordered by the time their next frame is
+    due and sends it as close to that deadline as possible. Players are
+    spread over the threads by the number of players each thread has.
+
+    Since reading an :class:`AudioSource` happens on these threads, a source
+    that blocks delays every other player on the same thread.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    threads: :class:`int`
+        The number of threads to send audio from. They are started when
+        the first player is added to them.
+    """
+
+    _default: ClassVar[Optional[AudioScheduler]] = None
+
+    def __init__(self, threads: int = 2) -> None:
+        if threads < 1:
+            raise ValueError('threads must be at least 1')
+
+        self._threads: List[_SchedulerThread] = [_SchedulerThread(self, index) for index in range(threads)]
+        self._lock: threading.Lock = threading.Lock()
+        self._finalizer: Optional[ThreadPoolExecutor] = None
+        self._closed: bool = False
+
+    @classmethod
+    def default(cls) -> AudioScheduler:
+        """Returns the scheduler used by :meth:`VoiceClient.play`.
+
+        Returns
+        --------
+        :class:`AudioScheduler`
+            The default scheduler, created on first use.
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def set_default(cls, scheduler: AudioScheduler) -> None:
+        """Sets the scheduler used by :meth:`VoiceClient.play` from now on.
+
+        Players that are already playing are not moved.
+
+        Parameters
+        -----------
+        scheduler: :class:`AudioScheduler`
+            The new default scheduler.
+        """
+        cls._default = scheduler
+
+    @property
+    def threads(self) -> int:
+        """:class:`int`: The number of threads audio is sent from."""
+        return len(self._threads)
+
+    @property
+    def players(self) -> int:
+        """:class:`int`: The number of players currently scheduled."""
+        return sum(thread.players for thread in self._threads)
+
+    def _add(self, player: AudioPlayer) -> _SchedulerThread:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('AudioScheduler is closed')
+            thread = min(self._threads, key=lambda t: t.players)
+            thread.players += 1
+            if not thread.is_alive():
+                thread.start()
+        thread.add(player, time.perf_counter())
+        return thread
+
+    def _remove(self, thread: _SchedulerThread, player: AudioPlayer) -> None:
+        with self._lock:
+            thread.players -= 1
+            if self._finalizer is None:
+                self._finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='discord-audio-after')
+            finalizer = self._finalizer
+
+        # the after callback may block, it must not hold up other players
+        finalizer.submit(player._finish)
+
+    def close(self) -> None:
+        """Stops every thread of the scheduler.
+
+        Players that are still scheduled stop sending audio without their
+        ``after`` callback being called. If this is the default scheduler,
+        a new one is created the next time :meth:`default` is called.
+        """
+        with self._lock:
+            self._closed = True
+        for thread in self._threads:
+            thread.close()
+        if self._finalizer is not None:
+            self._finalizer.shutdown(wait=False)
+        if AudioScheduler._default is self:
+            AudioScheduler._default = None
+
+
+class AudioPlayer:
     DELAY: float = OpusEncoder.FRAME_LENGTH / 1000.0
+    # a player more than this many seconds behind starts over instead of
+    # sending the missed frames in a burst
+    MAX_BEHIND: float = 0.2
+    JITTER_BOUNDS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
 
-    def __init__(self, source: AudioSource, client: VoiceClient, *, after=None):
-        threading.Thread.__init__(self)
-        self.daemon: bool = True
+    def __init__(
+        self,
+        source: AudioSource,
+        client: VoiceClient,
+        *,
+        after=None,
+        scheduler: Optional[AudioScheduler] = None,
+    ):
         self.source: AudioSource = source
         self.client: VoiceClient = client
         self.after: Optional[Callable[[Optional[Exception]], Any]] = after
+        self.scheduler: AudioScheduler = scheduler or AudioScheduler.default()
+        self.name: str = f'AudioPlayer-{id(self):x}'
 
         self._end: threading.Event = threading.Event()
         self._resumed: threading.Event = threading.Event()
@@ -629,53 +1795,81 @@ class AudioPlayer(threading.Thread):
         self._current_error: Optional[Exception] = None
         self._connected: threading.Event = client._connected
         self._lock: threading.Lock = threading.Lock()
+        self._thread: Optional[_SchedulerThread] = None
+        self._parked: bool = False
+        self._reset_clock: bool = True
+
+        self.loops: int = 0
+        self._start: float = 0.0
+        self.frames: int = 0
+        self.resyncs: int = 0
+        self.jitter: utils._LatencyHistogram = utils._LatencyHistogram(self.JITTER_BOUNDS)
 
         if after is not None and not callable(after):
             raise TypeError('Expected a callable for the "after" parameter.')
 
-    def _do_run(self) -> None:
-        self.loops = 0
-        self._start = time.perf_counter()
-
-        # getattr lookup speed ups
-        play_audio = self.client.send_audio_packet
+    def start(self) -> None:
         self._speak(True)
+        self._thread = self.scheduler._add(self)
+
+    def _tick(self, deadline: float) -> Optional[float]:
+        # called from the scheduler thread whenever a frame is due
+        thread = self._thread
+        try:
+            if self._end.is_set():
+                self.scheduler._remove(thread, self)  # type: ignore
+                return None
 
-        while not self._end.is_set():
             # are we paused?
             if not self._resumed.is_set():
-                # wait until we aren't
-                self._resumed.wait()
-                continue
+                with thread._cond:  # type: ignore
+                    # resume() only reschedules players it sees parked
+                    if not self._resumed.is_set():
+                        self._parked = True
+                        return None
 
+            now = time.perf_counter()
             # are we disconnected from voice?
             if not self._connected.is_set():
-                # wait until we are connected
-                self._connected.wait()
-                # reset our internal data
+                # reset our internal data once we are connected again
+                self._reset_clock = True
+                return now + self.DELAY
+
+            if self._reset_clock:
+                self._reset_clock = False
                 self.loops = 0
-                self._start = time.perf_counter()
+                self._start = now
+            else:
+                self.jitter.record(now - deadline)
 
             self.loops += 1
-            data = self.source.read()
+            with self._lock:
+                data = self.source.read()
+                if not data:
+                    self._end.set()
+                    self._speak(False)
+                    self.scheduler._remove(thread, self)  # type: ignore
+                    return None
 
-            if not data:
-                self.stop()
-                break
+                self.client.send_audio_packet(data, encode=not self.source.is_opus())
 
-            play_audio(data, encode=not self.source.is_opus())
+            self.frames += 1
             next_time = self._start + self.DELAY * self.loops
-            delay = max(0, self.DELAY + (next_time - time.perf_counter()))
-            time.sleep(delay)
-
-    def run(self) -> None:
-        try:
-            self._do_run()
+            if time.perf_counter() - next_time > self.MAX_BEHIND:
+                self.resyncs += 1
+                self._reset_clock = True
+            return next_time
         except Exception as exc:
             self._current_error = exc
-            self.stop()
-        finally:
+            self._end.set()
+            self._speak(False)
+            self.scheduler._remove(thread, self)  # type: ignore
+            return None
+
+    def _finish(self) -> None:
+        try:
             self.source.cleanup()
+        finally:
             self._call_after()
 
     def _call_after(self) -> None:
@@ -689,15 +1883,27 @@ class AudioPlayer(threading.Thread):
                 exc.__context__ = error
                 traceback.print_exception(type(exc), exc, exc.__traceback__)
         elif error:
-            msg = f'Exception in voice thread {self.name}'
+            msg = f'Exception in voice player {self.name}'
             _log.exception(msg, exc_info=error)
             print(msg, file=sys.stderr)
             traceback.print_exception(type(error), error, error.__traceback__)
 
+    def _unpark(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+
+        with thread._cond:
+            if self._parked:
+                self._parked = False
+                self._reset_clock = True
+                thread._push(self, time.perf_counter())
+
     def stop(self) -> None:
         self._end.set()
         self._resumed.set()
         self._speak(False)
+        self._unpark()
 
     def pause(self, *, update_speaking: bool = True) -> None:
         self._resumed.clear()
@@ -705,9 +1911,9 @@ class AudioPlayer(threading.Thread):
             self._speak(False)
 
     def resume(self, *, update_speaking: bool = True) -> None:
-        self.loops = 0
-        self._start = time.perf_counter()
+        self._reset_clock = True
         self._resumed.set()
+        self._unpark()
         if update_speaking:
             self._speak(True)
 
@@ -717,6 +1923,13 @@ class AudioPlayer(threading.Thread):
     def is_paused(self) -> bool:
         return not self._end.is_set() and not self._resumed.is_set()
 
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'resyncs': self.resyncs,
+            'jitter': self.jitter.to_dict(),
+        }
+
     def _set_source(self, source: AudioSource) -> None:
         with self._lock:
             self.pause(update_speaking=False)
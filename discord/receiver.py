@@ -0,0 +1,698 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import queue
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Any, ClassVar, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from . import opus
+
+has_sodium: bool
+
+try:
+    # the raw libsodium bindings are private to PyNaCl, sending falls back
+    # to nacl.secret.SecretBox without them but receiving needs them
+    from nacl._sodium import ffi as _sodium_ffi, lib as _sodium_lib  # type: ignore
+    has_sodium = True
+except ImportError:
+    has_sodium = False
+
+if TYPE_CHECKING:
+    from .voice_client import VoiceClient
+
+__all__ = (
+    'VoiceFrame',
+    'AudioSink',
+    'AudioFrameStream',
+    'AudioReceiver',
+)
+
+_log = logging.getLogger(__name__)
+
+_RTP_HEADER = struct.Struct('>BBHII')
+_EXTENSION = struct.Struct('>HH')
+_OPUS_PAYLOAD_TYPE = 0x78
+_BOXZEROBYTES = 16
+_ZEROBYTES = 32
+_BOX_PADDING = bytes(_BOXZEROBYTES)
+# the packet is received this far into the buffer so that the box starts
+# right after the RTP header, with the zero padding written over the header
+_PACKET_OFFSET = _BOXZEROBYTES - 12
+_MAX_PACKET_SIZE = 4096
+# every speaker sends 50 packets a second, the default buffer overflows
+# on bursts with a few hundred of them
+_RECEIVE_BUFFER = 1024 * 1024
+
+_FRAME_DURATION = opus.Decoder.FRAME_LENGTH / 1000
+_FRAME_SAMPLES = opus.Decoder.SAMPLES_PER_FRAME
+# a jump this far ahead is a new stream rather than lost packets
+_MAX_GAP = 50
+
+
+class VoiceFrame:
+    """Represents 20ms of decoded audio from one speaker.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    ssrc: :class:`int`
+        The synchronisation source the audio was received from.
+    user_id: Optional[:class:`int`]
+        The ID of the user speaking, if it is known yet.
+    sequence: :class:`int`
+        The RTP sequence number of the frame.
+    timestamp: :class:`int`
+        The RTP timestamp of the frame, in samples.
+    pcm: :class:`bytes`
+        The audio as 16-bit 48KHz stereo PCM.
+    lost: :class:`bool`
+        Whether the packet of this frame never arrived, in which case the
+        audio is recovered from the next packet or concealed by Opus.
+    """
+
+    __slots__ = ('ssrc', 'user_id', 'sequence', 'timestamp', 'pcm', 'lost')
+
+    def __init__(
+        self, ssrc: int, user_id: Optional[int], sequence: int, timestamp: int, pcm: bytes, lost: bool
+    ) -> None:
+        self.ssrc: int = ssrc
+        self.user_id: Optional[int] = user_id
+        self.sequence: int = sequence
+        self.timestamp: int = timestamp
+        self.pcm: bytes = pcm
+        self.lost: bool = lost
+
+    def __repr__(self) -> str:
+        return f'<VoiceFrame ssrc={self.ssrc} user_id={self.user_id} sequence={self.sequence} lost={self.lost}>'
+
+
+class AudioSink:
+    """Represents where the audio received by :meth:`VoiceClient.listen` goes.
+
+    Frames of every speaker are written in order, but frames of different
+    speakers may be written at the same time from different threads.
+
+    .. versionadded:: 2.0
+    """
+
+    def write(self, frame: VoiceFrame) -> None:
+        """Called with every decoded frame from a decoder thread of the
+        :class:`AudioReceiver`.
+
+        This must not block, since it holds up every speaker decoded on the
+        same thread.
+
+        Parameters
+        -----------
+        frame: :class:`VoiceFrame`
+            The decoded frame.
+        """
+        raise NotImplementedError
+
+    def cleanup(self) -> None:
+        """Called after the last frame was written, once the voice client
+        stopped listening.
+        """
+        pass
+
+
+class AudioFrameStream(AudioSink):
+    """An :class:`AudioSink` that is consumed with ``async for``.
+
+    Iteration ends once the voice client stopped listening and every
+    pending frame was consumed.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_pending: :class:`int`
+        How many frames may wait to be consumed. Once full, the oldest
+        frame is dropped for every new one.
+
+    Attributes
+    -----------
+    dropped: :class:`int`
+        The number of frames dropped because they were not consumed in time.
+    """
+
+    def __init__(self, *, max_pending: int = 1000) -> None:
+        if max_pending < 1:
+            raise ValueError('max_pending must be at least 1')
+
+        self.max_pending: int = max_pending
+        self.dropped: int = 0
+        self._frames: Deque[VoiceFrame] = collections.deque()
+        self._closed: bool = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._getter: Optional[asyncio.Future[None]] = None
+
+    def __aiter__(self) -> AudioFrameStream:
+        return self
+
+    async def __anext__(self) -> VoiceFrame:
+        frames = self._frames
+        while not frames:
+            if self._closed:
+                raise StopAsyncIteration
+
+            loop = self._loop = asyncio.get_running_loop()
+            self._getter = getter = loop.create_future()
+            # a frame may have been written before the getter was visible
+            if frames or self._closed:
+                self._getter = None
+                continue
+            await getter
+        return frames.popleft()
+
+    def _wake(self) -> None:
+        getter = self._getter
+        if getter is not None and self._loop is not None:
+            self._getter = None
+            self._loop.call_soon_threadsafe(_set_result, getter)
+
+    def write(self, frame: VoiceFrame) -> None:
+        frames = self._frames
+        if len(frames) >= self.max_pending:
+            try:
+                frames.popleft()
+            except IndexError:
+                pass
+            else:
+                self.dropped += 1
+        frames.append(frame)
+        self._wake()
+
+    def cleanup(self) -> None:
+        self._closed = True
+        self._wake()
+
+
+def _set_result(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _VoiceDecryptor:
+    # The receiving side of _VoicePacket. Packets are received into one
+    # buffer, opened in place and only the Opus payload is copied out.
+    __slots__ = ('key', 'trailer', 'load_nonce', 'buffer', 'view', 'pointer', 'nonce', 'nonce_pointer')
+
+    def __init__(self, mode: str, secret_key: List[int]) -> None:
+        self.key: bytes = bytes(secret_key)
+        self.load_nonce: Any = getattr(self, '_nonce_' + mode)
+        self.trailer: int = {'xsalsa20_poly1305': 0, 'xsalsa20_poly1305_suffix': 24, 'xsalsa20_poly1305_lite': 4}[mode]
+        self.buffer: bytearray = bytearray(_PACKET_OFFSET + _MAX_PACKET_SIZE)
+        self.view: memoryview = memoryview(self.buffer)[_PACKET_OFFSET:]
+        self.pointer: Any = _sodium_ffi.from_buffer(self.buffer)
+        self.nonce: bytearray = bytearray(24)
+        self.nonce_pointer: Any = _sodium_ffi.from_buffer(self.nonce)
+
+    def open(self, size: int) -> Optional[Tuple[int, int, int, bytes]]:
+        # size is the number of bytes received into self.view
+        if size < 12 + _BOXZEROBYTES + self.trailer:
+            return None
+
+        buffer = self.buffer
+        first, payload_type, sequence, timestamp, ssrc = _RTP_HEADER.unpack_from(buffer, _PACKET_OFFSET)
+        # RTCP and anything else that isn't voice
+        if payload_type & 0x7F != _OPUS_PAYLOAD_TYPE:
+            return None
+
+        end = _PACKET_OFFSET + size - self.trailer
+        self.load_nonce(end)
+        buffer[:_BOXZEROBYTES] = _BOX_PADDING
+        if _sodium_lib.crypto_secretbox_open(self.pointer, self.pointer, end, self.nonce_pointer, self.key) != 0:
+            return None
+
+        # everything after the fixed header is encrypted, including the
+        # CSRC list and the header extension
+        start = _ZEROBYTES + (first & 0x0F) * 4
+        if first & 0x10:
+            if end - start < 4:
+                return None
+            _, length = _EXTENSION.unpack_from(buffer, start)
+            start += 4 + length * 4
+        if start >= end:
+            return None
+        return sequence, timestamp, ssrc, bytes(buffer[start:end])
+
+    def _nonce_xsalsa20_poly1305(self, end: int) -> None:
+        self.nonce[:12] = self.buffer[_PACKET_OFFSET:_BOXZEROBYTES]
+
+    def _nonce_xsalsa20_poly1305_suffix(self, end: int) -> None:
+        self.nonce[:] = self.buffer[end:end + 24]
+
+    def _nonce_xsalsa20_poly1305_lite(self, end: int) -> None:
+        self.nonce[:4] = self.buffer[end:end + 4]
+
+
+class _JitterBuffer:
+    # Releases the packets of one SSRC in sequence order. Packets after a
+    # missing one are held until either `depth` of them arrived or the
+    # missing one is `depth` frames overdue, then it is given up on. Being
+    # overdue is only checked once the socket is drained, a packet that
+    # waited in the socket buffer isn't late.
+    __slots__ = ('depth', 'delay', 'packets', 'next', 'timestamp', 'deadline', 'lost', 'late')
+
+    def __init__(self, depth: int) -> None:
+        self.depth: int = depth
+        self.delay: float = depth * _FRAME_DURATION
+        self.packets: Dict[int, Tuple[int, bytes]] = {}
+        self.next: Optional[int] = None
+        self.timestamp: int = 0
+        self.deadline: float = 0.0
+        self.lost: int = 0
+        self.late: int = 0
+
+    def reset(self) -> None:
+        self.packets.clear()
+        self.next = None
+
+    def push(self, sequence: int, timestamp: int, data: bytes, now: float, out: List[Any]) -> None:
+        expected = self.next
+        if expected is None:
+            expected = sequence
+        else:
+            ahead = (sequence - expected) & 0xFFFF
+            if ahead >= 0x8000:
+                # already released or given up on
+                self.late += 1
+                return
+            if ahead > _MAX_GAP:
+                self.packets.clear()
+                expected = sequence
+
+        if sequence == expected and not self.packets:
+            # the common case, nothing is missing
+            self.timestamp = timestamp
+            self.next = (sequence + 1) & 0xFFFF
+            out.append((sequence, timestamp, data, None))
+            return
+
+        self.next = expected
+        packets = self.packets
+        if not packets:
+            self.deadline = now + self.delay
+        packets[sequence] = (timestamp, data)
+        self.release(now, out, False)
+
+    def release(self, now: float, out: List[Any], expired: bool) -> None:
+        packets = self.packets
+        expected = self.next
+        advanced = False
+        while packets:
+            entry = packets.pop(expected, None)
+            if entry is not None:
+                self.timestamp = entry[0]
+                out.append((expected, entry[0], entry[1], None))
+                # a gap after this packet hasn't waited as long
+                expired = False
+            elif expired or len(packets) >= self.depth:
+                # the packet after the missing one may carry it as FEC
+                following = packets.get((expected + 1) & 0xFFFF)
+                self.timestamp = (self.timestamp + _FRAME_SAMPLES) & 0xFFFFFFFF
+                out.append((expected, self.timestamp, None, following[1] if following else None))
+                self.lost += 1
+            else:
+                break
+            expected = (expected + 1) & 0xFFFF
+            advanced = True
+
+        self.next = expected
+        if advanced and packets:
+            self.deadline = now + self.delay
+
+
+class _Speaker:
+    __slots__ = ('ssrc', 'jitter', 'decoder', 'thread')
+
+    def __init__(self, ssrc: int, depth: int, thread: _DecoderThread) -> None:
+        self.ssrc: int = ssrc
+        self.jitter: _JitterBuffer = _JitterBuffer(depth)
+        # created on the decoder thread the first time it is needed
+        self.decoder: Optional[opus.Decoder] = None
+        self.thread: _DecoderThread = thread
+
+
+class _Listener:
+    # The receiving state of one VoiceClient. It is only touched by the
+    # receive thread, except for sink writes on the decoder threads.
+    def __init__(self, receiver: AudioReceiver, client: VoiceClient, sink: AudioSink, depth: int) -> None:
+        self.receiver: AudioReceiver = receiver
+        self.client: VoiceClient = client
+        self.sink: AudioSink = sink
+        self.depth: int = depth
+        self.socket: Optional[socket.socket] = None
+        self.decryptor: Optional[_VoiceDecryptor] = None
+        self.speakers: Dict[int, _Speaker] = {}
+        self.active: bool = True
+        # set by a decoder thread once writing to the sink failed
+        self.failed: bool = False
+        self.pending: int = 0
+        self.packets: int = 0
+        self.invalid: int = 0
+
+    def attach(self, sock: socket.socket, mode: str, secret_key: List[int]) -> None:
+        self.receiver._post(self._attach, sock, _VoiceDecryptor(mode, secret_key))
+
+    def _attach(self, sock: socket.socket, decryptor: _VoiceDecryptor) -> None:
+        if not self.active:
+            return
+        receiver = self.receiver
+        if self.socket is not None:
+            receiver._unregister(self.socket)
+        self.socket = sock
+        self.decryptor = decryptor
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECEIVE_BUFFER)
+        except OSError:
+            pass
+        for speaker in self.speakers.values():
+            speaker.jitter.reset()
+        receiver._register(sock, self)
+
+    def stop(self) -> None:
+        if self.active:
+            self.active = False
+            self.receiver._post(self.receiver._detach, self)
+
+    def metrics(self) -> Dict[str, Any]:
+        speakers = list(self.speakers.values())
+        return {
+            'speakers': len(speakers),
+            'packets': self.packets,
+            'invalid': self.invalid,
+            'lost': sum(speaker.jitter.lost for speaker in speakers),
+            'late': sum(speaker.jitter.late for speaker in speakers),
+        }
+
+    def receive(self, sock: socket.socket, now: float) -> None:
+        decryptor = self.decryptor
+        if decryptor is None:
+            return
+
+        recv_into = sock.recv_into
+        view = decryptor.view
+        speakers = self.speakers
+        while True:
+            try:
+                size = recv_into(view)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # the socket was closed under us, a new one is on its way
+                return
+
+            packet = decryptor.open(size)
+            if packet is None:
+                self.invalid += 1
+                continue
+
+            self.packets += 1
+            sequence, timestamp, ssrc, data = packet
+            try:
+                speaker = speakers[ssrc]
+            except KeyError:
+                speaker = speakers[ssrc] = self.receiver._add_speaker(ssrc, self.depth)
+
+            ready: List[Any] = []
+            speaker.jitter.push(sequence, timestamp, data, now, ready)
+            if ready:
+                speaker.thread.queue.put((self, speaker, ready))
+
+    def expire(self, now: float) -> None:
+        for speaker in self.speakers.values():
+            jitter = speaker.jitter
+            if jitter.packets and now >= jitter.deadline:
+                ready: List[Any] = []
+                jitter.release(now, ready, True)
+                if ready:
+                    speaker.thread.queue.put((self, speaker, ready))
+
+    def decode(self, speaker: _Speaker, ready: List[Any]) -> None:
+        decoder = speaker.decoder
+        if decoder is None:
+            decoder = speaker.decoder = opus.Decoder()
+
+        user_id = self.client._user_ids.get(speaker.ssrc)
+        write = self.sink.write
+        for sequence, timestamp, data, fec in ready:
+            try:
+                if data is not None:
+                    pcm = decoder.decode(data)
+                elif fec is not None:
+                    pcm = decoder.decode(fec, fec=True)
+                else:
+                    pcm = decoder.decode(None)
+            except opus.OpusError:
+                _log.debug('Could not decode packet %s from SSRC %s, concealing it.', sequence, speaker.ssrc)
+                pcm = decoder.decode(None)
+            write(VoiceFrame(speaker.ssrc, user_id, sequence, timestamp, pcm, data is None))
+
+    def finish(self) -> None:
+        # called once by every decoder thread after its last frame
+        with self.receiver._lock:
+            self.pending -= 1
+            if self.pending:
+                return
+        try:
+            self.sink.cleanup()
+        except Exception:
+            _log.exception('Calling cleanup() on sink %r failed.', self.sink)
+
+
+class _ReceiveThread(threading.Thread):
+    def __init__(self, receiver: AudioReceiver) -> None:
+        super().__init__(name='discord-voice-receive', daemon=True)
+        self.receiver: AudioReceiver = receiver
+
+    def run(self) -> None:
+        receiver = self.receiver
+        selector = receiver._selector
+        commands = receiver._commands
+        listeners = receiver._listeners
+        perf_counter = time.perf_counter
+        while not receiver._closed:
+            while commands:
+                function, args = commands.popleft()
+                function(*args)
+
+            # wake up every frame to give up on packets that never arrive
+            events = selector.select(_FRAME_DURATION)
+            now = perf_counter()
+            for key, _ in events:
+                key.data.receive(key.fileobj, now)
+            for listener in listeners:
+                listener.expire(now)
+
+
+class _DecoderThread(threading.Thread):
+    def __init__(self, index: int) -> None:
+        super().__init__(name=f'discord-voice-decoder-{index}', daemon=True)
+        self.queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self.speakers: int = 0
+
+    def run(self) -> None:
+        get = self.queue.get
+        while True:
+            item = get()
+            if item is None:
+                return
+
+            listener, speaker, ready = item
+            if speaker is None:
+                listener.finish()
+                continue
+            if listener.failed:
+                continue
+
+            try:
+                listener.decode(speaker, ready)
+            except Exception:
+                _log.exception('Writing to sink %r failed, no longer listening.', listener.sink)
+                listener.failed = True
+                listener.stop()
+
+
+class AudioReceiver:
+    """Receives the audio of every listening :class:`VoiceClient`.
+
+    One thread reads the voice sockets, decrypts packets and puts them in
+    order per speaker, a fixed number of threads decode them with Opus.
+    Every speaker is decoded on one thread so that its frames stay in
+    order, speakers are spread over the threads by how many each has.
+
+    Decoding runs outside of the GIL, so more threads decode more speakers
+    at the same time when there are cores to spare.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    threads: :class:`int`
+        The number of threads to decode audio on. They are started with
+        the receive thread when the first voice client starts listening.
+    """
+
+    _default: ClassVar[Optional[AudioReceiver]] = None
+
+    def __init__(self, threads: int = 2) -> None:
+        if threads < 1:
+            raise ValueError('threads must be at least 1')
+
+        self._decoders: List[_DecoderThread] = [_DecoderThread(index) for index in range(threads)]
+        self._thread: _ReceiveThread = _ReceiveThread(self)
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        # changes to the selector and the listeners are made by the receive thread
+        self._commands: Deque[Tuple[Any, Tuple[Any, ...]]] = collections.deque()
+        self._listeners: List[_Listener] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._closed: bool = False
+
+    @classmethod
+    def default(cls) -> AudioReceiver:
+        """Returns the receiver used by :meth:`VoiceClient.listen`.
+
+        Returns
+        --------
+        :class:`AudioReceiver`
+            The default receiver, created on first use.
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def set_default(cls, receiver: AudioReceiver) -> None:
+        """Sets the receiver used by :meth:`VoiceClient.listen` from now on.
+
+        Voice clients that are already listening are not moved.
+
+        Parameters
+        -----------
+        receiver: :class:`AudioReceiver`
+            The new default receiver.
+        """
+        cls._default = receiver
+
+    @property
+    def threads(self) -> int:
+        """:class:`int`: The number of threads audio is decoded on."""
+        return len(self._decoders)
+
+    @property
+    def speakers(self) -> int:
+        """:class:`int`: The number of speakers currently being decoded."""
+        return sum(thread.speakers for thread in self._decoders)
+
+    def _post(self, function: Any, *args: Any) -> None:
+        self._commands.append((function, args))
+
+    def _listen(self, client: VoiceClient, sink: AudioSink, depth: int) -> _Listener:
+        if self._closed:
+            raise RuntimeError('AudioReceiver is closed')
+
+        listener = _Listener(self, client, sink, depth)
+        self._post(self._listeners.append, listener)
+        with self._lock:
+            if not self._thread.is_alive():
+                for thread in self._decoders:
+                    thread.start()
+                self._thread.start()
+        return listener
+
+    def _register(self, sock: socket.socket, listener: _Listener) -> None:
+        try:
+            self._selector.register(sock, selectors.EVENT_READ, listener)
+        except (ValueError, OSError):
+            # the socket was already closed again
+            _log.debug('Could not listen on voice socket %r.', sock)
+
+    def _unregister(self, sock: socket.socket) -> None:
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+
+    def _add_speaker(self, ssrc: int, depth: int) -> _Speaker:
+        with self._lock:
+            thread = min(self._decoders, key=lambda t: t.speakers)
+            thread.speakers += 1
+        return _Speaker(ssrc, depth, thread)
+
+    def _detach(self, listener: _Listener) -> None:
+        if listener.socket is not None:
+            self._unregister(listener.socket)
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+        with self._lock:
+            for speaker in listener.speakers.values():
+                speaker.thread.speakers -= 1
+            listener.pending = len(self._decoders)
+
+        # packets held back behind a missing one are written out with the
+        # gaps concealed, before the threads are told to finish
+        now = time.perf_counter()
+        for speaker in listener.speakers.values():
+            jitter = speaker.jitter
+            ready: List[Any] = []
+            while jitter.packets:
+                jitter.release(now, ready, True)
+            if ready:
+                speaker.thread.queue.put((listener, speaker, ready))
+
+        # the sink is cleaned up once every thread wrote its last frame
+        for thread in self._decoders:
+            thread.queue.put((listener, None, None))
+
+    def close(self) -> None:
+        """Stops every thread of the receiver.
+
+        Voice clients that are still listening stop receiving audio without
+        their sink being cleaned up.
+        """
+        self._closed = True
+        for thread in self._decoders:
+            thread.queue.put(None)
+        with self._lock:
+            alive = self._thread.is_alive()
+        if alive:
+            self._thread.join()
+        self._selector.close()
+        if AudioReceiver._default is self:
+            AudioReceiver._default = None
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import deque
 
 import aiohttp
 
@@ -33,6 +34,7 @@ from .state import AutoShardedConnectionState
 from .client import Client
 from .backoff import ExponentialBackoff
 from .gateway import *
+from .gateway import GatewayThread, IdentifyRatelimiter
 from .errors import (
     ClientException,
     HTTPException,
@@ -42,13 +44,16 @@ from .errors import (
 )
 
 from .enums import Status
+from . import utils
 
-from typing import TYPE_CHECKING, Any, Callable, Tuple, Type, Optional, List, Dict, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterable, Tuple, Type, Optional, List, Dict, Set, TypeVar
 
 if TYPE_CHECKING:
     from .gateway import DiscordWebSocket
     from .activity import BaseActivity
     from .enums import Status
+    from .state import AutoShardedConnectionState
+    from .types.gateway import SessionStartLimit
 
     EI = TypeVar('EI', bound='EventItem')
 
@@ -102,6 +107,9 @@ class Shard:
         self._reconnect = client._reconnect
         self._backoff: ExponentialBackoff = ExponentialBackoff()
         self._task: Optional[asyncio.Task] = None
+        self._handoff: Optional[_Handoff] = None
+        # set once the shard was replaced by a reshard
+        self._retired: bool = False
         self._handled_exceptions: Tuple[Type[Exception], ...] = (
             OSError,
             HTTPException,
@@ -125,12 +133,18 @@ class Shard:
 
     async def close(self) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=4000 if self.ws._journal is not None else 1000)
 
     async def disconnect(self) -> None:
         await self.close()
         self._dispatch('shard_disconnect', self.id)
 
+    async def retire(self) -> None:
+        self._retired = True
+        self._cancel_task()
+        # the session is not coming back so it is not kept for a RESUME
+        await self.ws.close(code=1000)
+
     async def _handle_disconnect(self, e: Exception) -> None:
         self._dispatch('disconnect')
         self._dispatch('shard_disconnect', self.id)
@@ -178,6 +192,9 @@ class Shard:
                 break
 
     async def reidentify(self, exc: ReconnectWebSocket) -> None:
+        if self._retired:
+            return
+
         self._cancel_task()
         self._dispatch('disconnect')
         self._dispatch('shard_disconnect', self.id)
@@ -189,6 +206,7 @@ class Shard:
                 shard_id=self.id,
                 session=self.ws.session_id,
                 sequence=self.ws.sequence,
+                shard_count=self.ws.shard_count,
             )
             self.ws = await asyncio.wait_for(coro, timeout=60.0)
         except self._handled_exceptions as e:
@@ -198,12 +216,17 @@ class Shard:
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            if self._handoff is not None:
+                self._handoff.attach(self)
             self.launch()
 
     async def reconnect(self) -> None:
+        if self._retired:
+            return
+
         self._cancel_task()
         try:
-            coro = DiscordWebSocket.from_client(self._client, shard_id=self.id)
+            coro = DiscordWebSocket.from_client(self._client, shard_id=self.id, shard_count=self.ws.shard_count)
             self.ws = await asyncio.wait_for(coro, timeout=60.0)
         except self._handled_exceptions as e:
             await self._handle_disconnect(e)
@@ -212,9 +235,163 @@ class Shard:
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            if self._handoff is not None:
+                self._handoff.attach(self)
             self.launch()
 
 
+def _fingerprint(event: str, data: Any) -> str:
+    return event + utils._to_json(data)
+
+
+class _HandoffParsers:
+    __slots__ = ('handoff', 'shard', 'old')
+
+    def __init__(self, handoff: _Handoff, shard: Shard, old: bool) -> None:
+        self.handoff: _Handoff = handoff
+        self.shard: Shard = shard
+        self.old: bool = old
+
+    def __getitem__(self, event: str) -> Callable[[Any], None]:
+        func = self.handoff.state.parsers[event]
+        if self.old:
+            return lambda data: self.handoff.parse_old(event, func, data)
+        return lambda data: self.handoff.parse_new(self.shard, event, func, data)
+
+
+class _Handoff:
+    # While resharding both shard sets are connected and receive the same
+    # events. The old shards keep dispatching and remember what they
+    # dispatched in the last ``window`` seconds. The new shards only fill in
+    # guilds the state does not have yet and hold everything else back. When
+    # dispatch is switched over, held events the old shards never saw are
+    # dispatched and, for another window, events the old shards already
+    # dispatched are skipped.
+
+    def __init__(self, client: AutoShardedClient, shard_ids: Iterable[int], window: float) -> None:
+        self.state: AutoShardedConnectionState = client._connection
+        self.loop: asyncio.AbstractEventLoop = client.loop
+        self.dispatch: Callable[..., None] = client.dispatch
+        self.window: float = window
+        self.switched: bool = False
+        # the guild IDs each new shard is still waiting on, None until READY
+        self.pending: Dict[int, Optional[Set[int]]] = {shard_id: None for shard_id in shard_ids}
+        self.filled: asyncio.Event = asyncio.Event()
+        self._seen: Dict[str, int] = {}
+        self._seen_at: Deque[Tuple[float, str]] = deque()
+        self._held: Deque[Tuple[float, str, str, Any]] = deque()
+        self._finish_handle: Optional[asyncio.TimerHandle] = None
+
+    def attach(self, shard: Shard, *, old: bool = False) -> None:
+        shard._handoff = self
+        ws = shard.ws
+        ws._discord_parsers = _HandoffParsers(self, shard, old)  # type: ignore
+        if not old and not self.switched:
+            ws._dispatch = lambda *args: None
+            # the journal only follows the shards that are dispatching
+            ws._journal = None
+
+    def detach(self, shard: Shard) -> None:
+        shard._handoff = None
+        shard.ws._discord_parsers = self.state.parsers
+        shard.ws._dispatch = self.dispatch
+        shard.ws._journal = self.state._journal
+
+    def _forget(self, key: str) -> bool:
+        count = self._seen.get(key)
+        if not count:
+            return False
+        if count == 1:
+            del self._seen[key]
+        else:
+            self._seen[key] = count - 1
+        return True
+
+    def parse_old(self, event: str, func: Callable[[Any], None], data: Any) -> None:
+        now = self.loop.time()
+        key = _fingerprint(event, data)
+        self._seen[key] = self._seen.get(key, 0) + 1
+        self._seen_at.append((now, key))
+
+        expired = now - self.window
+        while self._seen_at and self._seen_at[0][0] < expired:
+            self._forget(self._seen_at.popleft()[1])
+
+        func(data)
+
+    def parse_new(self, shard: Shard, event: str, func: Callable[[Any], None], data: Any) -> None:
+        if self.switched:
+            if not self._forget(_fingerprint(event, data)):
+                func(data)
+            return
+
+        if event == 'READY':
+            if shard.id in self.pending:
+                guilds = {int(guild['id']) for guild in data['guilds']}
+                self.pending[shard.id] = guilds
+                if not guilds:
+                    self._shard_filled(shard.id)
+        elif event == 'GUILD_CREATE':
+            self._fill(shard.id, data)
+        elif event != 'RESUMED':
+            now = self.loop.time()
+            self._held.append((now, event, _fingerprint(event, data), data))
+            expired = now - self.window
+            while self._held and self._held[0][0] < expired:
+                self._held.popleft()
+
+    def _fill(self, shard_id: int, data: Any) -> None:
+        guild_id = int(data['id'])
+        if data.get('unavailable') is not True:
+            # guilds the old shards have are kept up to date by them, the
+            # snapshot in this GUILD_CREATE could already be stale
+            guild = self.state._get_guild(guild_id)
+            if guild is None or guild.unavailable:
+                self.state._get_create_guild(data)
+
+        guilds = self.pending.get(shard_id)
+        if guilds is not None:
+            guilds.discard(guild_id)
+            if not guilds:
+                self._shard_filled(shard_id)
+
+    def _shard_filled(self, shard_id: int) -> None:
+        del self.pending[shard_id]
+        _log.info('Shard ID %s of the new shard set has received its guilds.', shard_id)
+        if not self.pending:
+            self.filled.set()
+
+    def switch(self, shards: Iterable[Shard]) -> None:
+        self.switched = True
+        replay = []
+        for _, event, key, data in self._held:
+            if not self._forget(key):
+                replay.append((event, data))
+        self._held.clear()
+
+        for shard in shards:
+            shard.ws._dispatch = self.dispatch
+            shard.ws._journal = self.state._journal
+
+        parsers = self.state.parsers
+        for event, data in replay:
+            try:
+                func = parsers[event]
+            except KeyError:
+                _log.debug('Unknown event %s.', event)
+            else:
+                func(data)
+
+        self._finish_handle = self.loop.call_later(self.window, self.finish, list(shards))
+
+    def finish(self, shards: List[Shard]) -> None:
+        for shard in shards:
+            if shard._handoff is self:
+                self.detach(shard)
+        self._seen.clear()
+        self._seen_at.clear()
+
+
 class ShardInfo:
     """A class that gives information and control over a specific shard.
 
@@ -311,10 +488,22 @@ class AutoShardedClient(Client):
     if this is used. By default, when omitted, the client will launch shards from
     0 to ``shard_count - 1``.
 
+    If a ``shard_threads`` parameter is given, the shards are spread over
+    that many threads, each running its own event loop, that read, inflate
+    and decode the gateway payloads. Only the decoded payloads are handed to
+    the client's event loop, which keeps handling the events.
+
+    .. versionadded:: 2.0
+        The ``shard_threads`` parameter.
+
     Attributes
     ------------
     shard_ids: Optional[List[:class:`int`]]
         An optional list of shard_ids to launch the shards with.
+    shard_threads: Optional[:class:`int`]
+        The number of threads the shards are read in. Shard IDs are assigned
+        to them round-robin. If ``None``, the shards are read in the
+        client's event loop.
     """
 
     if TYPE_CHECKING:
@@ -323,6 +512,7 @@ class AutoShardedClient(Client):
     def __init__(self, *args: Any, loop: Optional[asyncio.AbstractEventLoop] = None, **kwargs: Any) -> None:
         kwargs.pop('shard_id', None)
         self.shard_ids: Optional[List[int]] = kwargs.pop('shard_ids', None)
+        self.shard_threads: Optional[int] = kwargs.pop('shard_threads', None)
         super().__init__(*args, loop=loop, **kwargs)
 
         if self.shard_ids is not None:
@@ -337,6 +527,33 @@ class AutoShardedClient(Client):
         self._connection._get_websocket = self._get_websocket
         self._connection._get_client = lambda: self
         self.__queue = asyncio.PriorityQueue()
+        self._identify_ratelimiter: IdentifyRatelimiter = IdentifyRatelimiter()
+        self._handoff: Optional[_Handoff] = None
+        self.__threads: Dict[int, GatewayThread] = {}
+
+    async def _call_before_identify_hook(self, shard_id: Optional[int], *, initial: bool = False) -> None:
+        await self._identify_ratelimiter.block(shard_id)
+        await self.before_identify_hook(shard_id, initial=initial)
+
+    async def before_identify_hook(self, shard_id: Optional[int], *, initial: bool = False) -> None:
+        """|coro|
+
+        A hook that is called before IDENTIFYing a session.
+
+        Shards are already spaced out according to the ``max_concurrency``
+        Discord reports, so unlike :meth:`Client.before_identify_hook` the
+        default implementation does nothing.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ------------
+        shard_id: :class:`int`
+            The shard ID that requested being IDENTIFY'd
+        initial: :class:`bool`
+            Whether this IDENTIFY is the first initial IDENTIFY.
+        """
+        pass
 
     def _get_websocket(self, guild_id: Optional[int] = None, *, shard_id: Optional[int] = None) -> DiscordWebSocket:
         if shard_id is None:
@@ -344,6 +561,18 @@ class AutoShardedClient(Client):
             shard_id = (guild_id >> 22) % self.shard_count  # type: ignore
         return self.__shards[shard_id].ws
 
+    async def _ws_connect(self, gateway: str, shard_id: Optional[int] = None) -> Any:
+        if not self.shard_threads:
+            return await self.http.ws_connect(gateway)
+
+        index = (shard_id or 0) % self.shard_threads
+        try:
+            thread = self.__threads[index]
+        except KeyError:
+            thread = self.__threads[index] = GatewayThread(self.http, name=f'discord-gateway-{index}')
+            thread.start()
+        return await thread.ws_connect(gateway)
+
     def _get_state(self, **options: Any) -> AutoShardedConnectionState:
         return AutoShardedConnectionState(
             dispatch=self.dispatch,
@@ -388,42 +617,221 @@ class AutoShardedClient(Client):
         """Mapping[int, :class:`ShardInfo`]: Returns a mapping of shard IDs to their respective info object."""
         return {shard_id: ShardInfo(parent, self.shard_count) for shard_id, parent in self.__shards.items()}
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
-        try:
-            coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
-            ws = await asyncio.wait_for(coro, timeout=180.0)
-        except Exception:
-            _log.exception('Failed to connect for shard_id: %s. Retrying...', shard_id)
-            await asyncio.sleep(5.0)
-            return await self.launch_shard(gateway, shard_id)
+    async def _connect_shard(
+        self,
+        gateway: str,
+        shard_id: int,
+        *,
+        initial: bool = False,
+        session: Optional[str] = None,
+        sequence: Optional[int] = None,
+        shard_count: Optional[int] = None,
+    ) -> Optional[Shard]:
+        backoff = ExponentialBackoff()
+        while not self.is_closed():
+            try:
+                coro = DiscordWebSocket.from_client(
+                    self,
+                    initial=initial,
+                    gateway=gateway,
+                    shard_id=shard_id,
+                    session=session,
+                    sequence=sequence,
+                    resume=session is not None,
+                    shard_count=shard_count,
+                )
+                ws = await asyncio.wait_for(coro, timeout=180.0)
+            except Exception:
+                retry = backoff.delay()
+                _log.exception('Failed to connect for shard_id: %s. Retrying in %.2fs...', shard_id, retry)
+                await asyncio.sleep(retry)
+                continue
+
+            return Shard(ws, self, self.__queue.put_nowait)
+
+        return None
+
+    async def launch_shard(
+        self,
+        gateway: str,
+        shard_id: int,
+        *,
+        initial: bool = False,
+        session: Optional[str] = None,
+        sequence: Optional[int] = None,
+    ) -> None:
+        shard = await self._connect_shard(gateway, shard_id, initial=initial, session=session, sequence=sequence)
+        if shard is not None:
+            # keep reading the shard while others connect
+            self.__shards[shard_id] = shard
+            shard.launch()
 
-        # keep reading the shard while others connect
-        self.__shards[shard_id] = ret = Shard(ws, self, self.__queue.put_nowait)
-        ret.launch()
+    async def _launch_bucket(self, gateway: str, shard_ids: List[int], first: int) -> None:
+        for shard_id in shard_ids:
+            journaled = self._connection._resume_from_journal(shard_id)
+            if journaled is not None:
+                session, sequence = journaled
+                await self.launch_shard(gateway, shard_id, initial=shard_id == first, session=session, sequence=sequence)
+            else:
+                await self.launch_shard(gateway, shard_id, initial=shard_id == first)
 
     async def launch_shards(self) -> None:
+        shard_count, gateway, limits = await self.http.get_bot_gateway_info()
         if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+            self.shard_count = shard_count
 
         self._connection.shard_count = self.shard_count
 
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
-        for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+        buckets = await self._prepare_launch(limits, shard_ids)
+        _log.info('Launching %s shards in %s concurrent buckets.', len(shard_ids), len(buckets))
+        await asyncio.gather(*(self._launch_bucket(gateway, ids, shard_ids[0]) for ids in buckets))
 
         self._connection.shards_launched.set()
 
+    async def _prepare_launch(self, limits: SessionStartLimit, shard_ids: Iterable[int]) -> List[List[int]]:
+        shard_ids = list(shard_ids)
+        max_concurrency = limits.get('max_concurrency', 1) or 1
+        if max_concurrency != self._identify_ratelimiter.max_concurrency:
+            self._identify_ratelimiter = IdentifyRatelimiter(max_concurrency)
+
+        remaining = limits.get('remaining')
+        if remaining is not None and remaining < len(shard_ids):
+            delay = limits.get('reset_after', 0) / 1000
+            _log.warning(
+                'Only %s session starts remain for %s shards, waiting %.2fs for the limit to reset.',
+                remaining,
+                len(shard_ids),
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+        # shards in different buckets may IDENTIFY at the same time, the
+        # ratelimiter spaces out the ones that share a bucket
+        buckets: Dict[int, List[int]] = {}
+        for shard_id in shard_ids:
+            buckets.setdefault(shard_id % max_concurrency, []).append(shard_id)
+        return list(buckets.values())
+
+    async def _stage_bucket(
+        self, gateway: str, shard_ids: List[int], shard_count: int, handoff: _Handoff, shards: Dict[int, Shard]
+    ) -> None:
+        for shard_id in shard_ids:
+            shard = await self._connect_shard(gateway, shard_id, shard_count=shard_count)
+            if shard is None:
+                return
+            handoff.attach(shard)
+            shards[shard_id] = shard
+            shard.launch()
+
+    async def reshard(
+        self,
+        shard_count: Optional[int] = None,
+        *,
+        shard_ids: Optional[List[int]] = None,
+        timeout: Optional[float] = 300.0,
+        handoff_window: float = 5.0,
+    ) -> None:
+        """|coro|
+
+        Changes the number of shards without disconnecting the client.
+
+        The new shards are launched next to the current ones, which keep
+        dispatching events while the new shards receive their guilds. Once
+        every new shard has received its guilds, event dispatch is switched
+        over to the new shards in one step and the old shards are closed.
+        Events that both sets of shards receive around the switch are
+        dispatched once.
+
+        Member chunk requests that are still in flight on the old shards
+        are not carried over to the new ones.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        shard_count: Optional[:class:`int`]
+            The new shard count. If not given, the shard count Discord
+            recommends is used.
+        shard_ids: Optional[List[:class:`int`]]
+            The shard IDs to launch. Defaults to every shard from 0 to
+            ``shard_count - 1``.
+        timeout: Optional[:class:`float`]
+            How long to wait, after the new shards are launched, for them
+            to receive their guilds. ``None`` waits forever.
+        handoff_window: :class:`float`
+            The longest delay, in seconds, expected between both sets of
+            shards receiving the same event.
+
+        Raises
+        -------
+        ClientException
+            The client is not connected or is already being resharded.
+        asyncio.TimeoutError
+            The new shards did not receive their guilds in time. The new
+            shards are closed and the current ones are kept.
+        """
+        if self.is_closed() or not self.__shards:
+            raise ClientException('The client must be connected to be resharded.')
+        if self._handoff is not None:
+            raise ClientException('The client is already being resharded.')
+
+        recommended, gateway, limits = await self.http.get_bot_gateway_info()
+        shard_count = shard_count or recommended
+        new_ids = list(shard_ids) if shard_ids is not None else list(range(shard_count))
+
+        old = self.__shards
+        new: Dict[int, Shard] = {}
+        self._handoff = handoff = _Handoff(self, new_ids, handoff_window)
+        for shard in old.values():
+            handoff.attach(shard, old=True)
+
+        try:
+            buckets = await self._prepare_launch(limits, new_ids)
+            _log.info('Resharding from %s to %s shards.', self.shard_count, shard_count)
+            await asyncio.gather(*(self._stage_bucket(gateway, ids, shard_count, handoff, new) for ids in buckets))
+            await asyncio.wait_for(handoff.filled.wait(), timeout=timeout)
+        except BaseException:
+            for shard in old.values():
+                if shard._handoff is handoff:
+                    handoff.detach(shard)
+            self._handoff = None
+            await asyncio.gather(*(shard.retire() for shard in new.values()), return_exceptions=True)
+            raise
+
+        # nothing below may yield until dispatch is switched over
+        for shard in old.values():
+            shard._retired = True
+            shard._handoff = None
+            shard._cancel_task()
+
+        self.shard_count = self._connection.shard_count = shard_count
+        self.shard_ids = shard_ids
+        self._connection.shard_ids = new_ids
+        self.__shards = new
+
+        journal = self._connection._journal
+        if journal is not None:
+            # the journaled sessions belong to the old shard count
+            for shard_id in old:
+                journal.invalidate(shard_id)
+
+        handoff.switch(new.values())
+        self._handoff = None
+        _log.info('Switched dispatch over to %s shards.', len(new))
+
+        await asyncio.gather(*(shard.retire() for shard in old.values()), return_exceptions=True)
+
     async def connect(self, *, reconnect: bool = True) -> None:
         self._reconnect = reconnect
         await self.launch_shards()
 
         while not self.is_closed():
             item = await self.__queue.get()
+            if item.shard is not None and item.shard._retired:
+                continue
             if item.type == EventType.close:
                 await self.close()
                 if isinstance(item.error, ConnectionClosed):
@@ -462,6 +870,10 @@ class AutoShardedClient(Client):
         if to_close:
             await asyncio.wait(to_close)
 
+        for thread in self.__threads.values():
+            await self.loop.run_in_executor(None, thread.stop)
+        self.__threads.clear()
+
         await self.http.close()
         self.__queue.put_nowait(EventItem(EventType.clean_close, None, None))
 
@@ -30,7 +30,7 @@ import copy
 import datetime
 import itertools
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Deque
+from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Set, Tuple, Deque
 import inspect
 
 import os
@@ -55,6 +55,8 @@ from .invite import Invite
 from .integrations import _integration_factory
 from .interactions import Interaction
 from .ui.view import ViewStore, View
+from .ui.router import ComponentRouter
+from .journal import EventJournal
 from .stage_instance import StageInstance
 from .threads import Thread, ThreadMember
 from .sticker import GuildSticker
@@ -178,6 +180,14 @@ class ConnectionState:
             raise TypeError('allowed_mentions parameter must be AllowedMentions')
 
         self.allowed_mentions: Optional[AllowedMentions] = allowed_mentions
+
+        journal = options.get('event_journal')
+        if journal is not None and not isinstance(journal, EventJournal):
+            raise TypeError('event_journal parameter must be EventJournal')
+
+        self._journal: Optional[EventJournal] = journal
+        self._replaying: bool = False
+        self._journal_resuming: Set[Optional[int]] = set()
         self._chunk_requests: Dict[Union[int, str], ChunkRequest] = {}
 
         activity = options.get('activity', None)
@@ -372,6 +382,16 @@ class ConnectionState:
     def persistent_views(self) -> Sequence[View]:
         return self._view_store.persistent_views
 
+    def store_component_router(self, router: ComponentRouter) -> None:
+        self._view_store.add_router(router)
+
+    def remove_component_router(self, router: ComponentRouter) -> None:
+        self._view_store.remove_router(router)
+
+    @property
+    def component_routers(self) -> Sequence[ComponentRouter]:
+        return self._view_store.component_routers
+
     @property
     def guilds(self) -> List[Guild]:
         return list(self._guilds.values())
@@ -548,10 +568,66 @@ class ConnectionState:
         finally:
             self._ready_task = None
 
+    def _replay_journal(self, journal: EventJournal, shard_id: Optional[int] = None) -> int:
+        parsers = self.parsers
+        dispatch = self.dispatch
+        had_ready_state = hasattr(self, '_ready_state')
+        count = 0
+
+        # nothing that is replayed should reach the user, it already has
+        self.dispatch = lambda *args, **kwargs: None
+        self._replaying = True
+        try:
+            for record in journal.replay(shard_id):
+                msg = utils._from_json(record.frame)
+                event = msg.get('t')
+                data = msg.get('d')
+                if event == 'READY' or event == 'RESUMED':
+                    data['__shard_id__'] = shard_id
+
+                try:
+                    func = parsers[event]
+                except KeyError:
+                    continue
+
+                try:
+                    func(data)
+                except Exception:
+                    _log.exception('Failed to replay journaled %s event for shard ID %s.', event, shard_id)
+                count += 1
+        finally:
+            self.dispatch = dispatch
+            self._replaying = False
+
+        if not had_ready_state:
+            try:
+                del self._ready_state
+            except AttributeError:
+                pass
+
+        return count
+
+    def _resume_from_journal(self, shard_id: Optional[int]) -> Optional[Tuple[str, int]]:
+        journal = self._journal
+        if journal is None:
+            return None
+
+        session = journal.session(shard_id)
+        if session is None:
+            return None
+
+        count = self._replay_journal(journal, shard_id)
+        self._journal_resuming.add(shard_id)
+        _log.info(
+            'Shard ID %s replayed %d journaled events, attempting to RESUME session %s.', shard_id, count, session[0]
+        )
+        return session
+
     def parse_ready(self, data) -> None:
-        if self._ready_task is not None:
+        if self._ready_task is not None and not self._replaying:
             self._ready_task.cancel()
 
+        self._journal_resuming.clear()
         self._ready_state = asyncio.Queue()
         self.clear(views=False)
         self.user = ClientUser(state=self, data=data['user'])
@@ -571,9 +647,16 @@ class ConnectionState:
             self._add_guild_from_data(guild_data)
 
         self.dispatch('connect')
-        self._ready_task = asyncio.create_task(self._delay_ready())
+        if not self._replaying:
+            self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        if self._journal_resuming:
+            # the cache was rebuilt from the journal, so this is the
+            # first time the user hears from this session
+            self._journal_resuming.clear()
+            self.call_handlers('ready')
+            self.dispatch('ready')
         self.dispatch('resumed')
 
     def parse_message_create(self, data) -> None:
@@ -1524,10 +1607,19 @@ class AutoShardedConnectionState(ConnectionState):
 
         self.dispatch('connect')
         self.dispatch('shard_connect', data['__shard_id__'])
+        self._journal_resuming.discard(data['__shard_id__'])
 
-        if self._ready_task is None:
+        if self._ready_task is None and not self._replaying:
             self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        shard_id = data['__shard_id__']
+        if shard_id in self._journal_resuming:
+            self._journal_resuming.discard(shard_id)
+            self.dispatch('shard_ready', shard_id)
+            if not self._journal_resuming and self._ready_task is None and not hasattr(self, '_ready_state'):
+                self.call_handlers('ready')
+                self.dispatch('ready')
+
         self.dispatch('resumed')
-        self.dispatch('shard_resumed', data['__shard_id__'])
+        self.dispatch('shard_resumed', shard_id)
@@ -0,0 +1,14 @@
+"""
+discord.testing
+~~~~~~~~~~~~~~~~
+
+Offline stand-ins for the Discord gateway, REST API and voice servers used for benchmarking.
+
+:copyright: (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+:license: MIT, see LICENSE for more details.
+
+"""
+
+from .gateway import *
+from .rest import *
+from .voice import *
@@ -0,0 +1,1024 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import array
+import asyncio
+import gc
+import math
+import multiprocessing
+import os
+import socket
+import struct
+import threading
+import time
+import tracemalloc
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from .. import utils
+from ..client import Client
+from ..flags import Intents
+from ..http import HTTPClient
+from ..opus import Encoder as OpusEncoder
+from ..pcm import HAS_AUDIOOP, HAS_NUMPY, FrameMixer, Resampler
+from ..player import AudioPlayer, AudioScheduler, AudioSource
+from ..receiver import AudioFrameStream, AudioReceiver
+from ..shard import AutoShardedClient
+from ..ui import Button, View
+from ..ui.view import ViewStore
+from ..voice_client import _VoicePacket
+from .gateway import FakeGateway, SyntheticStream
+from .rest import FakeAPI
+from .voice import UDPSink, VoicePacketGenerator
+
+__all__ = (
+    'run_crypto_benchmark',
+    'run_gateway_benchmark',
+    'run_http_benchmark',
+    'run_pcm_benchmark',
+    'run_receive_benchmark',
+    'run_shard_benchmark',
+    'run_stringview_benchmark',
+    'run_views_benchmark',
+    'run_voice_benchmark',
+)
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+
+async def _stream_into_client(
+    stream: SyntheticStream, *, compress: bool, max_messages: Optional[int], timed: bool = True
+) -> Dict[str, Any]:
+    timings: List[float] = []
+    total = len(stream)
+    perf_counter = time.perf_counter
+
+    async with FakeGateway(stream) as gateway:
+        intents = Intents.default()
+        intents.members = True
+        client = Client(intents=intents, chunk_guilds_at_startup=False, max_messages=max_messages)
+        try:
+            ws = await gateway.connect(client, compress=compress)
+            received_message = ws.received_message
+
+            async def timed_received_message(msg: Any, /) -> None:
+                start = perf_counter()
+                await received_message(msg)
+                timings.append(perf_counter() - start)
+
+            if timed:
+                ws.received_message = timed_received_message
+
+            start = perf_counter()
+            while ws.sequence != total:
+                await ws.poll_event()
+            elapsed = perf_counter() - start
+
+            state = client._connection
+            return {
+                'client': client,
+                'elapsed': elapsed,
+                'timings': timings,
+                'guilds': len(state._guilds),
+                'members': sum(len(guild._members) for guild in state._guilds.values()),
+            }
+        finally:
+            await client.close()
+
+
+async def run_gateway_benchmark(
+    guilds: int,
+    *,
+    members: int = 10,
+    channels: int = 5,
+    roles: int = 3,
+    messages: int = 10000,
+    compress: bool = True,
+    memory: bool = True,
+) -> Dict[str, Any]:
+    """|coro|
+
+    Streams a :class:`SyntheticStream` from a :class:`FakeGateway` into a
+    fresh :class:`~discord.Client` and measures how fast it is parsed.
+
+    Throughput and latencies only account for the time spent in
+    :meth:`DiscordWebSocket.received_message`, so the cost of generating and
+    sending the events in the same process is excluded. Memory is measured
+    in separate runs without messages, with :mod:`tracemalloc` enabled.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    guilds: :class:`int`
+        The number of guilds to create.
+    members: :class:`int`
+        The number of members per guild.
+    channels: :class:`int`
+        The number of channels per guild.
+    roles: :class:`int`
+        The number of roles per guild.
+    messages: :class:`int`
+        The number of messages sent after the guilds are created.
+    compress: :class:`bool`
+        Whether to use ``zlib-stream`` transport compression.
+    memory: :class:`bool`
+        Whether to measure the memory used per guild and member.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    stream = SyntheticStream(guilds=guilds, members=members, channels=channels, roles=roles, messages=messages)
+    result = await _stream_into_client(stream, compress=compress, max_messages=1000)
+    timings = sorted(result['timings'])
+    busy = sum(timings)
+    events = len(stream)
+
+    report: Dict[str, Any] = {
+        'guilds': guilds,
+        'members_per_guild': members,
+        'messages': messages,
+        'events': events,
+        'compress': compress,
+        'cached_guilds': result['guilds'],
+        'cached_members': result['members'],
+        'wall_seconds': result['elapsed'],
+        'events_per_second': events / busy if busy else 0.0,
+        'p50_us': _percentile(timings, 50) * 1e6,
+        'p99_us': _percentile(timings, 99) * 1e6,
+        'max_us': (timings[-1] if timings else 0.0) * 1e6,
+    }
+    del result
+
+    if memory and guilds:
+        usage = []
+        for count in (0, members):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                baseline = tracemalloc.get_traced_memory()[0]
+                bare = SyntheticStream(guilds=guilds, members=count, channels=channels, roles=roles)
+                result = await _stream_into_client(bare, compress=compress, max_messages=None, timed=False)
+                gc.collect()
+                usage.append(tracemalloc.get_traced_memory()[0] - baseline)
+                del result
+            finally:
+                tracemalloc.stop()
+
+        report['bytes_per_guild'] = usage[0] / guilds
+        if members:
+            report['bytes_per_member'] = (usage[1] - usage[0]) / (guilds * members)
+
+    return report
+
+
+async def run_http_benchmark(
+    *,
+    channels: int = 10,
+    messages: int = 20,
+    edits: int = 20,
+    reactions: int = 20,
+    global_limit: int = 50,
+    time_scale: float = 0.1,
+    latency: float = 0.0,
+) -> Dict[str, Any]:
+    """|coro|
+
+    Drives an :class:`HTTPClient` against a :class:`FakeAPI` with concurrent
+    message sends, edits and reactions spread over a number of channels.
+
+    Every operation is started at once, so the client is responsible for
+    spacing them out according to the rate limits it is told about.
+    Ideally no request is ever answered with a ``429``.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    channels: :class:`int`
+        The number of channels to spread the load over.
+    messages: :class:`int`
+        The number of messages sent per channel.
+    edits: :class:`int`
+        The number of edits per channel.
+    reactions: :class:`int`
+        The number of reactions added per channel.
+    global_limit: :class:`int`
+        The number of requests per second the server allows globally.
+    time_scale: :class:`float`
+        The factor applied to every rate limit window of the server.
+    latency: :class:`float`
+        The number of seconds every response is delayed by.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    perf_counter = time.perf_counter
+    timings: List[float] = []
+
+    async def timed(coro: Awaitable[Any]) -> None:
+        start = perf_counter()
+        await coro
+        timings.append(perf_counter() - start)
+
+    async with FakeAPI(global_limit=global_limit, time_scale=time_scale, latency=latency) as api:
+        http = HTTPClient(loop=asyncio.get_running_loop())
+        api.connect(http)
+        try:
+            channel_ids = [(2 << 40) + n for n in range(channels)]
+            seeds = await asyncio.gather(*(http.send_message(channel_id, 'seed') for channel_id in channel_ids))
+            # only the load itself should be accounted for
+            warmup = api.metrics()
+            http._rate_limiter.queued = utils._LatencyHistogram()
+
+            operations = []
+            for channel_id, seed in zip(channel_ids, seeds):
+                message_id = seed['id']
+                operations.extend(http.send_message(channel_id, f'message {n}') for n in range(messages))
+                operations.extend(http.edit_message(channel_id, message_id, content=f'edit {n}') for n in range(edits))
+                operations.extend(
+                    http.add_reaction(channel_id, message_id, f'%F0%9F%91%8{n % 10}') for n in range(reactions)
+                )
+
+            start = perf_counter()
+            await asyncio.gather(*(timed(coro) for coro in operations))
+            elapsed = perf_counter() - start
+            client = http.metrics()
+        finally:
+            await http.close()
+
+        server = api.metrics()
+        for key in ('requests', 'rate_limited', 'global_rate_limited'):
+            server[key] -= warmup[key]
+
+    timings.sort()
+    total = len(timings)
+    return {
+        'channels': channels,
+        'operations': total,
+        'time_scale': time_scale,
+        'wall_seconds': elapsed,
+        'operations_per_second': total / elapsed if elapsed else 0.0,
+        'requests': server['requests'],
+        'rate_limited': server['rate_limited'],
+        'global_rate_limited': server['global_rate_limited'],
+        'rate_limited_ratio': (server['rate_limited'] + server['global_rate_limited']) / max(server['requests'], 1),
+        'p50_ms': _percentile(timings, 50) * 1e3,
+        'p99_ms': _percentile(timings, 99) * 1e3,
+        'queue_p50_ms': client['queue_latency']['p50'] * 1e3,
+        'queue_p99_ms': client['queue_latency']['p99'] * 1e3,
+    }
+
+
+def _serve_gateway(conn: Any, options: Dict[str, Any]) -> None:
+    # runs in a separate process so producing the events is not measured
+    async def serve() -> None:
+        async with FakeGateway(SyntheticStream(**options)) as gateway:
+            conn.send(gateway.url)
+            await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    asyncio.run(serve())
+
+
+async def run_shard_benchmark(
+    guilds: int,
+    *,
+    shards: int = 4,
+    threads: int = 0,
+    members: int = 10,
+    messages: int = 20000,
+    handler_cost: float = 0.0,
+    compress: bool = True,
+) -> Dict[str, Any]:
+    """|coro|
+
+    Runs an :class:`~discord.AutoShardedClient` against a :class:`FakeGateway`
+    served from a separate process and measures how long it takes until
+    every shard's events are handled and how responsive the client's event
+    loop stays meanwhile. The messages follow the guilds in each shard's
+    stream.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    guilds: :class:`int`
+        The number of guilds to create.
+    shards: :class:`int`
+        The number of shards to connect.
+    threads: :class:`int`
+        The ``shard_threads`` to use. ``0`` reads every shard in the
+        client's event loop.
+    members: :class:`int`
+        The number of members per guild.
+    messages: :class:`int`
+        The number of messages sent after the guilds are created.
+    handler_cost: :class:`float`
+        The CPU time in seconds an ``on_message`` handler spends per message.
+    compress: :class:`bool`
+        Whether to use ``zlib-stream`` transport compression.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    loop = asyncio.get_running_loop()
+    perf_counter = time.perf_counter
+    options = {'guilds': guilds, 'members': members, 'messages': messages}
+    events = len(SyntheticStream(**options)) + shards - 1
+
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=_serve_gateway, args=(child, options), daemon=True)
+    server.start()
+    try:
+        url = await loop.run_in_executor(None, parent.recv)
+        query = '?encoding=json&v=9&compress=zlib-stream' if compress else '?encoding=json&v=9'
+
+        async with FakeAPI(gateway_url=url + query, shards=shards, max_concurrency=shards) as api:
+            intents = Intents.default()
+            intents.members = True
+            client = AutoShardedClient(
+                shard_count=shards,
+                shard_threads=threads or None,
+                intents=intents,
+                chunk_guilds_at_startup=False,
+                max_messages=1000,
+            )
+            api.connect(client.http)
+            client.http.token = 'fake-token'
+
+            received = 0
+            done = asyncio.Event()
+
+            async def on_ready() -> None:
+                if not messages:
+                    done.set()
+
+            async def on_message(message: Any) -> None:
+                nonlocal received
+                if handler_cost:
+                    end = perf_counter() + handler_cost
+                    while perf_counter() < end:
+                        pass
+                received += 1
+                if received == messages:
+                    done.set()
+
+            client.on_ready = on_ready  # type: ignore
+            client.on_message = on_message  # type: ignore
+
+            lags: List[float] = []
+
+            async def ticker() -> None:
+                # how late a 10ms timer fires is how long the loop was busy
+                while True:
+                    start = perf_counter()
+                    await asyncio.sleep(0.01)
+                    lags.append(perf_counter() - start - 0.01)
+
+            start = perf_counter()
+            task = asyncio.create_task(client.connect())
+            tick = asyncio.create_task(ticker())
+            try:
+                await done.wait()
+                elapsed = perf_counter() - start
+            finally:
+                tick.cancel()
+                await client.close()
+                await asyncio.gather(task, tick, return_exceptions=True)
+    finally:
+        parent.send(None)
+        server.join(5)
+        if server.is_alive():
+            server.terminate()
+
+    lags.sort()
+    return {
+        'guilds': guilds,
+        'shards': shards,
+        'threads': threads,
+        'messages': messages,
+        'handler_cost_us': handler_cost * 1e6,
+        'compress': compress,
+        'events': events,
+        'wall_seconds': elapsed,
+        'events_per_second': events / elapsed,
+        'loop_lag_p50_ms': _percentile(lags, 50) * 1e3,
+        'loop_lag_p99_ms': _percentile(lags, 99) * 1e3,
+    }
+
+
+def _serve_udp_sink(conn: Any) -> None:
+    with UDPSink() as sink:
+        conn.send(sink.address)
+        conn.recv()
+        # let the last packets arrive
+        time.sleep(0.2)
+        conn.send(sink.stats())
+
+
+class _OpusFrames(AudioSource):
+    def __init__(self, size: int) -> None:
+        self.frame: bytes = b'\xf8\xff\xfe' + bytes(size - 3)
+
+    def read(self) -> bytes:
+        return self.frame
+
+    def is_opus(self) -> bool:
+        return True
+
+
+class _NullVoiceWebSocket:
+    async def speak(self, state: Any = True) -> None:
+        pass
+
+
+class _BenchVoiceClient:
+    # just enough of a VoiceClient for an AudioPlayer, the packets have a
+    # real RTP header but the payload is not encrypted
+    def __init__(self, ssrc: int, address: Tuple[str, int], loop: asyncio.AbstractEventLoop) -> None:
+        self.ssrc: int = ssrc
+        self.sequence: int = 0
+        self.timestamp: int = 0
+        self.address: Tuple[str, int] = address
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.ws: _NullVoiceWebSocket = _NullVoiceWebSocket()
+        self.socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self._connected: threading.Event = threading.Event()
+        self._connected.set()
+        self.dropped: int = 0
+
+    def send_audio_packet(self, data: bytes, *, encode: bool = True) -> None:
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        packet = struct.pack('>BBHII', 0x80, 0x78, self.sequence, self.timestamp, self.ssrc) + data
+        try:
+            self.socket.sendto(packet, self.address)
+        except BlockingIOError:
+            self.dropped += 1
+        self.timestamp = (self.timestamp + OpusEncoder.SAMPLES_PER_FRAME) & 0xFFFFFFFF
+
+
+async def run_voice_benchmark(
+    streams: int,
+    *,
+    seconds: float = 5.0,
+    threads: int = 2,
+    frame_size: int = 120,
+) -> Dict[str, Any]:
+    """|coro|
+
+    Plays an Opus source to a :class:`UDPSink` running in a separate process
+    from a number of voice connections sharing one :class:`~discord.AudioScheduler`,
+    and measures the CPU time spent per stream and how well frames are paced.
+
+    Packets are not encrypted, so only the scheduling and sending of frames
+    is measured.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    streams: :class:`int`
+        The number of concurrent voice connections.
+    seconds: :class:`float`
+        How long to play for.
+    threads: :class:`int`
+        The number of threads of the scheduler.
+    frame_size: :class:`int`
+        The size of every Opus frame in bytes.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=_serve_udp_sink, args=(child,), daemon=True)
+    server.start()
+    scheduler = AudioScheduler(threads=threads)
+    clients: List[_BenchVoiceClient] = []
+    try:
+        address = await loop.run_in_executor(None, parent.recv)
+        clients = [_BenchVoiceClient(n + 1, address, loop) for n in range(streams)]
+        players = [AudioPlayer(_OpusFrames(frame_size), client, scheduler=scheduler) for client in clients]
+
+        cpu = time.process_time()
+        start = time.perf_counter()
+        for player in players:
+            player.start()
+        await asyncio.sleep(seconds)
+        for player in players:
+            player.stop()
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+
+        parent.send(None)
+        sink = await loop.run_in_executor(None, parent.recv)
+    finally:
+        scheduler.close()
+        for client in clients:
+            client.socket.close()
+        server.join(5)
+        if server.is_alive():
+            server.terminate()
+
+    jitter = utils._LatencyHistogram(AudioPlayer.JITTER_BOUNDS)
+    frames = resyncs = 0
+    for player in players:
+        frames += player.frames
+        resyncs += player.resyncs
+        for index, count in enumerate(player.jitter.counts):
+            jitter.counts[index] += count
+        jitter.count += player.jitter.count
+        jitter.total += player.jitter.total
+        jitter.max = max(jitter.max, player.jitter.max)
+
+    expected = streams * elapsed / AudioPlayer.DELAY
+    return {
+        'streams': streams,
+        'threads': threads,
+        'seconds': elapsed,
+        'frames': frames,
+        'frames_expected': int(expected),
+        'resyncs': resyncs,
+        'dropped': sum(client.dropped for client in clients),
+        'cpu_seconds': cpu,
+        'cpu_percent_per_stream': cpu / elapsed / streams * 100,
+        'late_p50_ms': jitter.percentile(50) * 1e3,
+        'late_p99_ms': jitter.percentile(99) * 1e3,
+        'late_max_ms': jitter.max * 1e3,
+        'received': sink['packets'],
+        'lost': sink['lost'],
+        'sink_jitter_ms': sink['jitter_mean'] * 1e3,
+    }
+
+
+def _serve_voice_packets(conn: Any, address: Tuple[str, int], options: Dict[str, Any]) -> None:
+    frames = options.pop('frames')
+    speakers = options.pop('speakers')
+    seconds = options.pop('seconds')
+    ticks: List[float] = []
+    with VoicePacketGenerator(address, seed=0, **options) as generator:
+        conn.recv()
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        for tick in range(int(seconds / AudioPlayer.DELAY)):
+            delay = start + tick * AudioPlayer.DELAY - perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            ticks.append(perf_counter())
+            frame = frames[tick % len(frames)]
+            for ssrc in range(1, speakers + 1):
+                generator.send(ssrc, frame)
+        generator.flush()
+        conn.send((ticks, generator.sent, generator.dropped))
+
+
+class _BenchReceiveClient:
+    # just enough of a VoiceClient for a listener
+    def __init__(self) -> None:
+        self._user_ids: Dict[int, int] = {}
+
+
+async def run_receive_benchmark(
+    speakers: int,
+    *,
+    seconds: float = 5.0,
+    threads: int = 2,
+    mode: str = 'xsalsa20_poly1305_lite',
+    loss: float = 0.0,
+    reorder: float = 0.0,
+) -> Dict[str, Any]:
+    """|coro|
+
+    Sends encrypted Opus voice packets for a number of speakers from a
+    :class:`VoicePacketGenerator` running in a separate process, receives
+    them with an :class:`~discord.AudioReceiver` and consumes the frames
+    from an :class:`~discord.AudioFrameStream` in the event loop.
+
+    Measures the CPU time spent per speaker, how long after being sent a
+    frame reaches the event loop and how responsive the loop stays.
+
+    This requires the Opus library to be loaded.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    speakers: :class:`int`
+        The number of simultaneous speakers.
+    seconds: :class:`float`
+        How long to send audio for.
+    threads: :class:`int`
+        The number of decoder threads of the receiver.
+    mode: :class:`str`
+        The encryption mode, one of :attr:`VoiceClient.supported_modes <discord.VoiceClient.supported_modes>`.
+    loss: :class:`float`
+        The chance of a packet being dropped, from 0 to 1.
+    reorder: :class:`float`
+        The chance of a packet arriving after the next one, from 0 to 1.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    # a second of a sweeping tone, so the decoder has real work to do
+    encoder = OpusEncoder()
+    encoder.set_fec(True)
+    encoder.set_expected_packet_loss_percent(max(loss, 0.05))
+    frames = []
+    length = OpusEncoder.SAMPLES_PER_FRAME
+    for index in range(50):
+        samples = []
+        for n in range(length):
+            value = int(8000 * math.sin(2 * math.pi * (300 + index * 10) * (index * length + n) / OpusEncoder.SAMPLING_RATE))
+            samples += (value, value)
+        frames.append(encoder.encode(array.array('h', samples).tobytes(), length))
+
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.setblocking(False)
+    secret_key = list(os.urandom(32))
+    options = {
+        'frames': frames,
+        'speakers': speakers,
+        'seconds': seconds,
+        'mode': mode,
+        'secret_key': secret_key,
+        'loss': loss,
+        'reorder': reorder,
+    }
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe()
+    server = context.Process(target=_serve_voice_packets, args=(child, sock.getsockname(), options), daemon=True)
+    server.start()
+
+    receiver = AudioReceiver(threads)
+    stream = AudioFrameStream(max_pending=speakers * 50)
+    listener = receiver._listen(_BenchReceiveClient(), stream, 3)  # type: ignore
+    listener.attach(sock, mode, secret_key)
+    perf_counter = time.perf_counter
+    arrivals: List[Tuple[int, float]] = []
+    lags: List[float] = []
+
+    async def consume() -> None:
+        append = arrivals.append
+        async for frame in stream:
+            append((frame.sequence, perf_counter()))
+
+    async def ticker() -> None:
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(perf_counter() - start - 0.01)
+
+    consumer = asyncio.create_task(consume())
+    tick = asyncio.create_task(ticker())
+    try:
+        cpu = time.process_time()
+        start = perf_counter()
+        parent.send(None)
+        ticks, sent, dropped = await loop.run_in_executor(None, parent.recv)
+        # let the last frames through the jitter buffers
+        await asyncio.sleep(0.2)
+        elapsed = perf_counter() - start
+        cpu = time.process_time() - cpu
+        metrics = listener.metrics()
+        listener.stop()
+        await consumer
+    finally:
+        tick.cancel()
+        consumer.cancel()
+        await asyncio.gather(consumer, tick, return_exceptions=True)
+        receiver.close()
+        sock.close()
+        server.join(5)
+        if server.is_alive():
+            server.terminate()
+
+    latency = utils._LatencyHistogram(AudioPlayer.JITTER_BOUNDS + (0.2, 0.5, 1.0))
+    for sequence, arrival in arrivals:
+        if sequence < len(ticks):
+            latency.record(arrival - ticks[sequence])
+    lags.sort()
+    return {
+        'speakers': speakers,
+        'threads': threads,
+        'mode': mode,
+        'seconds': elapsed,
+        'sent': sent,
+        'dropped': dropped,
+        'received': metrics['packets'],
+        'frames': len(arrivals),
+        'frames_expected': speakers * len(ticks),
+        'lost': metrics['lost'],
+        'late': metrics['late'],
+        'stream_dropped': stream.dropped,
+        'cpu_seconds': cpu,
+        'cpu_percent_per_speaker': cpu / elapsed / speakers * 100,
+        'latency_p50_ms': latency.percentile(50) * 1e3,
+        'latency_p99_ms': latency.percentile(99) * 1e3,
+        'loop_lag_p50_ms': _percentile(lags, 50) * 1e3,
+        'loop_lag_p99_ms': _percentile(lags, 99) * 1e3,
+    }
+
+
+def run_crypto_benchmark(mode: str, *, seconds: float = 2.0, frame_size: int = 120) -> Dict[str, Any]:
+    """Builds and encrypts voice packets the way :class:`~discord.VoiceClient`
+    does for one encryption mode and measures how many a single core can
+    build per second.
+
+    Packets are not sent, see :func:`run_voice_benchmark` for that.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    mode: :class:`str`
+        The encryption mode, one of :attr:`VoiceClient.supported_modes <discord.VoiceClient.supported_modes>`.
+    seconds: :class:`float`
+        How long to build packets for.
+    frame_size: :class:`int`
+        The size of every Opus frame in bytes.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    packet = _VoicePacket(mode, list(os.urandom(32)))
+    data = os.urandom(frame_size)
+    pack = packet.pack
+    thread_time = time.thread_time
+
+    packets = 0
+    size = 0
+    sequence = timestamp = 0
+    start = thread_time()
+    while True:
+        # check the clock every so often so it doesn't dominate
+        for _ in range(1000):
+            size = len(pack(sequence, timestamp, 1, data))
+            sequence = (sequence + 1) & 0xFFFF
+            timestamp = (timestamp + OpusEncoder.SAMPLES_PER_FRAME) & 0xFFFFFFFF
+        packets += 1000
+        elapsed = thread_time() - start
+        if elapsed >= seconds:
+            break
+
+    return {
+        'mode': mode,
+        'frame_size': frame_size,
+        'packet_size': size,
+        'packets': packets,
+        'cpu_seconds': elapsed,
+        'packets_per_second': packets / elapsed,
+        'us_per_packet': elapsed / packets * 1e6,
+    }
+
+
+def _time_frames(function: Any, seconds: float) -> float:
+    thread_time = time.thread_time
+    frames = 0
+    start = thread_time()
+    while True:
+        for _ in range(100):
+            function()
+        frames += 100
+        elapsed = thread_time() - start
+        if elapsed >= seconds:
+            return elapsed / frames
+
+
+def run_pcm_benchmark(
+    *, sources: int = 4, seconds: float = 1.0, use_numpy: bool = HAS_NUMPY, use_audioop: bool = HAS_AUDIOOP
+) -> Dict[str, Any]:
+    """Measures the CPU time the PCM transformers take per 20ms frame.
+
+    The operations measured are a volume change, a fading volume change,
+    mixing a number of sources and resampling 44.1KHz stereo and 16KHz mono.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    sources: :class:`int`
+        The number of sources to mix.
+    seconds: :class:`float`
+        How long to repeat every operation for.
+    use_numpy: :class:`bool`
+        Whether NumPy is used, defaults to whether it is installed.
+    use_audioop: :class:`bool`
+        Whether audioop is used when NumPy is not, defaults to whether it
+        can be imported.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    frames = [os.urandom(OpusEncoder.FRAME_SIZE) for _ in range(sources)]
+    mixer = FrameMixer(use_numpy=use_numpy, use_audioop=use_audioop)
+    stereo = Resampler(44100, 2, use_numpy=use_numpy, use_audioop=use_audioop)
+    mono = Resampler(16000, 1, use_numpy=use_numpy, use_audioop=use_audioop)
+    stereo_frame = os.urandom(stereo.frame_size)
+    mono_frame = os.urandom(mono.frame_size)
+
+    operations = {
+        'volume': lambda: mixer.mix(frames[:1], ((0.5, 0.5),)),
+        'fade': lambda: mixer.mix(frames[:1], ((0.5, 1.0),)),
+        'mix': lambda: mixer.mix(frames, [(0.5, 0.5)] * sources),
+        'resample_44100_stereo': lambda: stereo.convert(stereo_frame),
+        'resample_16000_mono': lambda: mono.convert(mono_frame),
+    }
+    report: Dict[str, Any] = {'numpy': use_numpy, 'audioop': mixer.use_audioop, 'sources': sources}
+    for name, function in operations.items():
+        report[f'{name}_us'] = _time_frames(function, seconds) * 1e6
+    return report
+
+
+def _stringview_arguments(arguments: int) -> str:
+    # plain words, quoted phrases, escaped quotes and non-ASCII quotes, in
+    # roughly the mix a command with free form arguments gets
+    parts = []
+    for index in range(arguments):
+        kind = index % 4
+        if kind == 0:
+            parts.append(f'word{index}')
+        elif kind == 1:
+            parts.append(f'"a quoted argument number {index}"')
+        elif kind == 2:
+            parts.append(f'"with \\"escaped\\" quotes {index}"')
+        else:
+            parts.append(f'«guillemets {index}»')
+    return ' '.join(parts)
+
+
+def run_stringview_benchmark(*, arguments: int = 2000, seconds: float = 1.0) -> Dict[str, Any]:
+    """Measures how long :class:`~discord.ext.commands.view.StringView`
+    takes to split a long message into its arguments.
+
+    Every argument is read once, and once more after rewinding to its start
+    the way the argument parser does when a converter fails.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    arguments: :class:`int`
+        The number of arguments in the message, a mix of plain words,
+        quoted phrases and escaped quotes.
+    seconds: :class:`float`
+        How long to repeat every operation for.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    # importing the commands extension isn't free, only do it when needed
+    from ..ext.commands.view import StringView
+
+    content = _stringview_arguments(arguments)
+
+    def parse() -> None:
+        view = StringView(content)
+        while not view.eof:
+            view.skip_ws()
+            view.get_quoted_word()
+
+    def reparse() -> None:
+        view = StringView(content)
+        while not view.eof:
+            view.skip_ws()
+            start = view.index
+            view.get_quoted_word()
+            view.index = start
+            view.get_quoted_word()
+
+    parse_time = _time_frames(parse, seconds)
+    reparse_time = _time_frames(reparse, seconds)
+    return {
+        'arguments': arguments,
+        'characters': len(content),
+        'parse_ms': parse_time * 1e3,
+        'parse_us_per_argument': parse_time / arguments * 1e6,
+        'reparse_ms': reparse_time * 1e3,
+    }
+
+
+class _BenchInteraction:
+    # just enough of an Interaction for a view to dispatch to a button
+    class _Response:
+        _responded = True
+
+    class _Message:
+        def __init__(self, id: int) -> None:
+            self.id: int = id
+
+    def __init__(self, message_id: int) -> None:
+        self.message: _BenchInteraction._Message = self._Message(message_id)
+        self.response: _BenchInteraction._Response = self._Response()
+
+
+async def run_views_benchmark(views: int, *, dispatches: int = 10000, timeout: float = 600.0) -> Dict[str, Any]:
+    """|coro|
+
+    Adds a number of live views with one button each to a view store and
+    measures how long adding, dispatching to and stopping them takes, and
+    how many tasks are kept alive for them meanwhile.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    views: :class:`int`
+        The number of views, each tracked on its own message.
+    dispatches: :class:`int`
+        The number of interactions to dispatch, spread over the views.
+    timeout: :class:`float`
+        The timeout of every view. It doesn't pass during the benchmark.
+
+    Returns
+    --------
+    Dict[:class:`str`, Any]
+        The results, suitable for serialising to JSON.
+    """
+    perf_counter = time.perf_counter
+    store = ViewStore(None)  # type: ignore
+    created: List[View] = []
+    for index in range(views):
+        view = View(timeout=timeout)
+        view.add_item(Button(label='Go', custom_id=f'button-{index}'))
+        created.append(view)
+
+    tasks = len(asyncio.all_tasks())
+    start = perf_counter()
+    for index, view in enumerate(created):
+        store.add_view(view, index)
+    add = perf_counter() - start
+    tasks_alive = len(asyncio.all_tasks()) - tasks
+
+    interactions = [_BenchInteraction(index * views // dispatches) for index in range(dispatches)]
+    component_type = created[0].children[0].type.value
+    start = perf_counter()
+    for index, interaction in enumerate(interactions):
+        store.dispatch(component_type, f'button-{interaction.message.id}', interaction)  # type: ignore
+    dispatch = perf_counter() - start
+    # let the callbacks run
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    start = perf_counter()
+    for view in created:
+        view.stop()
+    stop = perf_counter() - start
+
+    return {
+        'views': views,
+        'dispatches': dispatches,
+        'add_seconds': add,
+        'add_us_per_view': add / views * 1e6,
+        'dispatch_us': dispatch / dispatches * 1e6,
+        'stop_us': stop / views * 1e6,
+        'tasks_alive': tasks_alive,
+        'keys_left': len(store._views),
+    }
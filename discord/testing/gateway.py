@@ -0,0 +1,562 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import aiohttp
+from aiohttp import web
+
+from .. import utils
+from ..gateway import DiscordWebSocket
+from ..journal import EventJournal
+
+if TYPE_CHECKING:
+    from ..client import Client
+
+__all__ = (
+    'FakeGateway',
+    'SyntheticStream',
+)
+
+_log = logging.getLogger(__name__)
+
+_Frame = Union[Dict[str, Any], str, bytes]
+
+_DISPATCH = DiscordWebSocket.DISPATCH
+_HEARTBEAT = DiscordWebSocket.HEARTBEAT
+_IDENTIFY = DiscordWebSocket.IDENTIFY
+_RESUME = DiscordWebSocket.RESUME
+_HELLO = DiscordWebSocket.HELLO
+_HEARTBEAT_ACK = DiscordWebSocket.HEARTBEAT_ACK
+
+_BOT_ID = 1 << 22
+_GUILD_BASE = 1 << 40
+_CHANNEL_BASE = 2 << 40
+_ROLE_BASE = 3 << 40
+_USER_BASE = 4 << 40
+_MESSAGE_BASE = 5 << 40
+
+
+def _user(user_id: int, *, bot: bool = False) -> Dict[str, Any]:
+    return {
+        'id': str(user_id),
+        'username': f'user{user_id & 0xFFFF}',
+        'discriminator': f'{user_id % 10000:04d}',
+        'avatar': None,
+        'bot': bot,
+    }
+
+
+def _guild(index: int, members: int, channels: int, roles: int) -> Dict[str, Any]:
+    guild_id = _GUILD_BASE + (index << 22)
+    return {
+        'id': str(guild_id),
+        'name': f'Guild {index}',
+        'icon': None,
+        'owner_id': str(_BOT_ID),
+        'region': 'us-east',
+        'afk_timeout': 300,
+        'verification_level': 0,
+        'default_message_notifications': 0,
+        'explicit_content_filter': 0,
+        'mfa_level': 0,
+        'premium_tier': 0,
+        'nsfw_level': 0,
+        'system_channel_flags': 0,
+        'preferred_locale': 'en-US',
+        'features': [],
+        'emojis': [],
+        'stickers': [],
+        'threads': [],
+        'voice_states': [],
+        'presences': [],
+        'large': members > 250,
+        'member_count': members + 1,
+        'roles': [
+            {
+                'id': str(guild_id if n == 0 else _ROLE_BASE + index * roles + n),
+                'name': '@everyone' if n == 0 else f'role{n}',
+                'permissions': '104324673',
+                'position': n,
+                'color': 0,
+                'hoist': False,
+                'managed': False,
+                'mentionable': False,
+            }
+            for n in range(roles)
+        ],
+        'channels': [
+            {
+                'id': str(_CHANNEL_BASE + index * channels + n),
+                'type': 0,
+                'name': f'channel-{n}',
+                'position': n,
+                'permission_overwrites': [],
+                'nsfw': False,
+                'topic': None,
+                'last_message_id': None,
+            }
+            for n in range(channels)
+        ],
+        'members': [
+            {
+                'user': _user(_BOT_ID if n == 0 else _USER_BASE + index * members + n, bot=n == 0),
+                'roles': [],
+                'joined_at': '2021-01-01T00:00:00+00:00',
+                'deaf': False,
+                'mute': False,
+            }
+            for n in range(members + 1)
+        ],
+    }
+
+
+def _on_shard(guild_id: Union[str, int], shard: Tuple[int, int]) -> bool:
+    return (int(guild_id) >> 22) % shard[1] == shard[0]
+
+
+def _belongs(name: Optional[str], data: Any, shard: Tuple[int, int]) -> bool:
+    if not isinstance(data, dict):
+        return True
+    guild_id = data.get('guild_id')
+    if guild_id is None and name in ('GUILD_CREATE', 'GUILD_UPDATE', 'GUILD_DELETE'):
+        guild_id = data.get('id')
+    if guild_id is None:
+        # direct messages are only sent to the first shard
+        return shard[0] == 0
+    return _on_shard(guild_id, shard)
+
+
+def _session_shard(session_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    # sharded sessions handed out by FakeGateway are named fake-<shard_id>-<shard_count>
+    if not session_id or not session_id.startswith('fake-'):
+        return None
+    try:
+        shard_id, shard_count = session_id[5:].split('-')
+        return int(shard_id), int(shard_count)
+    except ValueError:
+        return None
+
+
+class SyntheticStream:
+    """A generated stream of gateway dispatches resembling a bot starting up.
+
+    The stream consists of a ``READY`` with every guild marked unavailable,
+    a ``GUILD_CREATE`` per guild and finally ``MESSAGE_CREATE`` events spread
+    over those guilds. The payloads are generated lazily, so the stream can be
+    iterated over multiple times without being kept in memory.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    guilds: :class:`int`
+        The number of guilds.
+    members: :class:`int`
+        The number of members per guild besides the bot itself.
+    channels: :class:`int`
+        The number of text channels per guild.
+    roles: :class:`int`
+        The number of roles per guild, including the default role.
+    messages: :class:`int`
+        The number of messages sent after every guild has been created.
+    """
+
+    def __init__(
+        self,
+        *,
+        guilds: int,
+        members: int = 10,
+        channels: int = 5,
+        roles: int = 3,
+        messages: int = 0,
+    ) -> None:
+        self.guilds: int = guilds
+        self.members: int = members
+        self.channels: int = max(channels, 1)
+        self.roles: int = max(roles, 1)
+        self.messages: int = messages
+
+    def __len__(self) -> int:
+        return 1 + self.guilds + self.messages
+
+    def __repr__(self) -> str:
+        return (
+            f'<SyntheticStream guilds={self.guilds} members={self.members} '
+            f'channels={self.channels} messages={self.messages}>'
+        )
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        yield {
+            't': 'READY',
+            'd': {
+                'v': 9,
+                'session_id': 'synthetic',
+                'user': _user(_BOT_ID, bot=True),
+                'guilds': [{'id': str(_GUILD_BASE + (index << 22)), 'unavailable': True} for index in range(self.guilds)],
+                'application': {'id': str(_BOT_ID), 'flags': 0},
+                '_trace': ['fake-gateway'],
+            },
+        }
+
+        for index in range(self.guilds):
+            yield {'t': 'GUILD_CREATE', 'd': _guild(index, self.members, self.channels, self.roles)}
+
+        guilds = max(self.guilds, 1)
+        for n in range(self.messages):
+            index = n % guilds
+            yield {
+                't': 'MESSAGE_CREATE',
+                'd': {
+                    'id': str(_MESSAGE_BASE + n),
+                    'channel_id': str(_CHANNEL_BASE + index * self.channels),
+                    'guild_id': str(_GUILD_BASE + (index << 22)),
+                    'author': _user(_USER_BASE + index * self.members + 1),
+                    'member': {'roles': [], 'joined_at': '2021-01-01T00:00:00+00:00', 'deaf': False, 'mute': False},
+                    'content': f'message {n}',
+                    'timestamp': '2021-01-01T00:00:00+00:00',
+                    'edited_timestamp': None,
+                    'tts': False,
+                    'mention_everyone': False,
+                    'mentions': [],
+                    'mention_roles': [],
+                    'attachments': [],
+                    'embeds': [],
+                    'pinned': False,
+                    'type': 0,
+                },
+            }
+
+
+class _Connection:
+    __slots__ = ('ws', 'compressor', 'lock', 'shard', 'sequence', 'live', 'pending')
+
+    def __init__(self, ws: web.WebSocketResponse, compress: bool) -> None:
+        self.ws: web.WebSocketResponse = ws
+        self.compressor: Optional[Any] = zlib.compressobj() if compress else None
+        # the compressed stream has to be sent in the order it was produced
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.shard: Optional[Tuple[int, int]] = None
+        self.sequence: int = 0
+        # events dispatched while the initial stream is still being sent
+        self.live: bool = False
+        self.pending: List[Tuple[str, Any]] = []
+
+    async def send(self, frame: bytes) -> None:
+        async with self.lock:
+            if self.compressor is None:
+                await self.ws.send_str(frame.decode('utf-8'))
+            else:
+                await self.ws.send_bytes(self.compressor.compress(frame) + self.compressor.flush(zlib.Z_SYNC_FLUSH))
+
+
+class FakeGateway:
+    """A local stand-in for the Discord gateway.
+
+    The server speaks just enough of the gateway protocol for a
+    :class:`~discord.Client` to connect to it: it sends HELLO, answers
+    heartbeats, streams its events after an IDENTIFY and replays the events
+    that were missed after a RESUME, followed by ``RESUMED``. The transport
+    is compressed when the client asks for ``zlib-stream``.
+
+    Events can be dictionaries with the ``t`` and ``d`` keys, which are
+    numbered in order, or raw JSON frames as recorded from Discord, which keep
+    their own sequence number. An :class:`~discord.EventJournal` replays every
+    frame it retains. If the events do not start with a ``READY``, a minimal
+    one is sent first. A shard that identifies only receives the guilds and
+    events that belong to it. More events can be sent to the connected
+    sessions with :meth:`dispatch`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    events: Union[Iterable[Union[:class:`dict`, :class:`str`, :class:`bytes`]], :class:`~discord.EventJournal`]
+        The events to stream to every client that identifies. Iterators are
+        materialised, any other iterable is iterated again per connection.
+    heartbeat_interval: :class:`float`
+        The heartbeat interval in milliseconds sent in HELLO.
+
+    Attributes
+    -----------
+    identifies: :class:`int`
+        The number of IDENTIFY payloads received.
+    resumes: :class:`int`
+        The number of RESUME payloads received.
+    frames_sent: :class:`int`
+        The number of dispatch frames sent.
+    """
+
+    def __init__(
+        self,
+        events: Union[Iterable[_Frame], EventJournal] = (),
+        *,
+        heartbeat_interval: float = 41250.0,
+    ) -> None:
+        if isinstance(events, EventJournal):
+            events = [record.frame for record in events.replay(all_shards=True)]
+        elif iter(events) is events:
+            events = list(events)
+
+        self.events: Iterable[_Frame] = events
+        self.heartbeat_interval: float = heartbeat_interval
+        self.identifies: int = 0
+        self.resumes: int = 0
+        self.frames_sent: int = 0
+
+        self._runner: Optional[web.AppRunner] = None
+        self._url: Optional[str] = None
+        self._sockets: List[web.WebSocketResponse] = []
+        self._connections: List[_Connection] = []
+
+    async def __aenter__(self) -> FakeGateway:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """:class:`str`: The websocket URL of the running server, without query parameters."""
+        if self._url is None:
+            raise RuntimeError('FakeGateway has not been started')
+        return self._url
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        """Starts listening for connections.
+
+        Parameters
+        -----------
+        host: :class:`str`
+            The interface to bind to.
+        port: :class:`int`
+            The port to bind to. ``0`` picks a free port.
+        """
+        app = web.Application()
+        app.router.add_get('/', self._handle)
+        self._runner = runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_host, bound_port = runner.addresses[0][:2]
+        self._url = f'ws://{bound_host}:{bound_port}/'
+
+    async def close(self) -> None:
+        """Closes every connection and stops the server."""
+        for ws in self._sockets:
+            await ws.close()
+        self._sockets.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def connect(
+        self,
+        client: Client,
+        *,
+        shard_id: Optional[int] = None,
+        compress: bool = True,
+        token: str = 'fake-token',
+    ) -> DiscordWebSocket:
+        """Connects a client to this server without going through the REST API.
+
+        The returned websocket has sent its IDENTIFY; events are processed
+        as :meth:`DiscordWebSocket.poll_event` is called.
+
+        Parameters
+        -----------
+        client: :class:`~discord.Client`
+            The client to connect.
+        shard_id: Optional[:class:`int`]
+            The shard ID to identify as.
+        compress: :class:`bool`
+            Whether to request ``zlib-stream`` transport compression.
+        token: :class:`str`
+            The token sent in IDENTIFY.
+        """
+        query = '?encoding=json&v=9&compress=zlib-stream' if compress else '?encoding=json&v=9'
+        client.http.token = token
+        client.http.recreate()
+        ws = await DiscordWebSocket.from_client(client, initial=True, gateway=self.url + query, shard_id=shard_id)
+        client.ws = ws
+        return ws
+
+    async def dispatch(self, event: str, data: Any) -> int:
+        """Sends an event to every session it belongs to.
+
+        Sessions that are still receiving their initial events get it once
+        those are sent. Dispatched events are not replayed after a RESUME.
+
+        Parameters
+        -----------
+        event: :class:`str`
+            The event name, e.g. ``MESSAGE_CREATE``.
+        data: Any
+            The event data.
+
+        Returns
+        --------
+        :class:`int`
+            The number of sessions the event was sent to.
+        """
+        count = 0
+        for conn in list(self._connections):
+            if conn.ws.closed or (conn.shard is not None and not _belongs(event, data, conn.shard)):
+                continue
+            count += 1
+            if conn.live:
+                await self._send_event(conn, event, data)
+            else:
+                conn.pending.append((event, data))
+        return count
+
+    async def _send_event(self, conn: _Connection, event: str, data: Any) -> None:
+        conn.sequence += 1
+        frame = {'op': _DISPATCH, 's': conn.sequence, 't': event, 'd': data}
+        await conn.send(utils._to_json(frame).encode('utf-8'))
+        self.frames_sent += 1
+
+    def _frames(self, shard: Optional[Tuple[int, int]] = None, after: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        sequence = 0
+        first = True
+        for event in self.events:
+            if isinstance(event, dict):
+                frame = None
+                name = event.get('t')
+                data = event.get('d')
+                recorded = None
+            else:
+                frame = event.encode('utf-8') if isinstance(event, str) else bytes(event)
+                payload = utils._from_json(frame)
+                name = payload.get('t')
+                data = payload.get('d')
+                recorded = payload.get('s')
+
+            if first:
+                first = False
+                if name != 'READY':
+                    ready = {
+                        'v': 9,
+                        'session_id': 'synthetic',
+                        'user': _user(_BOT_ID, bot=True),
+                        'guilds': [],
+                        'application': {'id': str(_BOT_ID), 'flags': 0},
+                    }
+                    if shard is not None:
+                        ready['session_id'] = f'fake-{shard[0]}-{shard[1]}'
+                    if after is None:
+                        yield 0, utils._to_json({'op': _DISPATCH, 's': 0, 't': 'READY', 'd': ready}).encode('utf-8')
+
+            if shard is not None:
+                if name == 'READY':
+                    guilds = [guild for guild in data['guilds'] if _on_shard(guild['id'], shard)]
+                    data = dict(data, guilds=guilds, session_id=f'fake-{shard[0]}-{shard[1]}')
+                    frame = None
+                elif not _belongs(name, data, shard):
+                    continue
+
+            sequence = recorded or sequence + 1
+            if after is not None and sequence <= after:
+                continue
+
+            if frame is None:
+                frame = utils._to_json({'op': _DISPATCH, 's': sequence, 't': name, 'd': data}).encode('utf-8')
+            yield sequence, frame
+
+    async def _stream(
+        self, conn: _Connection, shard: Optional[Tuple[int, int]] = None, after: Optional[int] = None
+    ) -> None:
+        last = after or 0
+        count = 0
+        for sequence, frame in self._frames(shard, after):
+            if conn.ws.closed:
+                return
+            await conn.send(frame)
+            conn.sequence = last = sequence
+            count += 1
+            self.frames_sent += 1
+            # let the heartbeat handling and the client breathe
+            if count % 64 == 0:
+                await asyncio.sleep(0)
+
+        if after is not None and not conn.ws.closed:
+            conn.sequence = last + 1
+            resumed = {'op': _DISPATCH, 's': conn.sequence, 't': 'RESUMED', 'd': {'_trace': ['fake-gateway']}}
+            await conn.send(utils._to_json(resumed).encode('utf-8'))
+
+        while conn.pending and not conn.ws.closed:
+            event, data = conn.pending.pop(0)
+            await self._send_event(conn, event, data)
+        conn.live = True
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._sockets.append(ws)
+
+        conn = _Connection(ws, request.query.get('compress') == 'zlib-stream')
+        hello = {'op': _HELLO, 'd': {'heartbeat_interval': self.heartbeat_interval}}
+        await conn.send(utils._to_json(hello).encode('utf-8'))
+
+        stream: Optional[asyncio.Task] = None
+        try:
+            async for msg in ws:
+                if msg.type is not aiohttp.WSMsgType.TEXT:
+                    continue
+
+                payload = utils._from_json(msg.data)
+                op = payload.get('op')
+                if op == _HEARTBEAT:
+                    await conn.send(utils._to_json({'op': _HEARTBEAT_ACK}).encode('utf-8'))
+                elif op == _IDENTIFY and stream is None:
+                    self.identifies += 1
+                    shard = payload['d'].get('shard')
+                    conn.shard = tuple(shard) if shard else None
+                    self._connections.append(conn)
+                    stream = asyncio.create_task(self._stream(conn, conn.shard))
+                elif op == _RESUME and stream is None:
+                    self.resumes += 1
+                    sequence = payload['d'].get('seq') or 0
+                    conn.shard = _session_shard(payload['d'].get('session_id'))
+                    self._connections.append(conn)
+                    stream = asyncio.create_task(self._stream(conn, conn.shard, sequence))
+        finally:
+            if stream is not None and not stream.done():
+                stream.cancel()
+            try:
+                self._sockets.remove(ws)
+            except ValueError:
+                pass
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                pass
+
+        return ws
@@ -0,0 +1,371 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import time
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+from aiohttp import web
+
+from .. import utils
+
+if TYPE_CHECKING:
+    from ..http import HTTPClient
+
+__all__ = (
+    'FakeAPI',
+)
+
+# the IDs that make up the major parameters of a bucket
+_MAJOR_RESOURCES = frozenset(('channels', 'guilds', 'webhooks'))
+
+# (method, route template) -> (limit, window in seconds), roughly what Discord hands out
+_DEFAULT_LIMITS: Dict[Tuple[str, str], Tuple[int, float]] = {
+    ('POST', '/channels/{channel_id}/messages'): (5, 5.0),
+    ('PATCH', '/channels/{channel_id}/messages/{id}'): (5, 5.0),
+    ('DELETE', '/channels/{channel_id}/messages/{id}'): (5, 1.0),
+    ('PUT', '/channels/{channel_id}/messages/{id}/reactions/{emoji}/@me'): (1, 0.25),
+    ('DELETE', '/channels/{channel_id}/messages/{id}/reactions/{emoji}/@me'): (1, 0.25),
+}
+_DEFAULT_LIMIT: Tuple[int, float] = (10, 10.0)
+
+_BOT_USER: Dict[str, Any] = {
+    'id': str(1 << 22),
+    'username': 'FakeBot',
+    'discriminator': '0000',
+    'avatar': None,
+    'bot': True,
+}
+
+
+def _template(path: str) -> Tuple[str, str]:
+    # returns the route template and the major parameters of a request path
+    parts = path.strip('/').split('/')
+    template = []
+    major = []
+    previous = ''
+    for part in parts:
+        if previous == 'reactions' and part != '@me':
+            template.append('{emoji}')
+        elif part.isdigit():
+            if previous in _MAJOR_RESOURCES:
+                template.append('{' + previous[:-1] + '_id}')
+                major.append(part)
+            else:
+                template.append('{id}')
+        else:
+            template.append(part)
+        previous = part
+    return '/' + '/'.join(template), ':'.join(major)
+
+
+class _Bucket:
+    __slots__ = ('limit', 'window', 'remaining', 'reset_at')
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit: int = limit
+        self.window: float = window
+        self.remaining: int = limit
+        self.reset_at: float = 0.0
+
+
+class FakeAPI:
+    """A local stand-in for the Discord REST API.
+
+    Every route is answered, with canned payloads for the common ones, and
+    rate limited the way Discord does it: each route template has a limit
+    per window shared by requests with the same major parameters, reported
+    through the ``X-RateLimit-*`` headers along with a bucket hash. Going
+    past a bucket or the global limit is answered with a ``429``. Responses
+    carry a ``Via`` header unless ``via`` is ``False``, which is how the
+    library tells a rate limit from a Cloudflare ban.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    limits: Optional[Dict[Tuple[:class:`str`, :class:`str`], Tuple[:class:`int`, :class:`float`]]]
+        Overrides the limit and window of routes, keyed by the method and the
+        route template, e.g. ``('POST', '/channels/{channel_id}/messages')``.
+        Non-major IDs in templates are written as ``{id}``.
+    global_limit: :class:`int`
+        The number of requests allowed per second across every route.
+    time_scale: :class:`float`
+        A factor applied to every window, to run rate limits faster than
+        real time.
+    latency: :class:`float`
+        The number of seconds every response is delayed by.
+    via: :class:`bool`
+        Whether to send the ``Via`` header.
+    gateway_url: Optional[:class:`str`]
+        The URL returned by the gateway endpoints.
+    shards: :class:`int`
+        The recommended shard count returned by ``/gateway/bot``.
+    max_concurrency: :class:`int`
+        The ``max_concurrency`` returned by ``/gateway/bot``.
+
+    Attributes
+    -----------
+    requests: :class:`int`
+        The number of requests received.
+    rate_limited: :class:`int`
+        The number of requests answered with a bucket ``429``.
+    global_rate_limited: :class:`int`
+        The number of requests answered with a global ``429``.
+    statuses: Dict[:class:`int`, :class:`int`]
+        The number of responses per status code.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: Optional[Dict[Tuple[str, str], Tuple[int, float]]] = None,
+        global_limit: int = 50,
+        time_scale: float = 1.0,
+        latency: float = 0.0,
+        via: bool = True,
+        gateway_url: Optional[str] = None,
+        shards: int = 1,
+        max_concurrency: int = 1,
+    ) -> None:
+        self.limits: Dict[Tuple[str, str], Tuple[int, float]] = dict(_DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.global_limit: int = global_limit
+        self.time_scale: float = time_scale
+        self.latency: float = latency
+        self.via: bool = via
+        self.gateway_url: Optional[str] = gateway_url
+        self.shards: int = shards
+        self.max_concurrency: int = max_concurrency
+
+        self.requests: int = 0
+        self.rate_limited: int = 0
+        self.global_rate_limited: int = 0
+        self.statuses: Dict[int, int] = {}
+
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global_count: int = 0
+        self._global_reset: float = 0.0
+        self._ids = itertools.count(1 << 42)
+        self._runner: Optional[web.AppRunner] = None
+        self._url: Optional[str] = None
+
+    async def __aenter__(self) -> FakeAPI:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """:class:`str`: The API base URL of the running server."""
+        if self._url is None:
+            raise RuntimeError('FakeAPI has not been started')
+        return self._url
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        """Starts listening for requests.
+
+        Parameters
+        -----------
+        host: :class:`str`
+            The interface to bind to.
+        port: :class:`int`
+            The port to bind to. ``0`` picks a free port.
+        """
+        app = web.Application()
+        app.router.add_route('*', '/api/{version}/{path:.*}', self._handle)
+        self._runner = runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_host, bound_port = runner.addresses[0][:2]
+        self._url = f'http://{bound_host}:{bound_port}/api/v8'
+
+    async def close(self) -> None:
+        """Stops the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def connect(self, http: HTTPClient, *, token: str = 'fake-token') -> None:
+        """Points an :class:`HTTPClient` at this server.
+
+        Parameters
+        -----------
+        http: :class:`HTTPClient`
+            The HTTP client, e.g. :attr:`Client.http <discord.Client.http>`.
+        token: :class:`str`
+            The token to authorise with.
+        """
+        http.api_base = self.url
+        http.token = token
+        http.recreate()
+
+    def bucket_hash(self, method: str, template: str) -> str:
+        """Returns the bucket hash sent for a route template.
+
+        Parameters
+        -----------
+        method: :class:`str`
+            The HTTP method.
+        template: :class:`str`
+            The route template.
+
+        Returns
+        --------
+        :class:`str`
+            The bucket hash.
+        """
+        return hashlib.md5(f'{method} {template}'.encode('utf-8')).hexdigest()[:16]
+
+    def _respond(self, status: int, payload: Any, headers: Dict[str, str]) -> web.Response:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if self.via:
+            headers['Via'] = '1.1 google'
+        if payload is None:
+            return web.Response(status=status, headers=headers)
+        # Discord sends the bare content type, which is what the library checks for
+        headers['Content-Type'] = 'application/json'
+        return web.Response(status=status, body=utils._to_json(payload).encode('utf-8'), headers=headers)
+
+    def _payload(self, method: str, template: str, request: web.Request, body: Any) -> Tuple[int, Any]:
+        if template.startswith('/gateway'):
+            url = self.gateway_url or self.url.replace('http', 'ws', 1)
+            if template == '/gateway/bot':
+                limit = {'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': self.max_concurrency}
+                return 200, {'url': url, 'shards': self.shards, 'session_start_limit': limit}
+            return 200, {'url': url}
+
+        if template == '/users/@me':
+            return 200, _BOT_USER
+
+        if template.startswith('/channels/{channel_id}/messages') and '/reactions/' not in template:
+            if method == 'DELETE':
+                return 204, None
+
+            parts = request.match_info['path'].split('/')
+            body = body if isinstance(body, dict) else {}
+            message_id = parts[3] if len(parts) > 3 else str(next(self._ids))
+            return 200, {
+                'id': message_id,
+                'channel_id': parts[1],
+                'author': _BOT_USER,
+                'content': body.get('content') or '',
+                'timestamp': '2021-01-01T00:00:00+00:00',
+                'edited_timestamp': None if method == 'POST' else '2021-01-01T00:00:00+00:00',
+                'tts': False,
+                'mention_everyone': False,
+                'mentions': [],
+                'mention_roles': [],
+                'attachments': [],
+                'embeds': body.get('embeds') or [],
+                'pinned': False,
+                'type': 0,
+            }
+
+        if method in ('PUT', 'DELETE'):
+            return 204, None
+        return 200, body if isinstance(body, dict) else {}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        method = request.method
+        template, major = _template(request.match_info['path'])
+        now = time.time()
+        headers: Dict[str, str] = {}
+
+        if now >= self._global_reset:
+            self._global_reset = now + self.time_scale
+            self._global_count = 0
+
+        self._global_count += 1
+        if self._global_count > self.global_limit:
+            self.global_rate_limited += 1
+            retry_after = round(self._global_reset - now, 3)
+            headers['X-RateLimit-Global'] = 'true'
+            headers['X-RateLimit-Scope'] = 'global'
+            headers['Retry-After'] = str(max(int(retry_after), 1))
+            payload = {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': True}
+            return self._respond(429, payload, headers)
+
+        limit, window = self.limits.get((method, template), _DEFAULT_LIMIT)
+        window *= self.time_scale
+        key = (f'{method} {template}', major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(limit, window)
+
+        if now >= bucket.reset_at:
+            bucket.remaining = bucket.limit
+            bucket.reset_at = now + bucket.window
+
+        reset_after = round(bucket.reset_at - now, 3)
+        headers['X-RateLimit-Limit'] = str(bucket.limit)
+        headers['X-RateLimit-Reset'] = f'{bucket.reset_at:.3f}'
+        headers['X-RateLimit-Reset-After'] = str(reset_after)
+        headers['X-RateLimit-Bucket'] = self.bucket_hash(method, template)
+
+        if bucket.remaining == 0:
+            self.rate_limited += 1
+            headers['X-RateLimit-Remaining'] = '0'
+            headers['X-RateLimit-Scope'] = 'user'
+            headers['Retry-After'] = str(max(int(reset_after), 1))
+            payload = {'message': 'You are being rate limited.', 'retry_after': reset_after, 'global': False}
+            return self._respond(429, payload, headers)
+
+        bucket.remaining -= 1
+        headers['X-RateLimit-Remaining'] = str(bucket.remaining)
+
+        body: Any = None
+        if request.can_read_body and request.content_type == 'application/json':
+            body = await request.json(loads=utils._from_json)
+
+        status, payload = self._payload(method, template, request, body)
+        return self._respond(status, payload, headers)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the server side counters.
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The counters, suitable for serialising to JSON.
+        """
+        return {
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+            'global_rate_limited': self.global_rate_limited,
+            'statuses': dict(self.statuses),
+            'buckets': len(self._buckets),
+        }
@@ -0,0 +1,290 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..voice_client import _VoicePacket
+
+__all__ = (
+    'UDPSink',
+    'VoicePacketGenerator',
+)
+
+_RTP_HEADER = struct.Struct('>BBHII')
+_CLOCK_RATE = 48000
+
+
+class _Stream:
+    __slots__ = ('packets', 'bytes', 'lost', 'sequence', 'transit', 'jitter')
+
+    def __init__(self) -> None:
+        self.packets: int = 0
+        self.bytes: int = 0
+        self.lost: int = 0
+        self.sequence: Optional[int] = None
+        self.transit: Optional[float] = None
+        self.jitter: float = 0.0
+
+
+class UDPSink:
+    """A local UDP endpoint that receives RTP voice packets.
+
+    Packets are counted per SSRC, gaps in the sequence numbers are counted
+    as lost and the interarrival jitter is estimated as described in
+    :rfc:`3550`. The payload is never decrypted.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    host: :class:`str`
+        The interface to bind to.
+    port: :class:`int`
+        The port to bind to. ``0`` picks a free port.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self._socket.bind((host, port))
+        self._socket.settimeout(0.1)
+        self._streams: Dict[int, _Stream] = {}
+        self._closed: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> UDPSink:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Tuple[:class:`str`, :class:`int`]: The address packets should be sent to."""
+        return self._socket.getsockname()
+
+    def start(self) -> None:
+        """Starts receiving packets in a background thread."""
+        self._thread = threading.Thread(target=self._run, name='discord-udp-sink', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops receiving packets and closes the socket."""
+        self._closed = True
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._socket.close()
+
+    def _run(self) -> None:
+        recv = self._socket.recv
+        streams = self._streams
+        unpack = _RTP_HEADER.unpack_from
+        perf_counter = time.perf_counter
+        while not self._closed:
+            try:
+                packet = recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            if len(packet) < 12:
+                continue
+
+            arrival = perf_counter()
+            _, _, sequence, timestamp, ssrc = unpack(packet)
+            try:
+                stream = streams[ssrc]
+            except KeyError:
+                stream = streams[ssrc] = _Stream()
+
+            stream.packets += 1
+            stream.bytes += len(packet)
+            if stream.sequence is not None:
+                gap = (sequence - stream.sequence) & 0xFFFF
+                if 1 < gap < 0x8000:
+                    stream.lost += gap - 1
+            stream.sequence = sequence
+
+            transit = arrival - timestamp / _CLOCK_RATE
+            if stream.transit is not None:
+                stream.jitter += (abs(transit - stream.transit) - stream.jitter) / 16
+            stream.transit = transit
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns what was received so far.
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The number of streams, packets, bytes and lost packets, and the
+            mean and maximum interarrival jitter of the streams in seconds.
+        """
+        streams = list(self._streams.values())
+        jitters = [stream.jitter for stream in streams]
+        return {
+            'streams': len(streams),
+            'packets': sum(stream.packets for stream in streams),
+            'bytes': sum(stream.bytes for stream in streams),
+            'lost': sum(stream.lost for stream in streams),
+            'jitter_mean': sum(jitters) / len(jitters) if jitters else 0.0,
+            'jitter_max': max(jitters, default=0.0),
+        }
+
+
+class _Source:
+    __slots__ = ('sequence', 'timestamp', 'held')
+
+    def __init__(self) -> None:
+        self.sequence: int = 0
+        self.timestamp: int = 0
+        self.held: Optional[bytes] = None
+
+
+class VoicePacketGenerator:
+    """Sends encrypted RTP voice packets to a local address, the way a voice
+    server relays the audio of other users.
+
+    Every SSRC gets its own sequence numbers and timestamps. Packets can be
+    dropped or swapped with the next packet of the same SSRC at random to
+    exercise the receiving side.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    address: Tuple[:class:`str`, :class:`int`]
+        The address to send packets to.
+    mode: :class:`str`
+        The encryption mode, one of :attr:`VoiceClient.supported_modes <discord.VoiceClient.supported_modes>`.
+    secret_key: Optional[List[:class:`int`]]
+        The key to encrypt packets with. A random one is used if not given.
+    loss: :class:`float`
+        The chance of a packet being dropped, from 0 to 1.
+    reorder: :class:`float`
+        The chance of a packet being sent after the next one, from 0 to 1.
+    seed: Optional[:class:`int`]
+        Seeds the random drops and swaps.
+
+    Attributes
+    -----------
+    secret_key: List[:class:`int`]
+        The key packets are encrypted with.
+    sent: :class:`int`
+        The number of packets sent.
+    dropped: :class:`int`
+        The number of packets dropped on purpose.
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        *,
+        mode: str = 'xsalsa20_poly1305_lite',
+        secret_key: Optional[List[int]] = None,
+        loss: float = 0.0,
+        reorder: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.address: Tuple[str, int] = address
+        self.mode: str = mode
+        self.secret_key: List[int] = list(os.urandom(32)) if secret_key is None else secret_key
+        self.loss: float = loss
+        self.reorder: float = reorder
+        self.sent: int = 0
+        self.dropped: int = 0
+        self._random: random.Random = random.Random(seed)
+        self._packet: _VoicePacket = _VoicePacket(mode, self.secret_key)
+        self._sources: Dict[int, _Source] = {}
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __enter__(self) -> VoicePacketGenerator:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def send(self, ssrc: int, data: bytes) -> int:
+        """Sends the next packet of an SSRC.
+
+        Parameters
+        -----------
+        ssrc: :class:`int`
+            The synchronisation source to send as.
+        data: :class:`bytes`
+            The Opus packet to send.
+
+        Returns
+        --------
+        :class:`int`
+            The sequence number the packet was given.
+        """
+        try:
+            source = self._sources[ssrc]
+        except KeyError:
+            source = self._sources[ssrc] = _Source()
+
+        sequence = source.sequence
+        packet = bytes(self._packet.pack(sequence, source.timestamp, ssrc, data))
+        source.sequence = (sequence + 1) & 0xFFFF
+        source.timestamp = (source.timestamp + 960) & 0xFFFFFFFF
+
+        chance = self._random.random
+        if self.loss and chance() < self.loss:
+            self.dropped += 1
+        elif source.held is None and self.reorder and chance() < self.reorder:
+            source.held = packet
+            return sequence
+        else:
+            self._sendto(packet)
+
+        if source.held is not None:
+            self._sendto(source.held)
+            source.held = None
+        return sequence
+
+    def _sendto(self, packet: bytes) -> None:
+        self._socket.sendto(packet, self.address)
+        self.sent += 1
+
+    def flush(self) -> None:
+        """Sends the packets held back to be reordered."""
+        for source in self._sources.values():
+            if source.held is not None:
+                self._sendto(source.held)
+                source.held = None
+
+    def close(self) -> None:
+        """Closes the socket without sending held back packets."""
+        self._socket.close()
@@ -13,3 +13,4 @@ from .view import *
 from .item import *
 from .button import *
 from .select import *
+from .router import *
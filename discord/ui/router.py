@@ -0,0 +1,359 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import asyncio
+import re
+import sys
+import traceback
+
+from ..enums import ComponentType
+
+__all__ = (
+    'ComponentRouter',
+)
+
+if TYPE_CHECKING:
+    from ..interactions import Interaction
+
+RouteCallbackType = Callable[..., Coroutine[Any, Any, Any]]
+
+_PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)(?::(str|int))?\}')
+_PLACEHOLDER_PATTERNS: Dict[str, str] = {
+    'str': r'.+?',
+    'int': r'-?[0-9]+',
+}
+
+
+class _Route:
+    __slots__ = (
+        'template',
+        'callback',
+        'component_type',
+        'prefix',
+        'pattern',
+        'converters',
+    )
+
+    def __init__(self, template: str, callback: RouteCallbackType, component_type: Optional[int]):
+        self.template: str = template
+        self.callback: RouteCallbackType = callback
+        self.component_type: Optional[int] = component_type
+        self.converters: Dict[str, Callable[[str], Any]] = {}
+
+        parts: List[str] = []
+        position = 0
+        first: Optional[int] = None
+        for match in _PLACEHOLDER.finditer(template):
+            name, kind = match.group(1), match.group(2) or 'str'
+            if name in self.converters:
+                raise ValueError(f'duplicate placeholder {name!r} in custom_id template {template!r}')
+
+            if first is None:
+                first = match.start()
+
+            parts.append(re.escape(template[position : match.start()]))
+            parts.append(f'(?P<{name}>{_PLACEHOLDER_PATTERNS[kind]})')
+            self.converters[name] = int if kind == 'int' else str
+            position = match.end()
+
+        parts.append(re.escape(template[position:]))
+
+        # The literal text before the first placeholder is what the trie is keyed on,
+        # templates without any placeholders are matched exactly instead.
+        self.prefix: str = template if first is None else template[:first]
+        self.pattern: Optional[re.Pattern[str]] = None if first is None else re.compile(''.join(parts))
+
+    def match(self, component_type: int, custom_id: str) -> Optional[Dict[str, Any]]:
+        if self.component_type is not None and self.component_type != component_type:
+            return None
+
+        if self.pattern is None:
+            return {}
+
+        match = self.pattern.fullmatch(custom_id)
+        if match is None:
+            return None
+
+        converters = self.converters
+        return {name: converters[name](value) for name, value in match.groupdict().items()}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'routes')
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.routes: List[_Route] = []
+
+
+class ComponentRouter:
+    """Routes component interactions to handlers based on their ``custom_id``.
+
+    Unlike a persistent :class:`View`, a router does not need an object per message.
+    Handlers are registered on ``custom_id`` templates, and any dynamic parts of the
+    ``custom_id`` are parsed out and passed to the handler as keyword arguments.
+
+    Templates are made up of literal text and ``{name}`` placeholders. A placeholder
+    may be given a type using ``{name:int}``, in which case it only matches digits and
+    is converted to an :class:`int`. Placeholders without a type match any text and
+    are passed as :class:`str`. A template without placeholders matches the
+    ``custom_id`` exactly.
+
+    Routes are resolved through a prefix trie of the literal text preceding the first
+    placeholder, so lookup cost depends on the length of the ``custom_id`` rather than
+    the number of registered routes. When several routes match, the one with the
+    longest literal prefix wins.
+
+    Routers are registered with :meth:`Client.add_component_router`. Views that were
+    added to the client take precedence over routers.
+
+    .. code-block:: python3
+
+        router = discord.ui.ComponentRouter()
+
+        @router.route('ticket:close:{ticket_id:int}')
+        async def close_ticket(interaction, ticket_id):
+            await interaction.response.send_message(f'Closing ticket {ticket_id}')
+
+        client.add_component_router(router)
+
+    .. versionadded:: 2.0
+    """
+
+    def __init__(self):
+        self._root: _TrieNode = _TrieNode()
+        self._exact: Dict[str, List[_Route]] = {}
+        self._routes: Dict[str, _Route] = {}
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} routes={len(self._routes)}>'
+
+    @property
+    def templates(self) -> List[str]:
+        """List[:class:`str`]: The ``custom_id`` templates registered to this router."""
+        return list(self._routes)
+
+    def add_route(
+        self,
+        template: str,
+        callback: RouteCallbackType,
+        *,
+        component_type: Optional[Union[ComponentType, int]] = None,
+    ) -> None:
+        """Registers a handler for a ``custom_id`` template.
+
+        Parameters
+        -----------
+        template: :class:`str`
+            The ``custom_id`` template to route.
+        callback
+            The coroutine to call when a component matches. It is called with the
+            :class:`~discord.Interaction` followed by the parsed placeholders as
+            keyword arguments.
+        component_type: Optional[Union[:class:`~discord.ComponentType`, :class:`int`]]
+            The type of component the route is restricted to. If ``None`` then
+            any component type matches.
+
+        Raises
+        -------
+        TypeError
+            The callback is not a coroutine.
+        ValueError
+            The template is already registered or contains duplicate placeholders.
+        """
+
+        if not asyncio.iscoroutinefunction(callback):
+            raise TypeError('route callback must be a coroutine function')
+
+        if template in self._routes:
+            raise ValueError(f'custom_id template {template!r} is already registered')
+
+        if isinstance(component_type, ComponentType):
+            component_type = component_type.value
+
+        route = _Route(template, callback, component_type)
+        if route.pattern is None:
+            self._exact.setdefault(route.prefix, []).append(route)
+        else:
+            node = self._root
+            for char in route.prefix:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode()
+                node = child
+            node.routes.append(route)
+
+        self._routes[template] = route
+
+    def remove_route(self, template: str) -> None:
+        """Removes a previously registered ``custom_id`` template.
+
+        If the template is not registered then this does nothing.
+
+        Parameters
+        -----------
+        template: :class:`str`
+            The ``custom_id`` template to remove.
+        """
+
+        route = self._routes.pop(template, None)
+        if route is None:
+            return
+
+        if route.pattern is None:
+            routes = self._exact[route.prefix]
+            routes.remove(route)
+            if not routes:
+                del self._exact[route.prefix]
+            return
+
+        path: List[Tuple[_TrieNode, str]] = []
+        node = self._root
+        for char in route.prefix:
+            path.append((node, char))
+            node = node.children[char]
+
+        node.routes.remove(route)
+        # Prune branches that no longer lead to any route
+        for parent, char in reversed(path):
+            if node.routes or node.children:
+                break
+            del parent.children[char]
+            node = parent
+
+    def route(
+        self,
+        template: str,
+        *,
+        component_type: Optional[Union[ComponentType, int]] = None,
+    ) -> Callable[[RouteCallbackType], RouteCallbackType]:
+        """A decorator that registers a coroutine as a handler for a ``custom_id`` template.
+
+        This is equivalent to calling :meth:`add_route`.
+
+        Parameters
+        -----------
+        template: :class:`str`
+            The ``custom_id`` template to route.
+        component_type: Optional[Union[:class:`~discord.ComponentType`, :class:`int`]]
+            The type of component the route is restricted to.
+        """
+
+        def decorator(func: RouteCallbackType) -> RouteCallbackType:
+            self.add_route(template, func, component_type=component_type)
+            return func
+
+        return decorator
+
+    def _resolve(self, component_type: int, custom_id: str) -> Optional[Tuple[_Route, Dict[str, Any]]]:
+        for route in self._exact.get(custom_id, ()):
+            if route.component_type is None or route.component_type == component_type:
+                return route, {}
+
+        # Walk the trie along the custom_id, remembering every node that has routes
+        candidates: List[List[_Route]] = []
+        node = self._root
+        if node.routes:
+            candidates.append(node.routes)
+        for char in custom_id:
+            node = node.children.get(char)  # type: ignore
+            if node is None:
+                break
+            if node.routes:
+                candidates.append(node.routes)
+
+        # Longest literal prefix first
+        for routes in reversed(candidates):
+            for route in routes:
+                kwargs = route.match(component_type, custom_id)
+                if kwargs is not None:
+                    return route, kwargs
+        return None
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        """|coro|
+
+        A callback that is called when an interaction happens for one of the
+        routes registered to this router and should return a :class:`bool`
+        if the interaction should be processed further.
+
+        The default implementation of this returns ``True``.
+
+        Parameters
+        -----------
+        interaction: :class:`~discord.Interaction`
+            The interaction that occurred.
+
+        Returns
+        ---------
+        :class:`bool`
+            Whether the route's callback should be called.
+        """
+        return True
+
+    async def on_error(self, error: Exception, template: str, interaction: Interaction) -> None:
+        """|coro|
+
+        A callback that is called when a route's callback or :meth:`interaction_check`
+        fails with an error.
+
+        The default implementation prints the traceback to stderr.
+
+        Parameters
+        -----------
+        error: :class:`Exception`
+            The exception that was raised.
+        template: :class:`str`
+            The ``custom_id`` template of the route that failed.
+        interaction: :class:`~discord.Interaction`
+            The interaction that led to the failure.
+        """
+        print(f'Ignoring exception in router {self} for route {template!r}:', file=sys.stderr)
+        traceback.print_exception(error.__class__, error, error.__traceback__, file=sys.stderr)
+
+    async def _scheduled_task(self, route: _Route, interaction: Interaction, kwargs: Dict[str, Any]):
+        try:
+            allow = await self.interaction_check(interaction)
+            if not allow:
+                return
+
+            await route.callback(interaction, **kwargs)
+            if not interaction.response._responded:
+                await interaction.response.defer()
+        except Exception as e:
+            return await self.on_error(e, route.template, interaction)
+
+    def _dispatch(self, component_type: int, custom_id: str, interaction: Interaction) -> bool:
+        resolved = self._resolve(component_type, custom_id)
+        if resolved is None:
+            return False
+
+        route, kwargs = resolved
+        asyncio.create_task(self._scheduled_task(route, interaction, kwargs), name=f'discord-ui-router-dispatch-{custom_id}')
+        return True
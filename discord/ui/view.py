@@ -23,12 +23,13 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Sequence, TYPE_CHECKING, Tuple
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Sequence, Set, TYPE_CHECKING, Tuple
 from functools import partial
 from itertools import groupby
 
 import traceback
 import asyncio
+import heapq
 import sys
 import time
 import os
@@ -51,6 +52,7 @@ if TYPE_CHECKING:
     from ..message import Message
     from ..types.components import Component as ComponentPayload
     from ..state import ConnectionState
+    from .router import ComponentRouter
 
 
 def _walk_all_components(components: List[Component]) -> Iterator[Component]:
@@ -167,28 +169,27 @@ class View:
         self.id: str = os.urandom(16).hex()
         self.__cancel_callback: Optional[Callable[[View], None]] = None
         self.__timeout_expiry: Optional[float] = None
-        self.__timeout_task: Optional[asyncio.Task[None]] = None
         self.__stopped: asyncio.Future[bool] = loop.create_future()
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} timeout={self.timeout} children={len(self.children)}>'
 
-    async def __timeout_task_impl(self) -> None:
-        while True:
-            # Guard just in case someone changes the value of the timeout at runtime
-            if self.timeout is None:
-                return
+    def _poll_timeout(self, now: float) -> Optional[float]:
+        # Called by the store's expiry timer once the scheduled deadline passes.
+        # Returns the refreshed deadline if an interaction pushed it back in the
+        # meantime, otherwise the timeout is dispatched and None is returned.
+        if self.__stopped.done():
+            return None
 
-            if self.__timeout_expiry is None:
-                return self._dispatch_timeout()
+        # Guard just in case someone changes the value of the timeout at runtime
+        if self.timeout is None:
+            return None
 
-            # Check if we've elapsed our currently set timeout
-            now = time.monotonic()
-            if now >= self.__timeout_expiry:
-                return self._dispatch_timeout()
+        if self.__timeout_expiry is None or now >= self.__timeout_expiry:
+            self._dispatch_timeout()
+            return None
 
-            # Wait N seconds to see if timeout data has been refreshed
-            await asyncio.sleep(self.__timeout_expiry - now)
+        return self.__timeout_expiry
 
     def to_components(self) -> List[Dict[str, Any]]:
         def key(item: Item) -> int:
@@ -365,12 +366,8 @@ class View:
     def _start_listening_from_store(self, store: ViewStore) -> None:
         self.__cancel_callback = partial(store.remove_view)
         if self.timeout:
-            loop = asyncio.get_running_loop()
-            if self.__timeout_task is not None:
-                self.__timeout_task.cancel()
-
             self.__timeout_expiry = time.monotonic() + self.timeout
-            self.__timeout_task = loop.create_task(self.__timeout_task_impl())
+            store._schedule_timeout(self, self.__timeout_expiry)
 
     def _dispatch_timeout(self):
         if self.__stopped.done():
@@ -415,10 +412,6 @@ class View:
             self.__stopped.set_result(False)
 
         self.__timeout_expiry = None
-        if self.__timeout_task is not None:
-            self.__timeout_task.cancel()
-            self.__timeout_task = None
-
         if self.__cancel_callback:
             self.__cancel_callback(self)
             self.__cancel_callback = None
@@ -454,74 +447,200 @@ class View:
         return await self.__stopped
 
 
+_ViewKey = Tuple[int, Optional[int], str]
+
+
+class _ViewEntry:
+    # Bookkeeping for a single view registered in the store, so that removing
+    # it only touches the keys and messages that belong to it.
+    __slots__ = (
+        'view',
+        'keys',
+        'message_ids',
+        'deadline',
+    )
+
+    def __init__(self, view: View):
+        self.view: View = view
+        self.keys: Set[_ViewKey] = set()
+        self.message_ids: Set[int] = set()
+        self.deadline: Optional[float] = None
+
+
 class ViewStore:
     def __init__(self, state: ConnectionState):
         # (component_type, message_id, custom_id): (View, Item)
-        self._views: Dict[Tuple[int, Optional[int], str], Tuple[View, Item]] = {}
+        self._views: Dict[_ViewKey, Tuple[View, Item]] = {}
+        # view_id: _ViewEntry
+        self._entries: Dict[str, _ViewEntry] = {}
         # message_id: View
         self._synced_message_views: Dict[int, View] = {}
+        # (deadline, view_id) min-heap shared by every view with a timeout
+        self._timeouts: List[Tuple[float, str]] = []
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
+        self._timeout_handle_deadline: Optional[float] = None
+        self._routers: List[ComponentRouter] = []
         self._state: ConnectionState = state
 
     @property
     def persistent_views(self) -> Sequence[View]:
         # fmt: off
-        views = {
-            view.id: view
-            for (_, (view, _)) in self._views.items()
-            if view.is_persistent()
-        }
+        return [
+            entry.view
+            for entry in self._entries.values()
+            if entry.view.is_persistent()
+        ]
         # fmt: on
-        return list(views.values())
-
-    def __verify_integrity(self):
-        to_remove: List[Tuple[int, Optional[int], str]] = []
-        for (k, (view, _)) in self._views.items():
-            if view.is_finished():
-                to_remove.append(k)
-
-        for k in to_remove:
-            del self._views[k]
 
     def add_view(self, view: View, message_id: Optional[int] = None):
-        self.__verify_integrity()
+        entry = self._entries.get(view.id)
+        if entry is None:
+            entry = self._entries[view.id] = _ViewEntry(view)
 
         view._start_listening_from_store(self)
         for item in view.children:
             if item.is_dispatchable():
-                self._views[(item.type.value, message_id, item.custom_id)] = (view, item)  # type: ignore
+                key = (item.type.value, message_id, item.custom_id)  # type: ignore
+                previous = self._views.get(key)
+                if previous is not None and previous[0] is not view:
+                    self.__release_key(previous[0], key)
+
+                self._views[key] = (view, item)
+                entry.keys.add(key)
 
         if message_id is not None:
+            previous_view = self._synced_message_views.get(message_id)
+            if previous_view is not None and previous_view is not view:
+                previous_entry = self._entries.get(previous_view.id)
+                if previous_entry is not None:
+                    previous_entry.message_ids.discard(message_id)
+
             self._synced_message_views[message_id] = view
+            entry.message_ids.add(message_id)
+
+    def __release_key(self, view: View, key: _ViewKey) -> None:
+        # Another view took over this key, so the old owner no longer holds it
+        entry = self._entries.get(view.id)
+        if entry is not None:
+            entry.keys.discard(key)
 
     def remove_view(self, view: View):
-        for item in view.children:
-            if item.is_dispatchable():
-                self._views.pop((item.type.value, item.custom_id), None)  # type: ignore
+        entry = self._entries.pop(view.id, None)
+        if entry is None:
+            return
+
+        for key in entry.keys:
+            value = self._views.get(key)
+            if value is not None and value[0] is view:
+                del self._views[key]
+
+        for message_id in entry.message_ids:
+            if self._synced_message_views.get(message_id) is view:
+                del self._synced_message_views[message_id]
+
+        # The heap entry is left behind and skipped once it's popped
+        entry.deadline = None
+        if len(self._timeouts) > 64 and len(self._timeouts) > 2 * len(self._entries):
+            self.__compact_timeouts()
 
-        for key, value in self._synced_message_views.items():
-            if value.id == view.id:
-                del self._synced_message_views[key]
-                break
+    def _schedule_timeout(self, view: View, deadline: float) -> None:
+        entry = self._entries.get(view.id)
+        if entry is None or entry.deadline == deadline:
+            return
+
+        entry.deadline = deadline
+        heapq.heappush(self._timeouts, (deadline, view.id))
+        self.__arm_timer()
+
+    def __compact_timeouts(self) -> None:
+        # fmt: off
+        self._timeouts = [
+            (entry.deadline, view_id)
+            for view_id, entry in self._entries.items()
+            if entry.deadline is not None
+        ]
+        # fmt: on
+        heapq.heapify(self._timeouts)
+
+    def __arm_timer(self) -> None:
+        if not self._timeouts:
+            return
+
+        deadline = self._timeouts[0][0]
+        if self._timeout_handle is not None:
+            if self._timeout_handle_deadline is not None and self._timeout_handle_deadline <= deadline:
+                return
+            self._timeout_handle.cancel()
+
+        loop = asyncio.get_running_loop()
+        self._timeout_handle_deadline = deadline
+        self._timeout_handle = loop.call_later(max(deadline - time.monotonic(), 0), self.__expire_views)
+
+    def __expire_views(self) -> None:
+        self._timeout_handle = None
+        self._timeout_handle_deadline = None
+
+        now = time.monotonic()
+        timeouts = self._timeouts
+        while timeouts and timeouts[0][0] <= now:
+            deadline, view_id = heapq.heappop(timeouts)
+            entry = self._entries.get(view_id)
+            if entry is None or entry.deadline != deadline:
+                # Stale: the view was removed or rescheduled since this was pushed
+                continue
+
+            view = entry.view
+            refreshed = view._poll_timeout(now)
+            if refreshed is None:
+                if view.is_finished():
+                    self.remove_view(view)
+                else:
+                    entry.deadline = None
+            else:
+                entry.deadline = refreshed
+                heapq.heappush(timeouts, (refreshed, view_id))
+
+        self.__arm_timer()
 
     def dispatch(self, component_type: int, custom_id: str, interaction: Interaction):
-        self.__verify_integrity()
         message_id: Optional[int] = interaction.message and interaction.message.id
         key = (component_type, message_id, custom_id)
         # Fallback to None message_id searches in case a persistent view
         # was added without an associated message_id
         value = self._views.get(key) or self._views.get((component_type, None, custom_id))
         if value is None:
+            # the first router that matches handles it
+            any(router._dispatch(component_type, custom_id, interaction) for router in self._routers)
             return
 
         view, item = value
         item.refresh_state(interaction)
         view._dispatch_item(item, interaction)
 
+    @property
+    def component_routers(self) -> Sequence[ComponentRouter]:
+        return list(self._routers)
+
+    def add_router(self, router: ComponentRouter) -> None:
+        if router not in self._routers:
+            self._routers.append(router)
+
+    def remove_router(self, router: ComponentRouter) -> None:
+        try:
+            self._routers.remove(router)
+        except ValueError:
+            pass
+
     def is_message_tracked(self, message_id: int):
         return message_id in self._synced_message_views
 
     def remove_message_tracking(self, message_id: int) -> Optional[View]:
-        return self._synced_message_views.pop(message_id, None)
+        view = self._synced_message_views.pop(message_id, None)
+        if view is not None:
+            entry = self._entries.get(view.id)
+            if entry is not None:
+                entry.message_ids.discard(message_id)
+        return view
 
     def update_from_message(self, message_id: int, components: List[ComponentPayload]):
         # pre-req: is_message_tracked == true
@@ -627,6 +627,60 @@ class SnowflakeList(array.array):
         return i != len(self) and self[i] == element
 
 
+class _LatencyHistogram:
+    """Internal fixed-bucket histogram of latencies in seconds.
+
+    Recording is a bisect and an increment so it's cheap enough to do on
+    every request. Percentiles are estimated from bucket upper bounds.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    # Upper bounds in seconds, roughly log-spaced from 1ms to 10s
+    BOUNDS: Tuple[float, ...] = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0,
+    )
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None):
+        self.bounds: Tuple[float, ...] = tuple(bounds) if bounds is not None else self.BOUNDS
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+
+        target = self.count * percent / 100
+        seen = 0
+        for index, amount in enumerate(self.counts):
+            seen += amount
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds: List[Optional[float]] = list(self.bounds)
+        bounds.append(None)
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': list(zip(bounds, self.counts)),
+        }
+
+
 _IS_ASCII = re.compile(r'^[\x00-\x7f]+$')
 
 
@@ -40,17 +40,19 @@ Some documentation to refer to:
 from __future__ import annotations
 
 import asyncio
+import os
 import socket
 import logging
 import struct
 import threading
-from typing import Any, Callable, List, Optional, TYPE_CHECKING, Tuple
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Tuple, Union
 
 from . import opus, utils
 from .backoff import ExponentialBackoff
 from .gateway import *
 from .errors import ClientException, ConnectionClosed
 from .player import AudioPlayer, AudioSource
+from .receiver import AudioReceiver, AudioSink, has_sodium
 from .utils import MISSING
 
 if TYPE_CHECKING:
@@ -59,6 +61,7 @@ if TYPE_CHECKING:
     from .state import ConnectionState
     from .user import ClientUser
     from .opus import Encoder
+    from .receiver import _Listener
     from . import abc
 
     from .types.voice import (
@@ -76,6 +79,9 @@ try:
 except ImportError:
     has_nacl = False
 
+if has_sodium:
+    from .receiver import _sodium_ffi, _sodium_lib
+
 __all__ = (
     'VoiceProtocol',
     'VoiceClient',
@@ -195,6 +201,104 @@ class VoiceProtocol:
         key_id, _ = self.channel._get_voice_client_key()
         self.client._connection._remove_voice_client(key_id)
 
+
+_RTP_HEADER = struct.Struct('>BBHII')
+_NONCE = struct.Struct('>I')
+# crypto_secretbox wants the message prefixed with ZEROBYTES zeros and
+# writes the box prefixed with BOXZEROBYTES zeros
+_ZEROBYTES = 32
+_BOXZEROBYTES = 16
+_PADDING = bytes(_ZEROBYTES)
+# the RTP header ends where the box starts
+_HEADER_OFFSET = _BOXZEROBYTES - 12
+
+
+class _VoicePacket:
+    # Builds every packet of a connection in one buffer. The payload is
+    # copied in after the zero padding crypto_secretbox needs, encrypted in
+    # place and the header is written over the leftover padding in front of
+    # the box, so the packet is a slice of the buffer and nothing else is
+    # allocated per packet.
+    __slots__ = ('key', 'encrypt', 'buffer', 'pointer', 'nonce', 'nonce_pointer', 'lite_nonce')
+
+    def __init__(self, mode: str, secret_key: List[int]) -> None:
+        self.key: bytes = bytes(secret_key)
+        self.encrypt: Callable[[int, int, int, int], int] = getattr(self, '_encrypt_' + mode)
+        self.nonce: bytearray = bytearray(24)
+        self.nonce_pointer: Any = _sodium_ffi.from_buffer(self.nonce)
+        self.lite_nonce: int = 0
+        self._allocate(4000)
+
+    def _allocate(self, size: int) -> None:
+        self.buffer: bytearray = bytearray(_ZEROBYTES + size + 24)
+        self.pointer: Any = _sodium_ffi.from_buffer(self.buffer)
+
+    def pack(self, sequence: int, timestamp: int, ssrc: int, data: Any) -> memoryview:
+        size = len(data)
+        if _ZEROBYTES + size + 24 > len(self.buffer):
+            self._allocate(size)
+
+        buffer = self.buffer
+        buffer[:_ZEROBYTES] = _PADDING
+        end = _ZEROBYTES + size
+        buffer[_ZEROBYTES:end] = data
+        end = self.encrypt(sequence, timestamp, ssrc, end)
+        _RTP_HEADER.pack_into(buffer, _HEADER_OFFSET, 0x80, 0x78, sequence, timestamp, ssrc)
+        # the returned view is only valid until the next packet
+        return memoryview(buffer)[_HEADER_OFFSET:end]
+
+    def _seal(self, length: int, nonce: Any) -> None:
+        if _sodium_lib.crypto_secretbox(self.pointer, self.pointer, length, nonce, self.key) != 0:
+            raise RuntimeError('Encryption failed')
+
+    def _encrypt_xsalsa20_poly1305(self, sequence: int, timestamp: int, ssrc: int, end: int) -> int:
+        _RTP_HEADER.pack_into(self.nonce, 0, 0x80, 0x78, sequence, timestamp, ssrc)
+        self._seal(end, self.nonce_pointer)
+        return end
+
+    def _encrypt_xsalsa20_poly1305_suffix(self, sequence: int, timestamp: int, ssrc: int, end: int) -> int:
+        nonce = os.urandom(24)
+        self._seal(end, nonce)
+        self.buffer[end:end + 24] = nonce
+        return end + 24
+
+    def _encrypt_xsalsa20_poly1305_lite(self, sequence: int, timestamp: int, ssrc: int, end: int) -> int:
+        lite_nonce = self.lite_nonce
+        self.lite_nonce = (lite_nonce + 1) & 0xFFFFFFFF
+        _NONCE.pack_into(self.nonce, 0, lite_nonce)
+        _NONCE.pack_into(self.buffer, end, lite_nonce)
+        self._seal(end, self.nonce_pointer)
+        return end + 4
+
+
+class _SecretBoxPacket:
+    # The fallback for _VoicePacket when PyNaCl's libsodium bindings can't
+    # be imported, every packet is encrypted into a new bytes object.
+    __slots__ = ('box', 'encrypt', 'lite_nonce')
+
+    def __init__(self, mode: str, secret_key: List[int]) -> None:
+        self.box: Any = nacl.secret.SecretBox(bytes(secret_key))
+        self.encrypt: Callable[[bytes, bytes], bytes] = getattr(self, '_encrypt_' + mode)
+        self.lite_nonce: int = 0
+
+    def pack(self, sequence: int, timestamp: int, ssrc: int, data: Any) -> memoryview:
+        header = _RTP_HEADER.pack(0x80, 0x78, sequence, timestamp, ssrc)
+        return memoryview(self.encrypt(header, bytes(data)))
+
+    def _encrypt_xsalsa20_poly1305(self, header: bytes, data: bytes) -> bytes:
+        nonce = header + bytes(12)
+        return header + self.box.encrypt(data, nonce).ciphertext
+
+    def _encrypt_xsalsa20_poly1305_suffix(self, header: bytes, data: bytes) -> bytes:
+        nonce = os.urandom(24)
+        return header + self.box.encrypt(data, nonce).ciphertext + nonce
+
+    def _encrypt_xsalsa20_poly1305_lite(self, header: bytes, data: bytes) -> bytes:
+        nonce = _NONCE.pack(self.lite_nonce)
+        self.lite_nonce = (self.lite_nonce + 1) & 0xFFFFFFFF
+        return header + self.box.encrypt(data, nonce + bytes(20)).ciphertext + nonce
+
+
 class VoiceClient(VoiceProtocol):
     """Represents a Discord voice connection.
 
@@ -223,7 +327,6 @@ class VoiceClient(VoiceProtocol):
     """
     endpoint_ip: str
     voice_port: int
-    secret_key: List[int]
     ssrc: int
 
 
@@ -237,7 +340,7 @@ class VoiceClient(VoiceProtocol):
         self.socket = MISSING
         self.loop: asyncio.AbstractEventLoop = state.loop
         self._state: ConnectionState = state
-        # this will be used in the AudioPlayer thread
+        # this will be used by the AudioScheduler threads
         self._connected: threading.Event = threading.Event()
 
         self._handshaking: bool = False
@@ -253,7 +356,11 @@ class VoiceClient(VoiceProtocol):
         self._runner: asyncio.Task = MISSING
         self._player: Optional[AudioPlayer] = None
         self.encoder: Encoder = MISSING
-        self._lite_nonce: int = 0
+        self._secret_key: List[int] = MISSING
+        self._packet: Optional[Union[_VoicePacket, _SecretBoxPacket]] = None
+        self._listener: Optional[_Listener] = None
+        # the user every SSRC belongs to, filled in as users start speaking
+        self._user_ids: Dict[int, int] = {}
         self.ws: DiscordVoiceWebSocket = MISSING
 
     warn_nacl = not has_nacl
@@ -356,6 +463,9 @@ class VoiceClient(VoiceProtocol):
         self._connected.clear()
         while ws.secret_key is None:
             await ws.poll_event()
+        if self._listener is not None:
+            # the socket and the key are new after every reconnect
+            self._listener.attach(self.socket, self.mode, self.secret_key)
         self._connected.set()
         return ws
 
@@ -491,6 +601,7 @@ class VoiceClient(VoiceProtocol):
             return
 
         self.stop()
+        self.stop_listening()
         self._connected.clear()
 
         try:
@@ -515,46 +626,28 @@ class VoiceClient(VoiceProtocol):
         """
         await self.channel.guild.change_voice_state(channel=channel)
 
+    @property
+    def secret_key(self) -> List[int]:
+        return self._secret_key
+
+    @secret_key.setter
+    def secret_key(self, value: List[int]) -> None:
+        self._secret_key = value
+        self._packet = None
+
     def is_connected(self) -> bool:
         """Indicates if the voice client is connected to voice."""
         return self._connected.is_set()
 
     # audio related
 
-    def _get_voice_packet(self, data):
-        header = bytearray(12)
-
-        # Formulate rtp header
-        header[0] = 0x80
-        header[1] = 0x78
-        struct.pack_into('>H', header, 2, self.sequence)
-        struct.pack_into('>I', header, 4, self.timestamp)
-        struct.pack_into('>I', header, 8, self.ssrc)
-
-        encrypt_packet = getattr(self, '_encrypt_' + self.mode)
-        return encrypt_packet(header, data)
-
-    def _encrypt_xsalsa20_poly1305(self, header: bytes, data) -> bytes:
-        box = nacl.secret.SecretBox(bytes(self.secret_key))
-        nonce = bytearray(24)
-        nonce[:12] = header
-
-        return header + box.encrypt(bytes(data), bytes(nonce)).ciphertext
-
-    def _encrypt_xsalsa20_poly1305_suffix(self, header: bytes, data) -> bytes:
-        box = nacl.secret.SecretBox(bytes(self.secret_key))
-        nonce = nacl.utils.random(nacl.secret.SecretBox.NONCE_SIZE)
-
-        return header + box.encrypt(bytes(data), nonce).ciphertext + nonce
-
-    def _encrypt_xsalsa20_poly1305_lite(self, header: bytes, data) -> bytes:
-        box = nacl.secret.SecretBox(bytes(self.secret_key))
-        nonce = bytearray(24)
-
-        nonce[:4] = struct.pack('>I', self._lite_nonce)
-        self.checked_add('_lite_nonce', 1, 4294967295)
-
-        return header + box.encrypt(bytes(data), bytes(nonce)).ciphertext + nonce[:4]
+    def _get_voice_packet(self, data) -> memoryview:
+        packet = self._packet
+        if packet is None:
+            # the mode is always set right before the secret key, which resets this
+            cls = _VoicePacket if has_sodium else _SecretBoxPacket
+            packet = self._packet = cls(self.mode, self.secret_key)
+        return packet.pack(self.sequence, self.timestamp, self.ssrc, data)
 
     def play(self, source: AudioSource, *, after: Callable[[Optional[Exception]], Any]=None) -> None:
         """Plays an :class:`AudioSource`.
@@ -562,6 +655,12 @@ class VoiceClient(VoiceProtocol):
         The finalizer, ``after`` is called after the source has been exhausted
         or an error occurred.
 
+        Audio is sent from the threads of :meth:`AudioScheduler.default`,
+        which are shared by every voice client.
+
+        .. versionchanged:: 2.0
+            Audio is no longer sent from a thread per voice client.
+
         If an error happens while the audio player is running, the exception is
         caught and the audio player is then stopped.  If no after callback is
         passed, any caught exception will be displayed as if it were raised.
@@ -624,6 +723,20 @@ class VoiceClient(VoiceProtocol):
         if self._player:
             self._player.resume()
 
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """Returns how well the audio currently being played is paced.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Optional[Dict[:class:`str`, Any]]
+            The number of frames sent, the number of times playback fell
+            too far behind and started over, and a histogram of how late
+            frames were sent in seconds. ``None`` if nothing is playing.
+        """
+        return self._player.metrics() if self._player else None
+
     @property
     def source(self) -> Optional[AudioSource]:
         """Optional[:class:`AudioSource`]: The audio source being played, if playing.
@@ -642,6 +755,78 @@ class VoiceClient(VoiceProtocol):
 
         self._player._set_source(value)
 
+    def listen(self, sink: AudioSink, *, delay: int = 3) -> None:
+        """Starts receiving the audio of everyone speaking in the channel.
+
+        Audio is received on the threads of :meth:`AudioReceiver.default`,
+        which are shared by every voice client, and written to ``sink`` one
+        20ms frame per speaker at a time.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        sink: :class:`AudioSink`
+            Where the decoded audio is written to.
+        delay: :class:`int`
+            How many frames a missing packet is waited for before it is
+            recovered or concealed. Higher values handle more reordering at
+            the cost of latency.
+
+        Raises
+        -------
+        ClientException
+            Already listening, not connected, or PyNaCl's libsodium bindings
+            could not be imported.
+        TypeError
+            Sink is not an :class:`AudioSink`.
+        ValueError
+            ``delay`` is less than 1.
+        OpusNotLoaded
+            Opus is not loaded.
+        """
+
+        if not self.is_connected():
+            raise ClientException('Not connected to voice.')
+
+        if self.is_listening():
+            raise ClientException('Already listening.')
+
+        if not isinstance(sink, AudioSink):
+            raise TypeError(f'sink must be an AudioSink not {sink.__class__.__name__}')
+
+        if delay < 1:
+            raise ValueError('delay must be at least 1')
+
+        if not has_sodium:
+            raise ClientException('Receiving audio requires the libsodium bindings of PyNaCl, which could not be imported.')
+
+        # load the library now rather than on a decoder thread
+        opus._OpusStruct.get_opus_version()
+
+        self._listener = AudioReceiver.default()._listen(self, sink, delay)
+        self._listener.attach(self.socket, self.mode, self.secret_key)
+
+    def is_listening(self) -> bool:
+        """Indicates if we're currently receiving audio.
+
+        .. versionadded:: 2.0
+        """
+        return self._listener is not None and self._listener.active
+
+    def stop_listening(self) -> None:
+        """Stops receiving audio.
+
+        Frames that were already received are still written to the sink,
+        including ones held back while waiting for a missing packet, which
+        is then concealed. After that its :meth:`~AudioSink.cleanup` is called.
+
+        .. versionadded:: 2.0
+        """
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+
     def send_audio_packet(self, data: bytes, *, encode: bool = True) -> None:
         """Sends an audio packet composed of the data.
 
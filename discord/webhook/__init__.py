@@ -11,3 +11,4 @@ Webhook support
 
 from .async_ import *
 from .sync import *
+from .batcher import *
@@ -28,6 +28,7 @@ import logging
 import asyncio
 import json
 import re
+import time
 
 from urllib.parse import quote as urlquote
 from typing import Any, Dict, List, Literal, NamedTuple, Optional, TYPE_CHECKING, Tuple, Union, overload
@@ -41,7 +42,7 @@ from ..message import Message
 from ..enums import try_enum, WebhookType
 from ..user import BaseUser, User
 from ..asset import Asset
-from ..http import Route
+from ..http import Route, MaybeUnlock, RateLimiter, _session_rate_limiters
 from ..mixins import Hashable
 from ..channel import PartialMessageable
 
@@ -75,27 +76,22 @@ if TYPE_CHECKING:
 MISSING = utils.MISSING
 
 
-class AsyncDeferredLock:
-    def __init__(self, lock: asyncio.Lock):
-        self.lock = lock
-        self.delta: Optional[float] = None
-
-    async def __aenter__(self):
-        await self.lock.acquire()
-        return self
-
-    def delay_by(self, delta: float) -> None:
-        self.delta = delta
-
-    async def __aexit__(self, type, value, traceback):
-        if self.delta:
-            await asyncio.sleep(self.delta)
-        self.lock.release()
-
-
 class AsyncWebhookAdapter:
     def __init__(self):
-        self._locks: Dict[Any, asyncio.Lock] = {}
+        # used for sessions that don't belong to an HTTPClient
+        self._rate_limiter: RateLimiter = RateLimiter()
+
+    def _rate_limiter_for(self, session: aiohttp.ClientSession) -> RateLimiter:
+        return _session_rate_limiters.get(session, self._rate_limiter)
+
+    async def wait_for_bucket(self, route: Route, session: aiohttp.ClientSession) -> None:
+        # waits until a request to the route would be sent right away, without taking the bucket
+        rate_limiter = self._rate_limiter_for(session)
+        await rate_limiter.wait_global()
+        lock = rate_limiter.lock_for(route.bucket)
+        if lock.locked():
+            async with lock:
+                pass
 
     async def request(
         self,
@@ -112,12 +108,9 @@ class AsyncWebhookAdapter:
         headers: Dict[str, str] = {}
         files = files or []
         to_send: Optional[Union[str, aiohttp.FormData]] = None
-        bucket = (route.webhook_id, route.webhook_token)
-
-        try:
-            lock = self._locks[bucket]
-        except KeyError:
-            self._locks[bucket] = lock = asyncio.Lock()
+        bucket = route.bucket
+        rate_limiter = self._rate_limiter_for(session)
+        lock = rate_limiter.lock_for(bucket)
 
         if payload is not None:
             headers['Content-Type'] = 'application/json'
@@ -135,7 +128,9 @@ class AsyncWebhookAdapter:
         url = route.url
         webhook_id = route.webhook_id
 
-        async with AsyncDeferredLock(lock) as lock:
+        await rate_limiter.wait_global()
+        await lock.acquire()
+        with MaybeUnlock(lock) as maybe_lock:
             for attempt in range(5):
                 for file in files:
                     file.reset(seek=attempt)
@@ -147,7 +142,9 @@ class AsyncWebhookAdapter:
                     to_send = form_data
 
                 try:
+                    start = time.perf_counter()
                     async with session.request(method, url, data=to_send, headers=headers, params=params) as response:
+                        rate_limiter.record(response.status, time.perf_counter() - start)
                         _log.debug(
                             'Webhook ID %s with %s %s has returned status code %s',
                             webhook_id,
@@ -165,7 +162,8 @@ class AsyncWebhookAdapter:
                             _log.debug(
                                 'Webhook ID %s has been pre-emptively rate limited, waiting %.2f seconds', webhook_id, delta
                             )
-                            lock.delay_by(delta)
+                            maybe_lock.defer()
+                            rate_limiter.release_later(lock, delta)
 
                         if 300 > response.status >= 200:
                             return data
@@ -176,7 +174,7 @@ class AsyncWebhookAdapter:
 
                             retry_after: float = data['retry_after']  # type: ignore
                             _log.warning('Webhook ID %s is rate limited. Retrying in %.2f seconds', webhook_id, retry_after)
-                            await asyncio.sleep(retry_after)
+                            await rate_limiter.sleep_rate_limited(retry_after, is_global=data.get('global', False))  # type: ignore
                             continue
 
                         if response.status >= 500:
@@ -0,0 +1,396 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz 2021-present CuzImSyntax
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Literal, Optional, Tuple, TYPE_CHECKING
+
+from .. import utils
+from ..errors import InvalidArgument
+from ..http import Route
+from ..object import Object
+from .async_ import async_context
+
+__all__ = (
+    'WebhookBatcher',
+)
+
+_log = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from .async_ import Webhook
+    from ..embeds import Embed
+    from ..mentions import AllowedMentions
+    from ..abc import Snowflake
+
+    OverflowPolicy = Literal['block', 'drop_newest', 'drop_oldest']
+
+MISSING = utils.MISSING
+
+# limits of a single webhook execution
+_MAX_CONTENT = 2000
+_MAX_EMBEDS = 10
+_MAX_EMBED_CHARS = 6000
+
+
+class _BatchItem:
+    __slots__ = ('content', 'embeds', 'key')
+
+    def __init__(self, content: Optional[str], embeds: List[Embed], key: Tuple[Any, ...]) -> None:
+        self.content: Optional[str] = content
+        self.embeds: List[Embed] = embeds
+        self.key: Tuple[Any, ...] = key
+
+
+class _Batch:
+    __slots__ = ('key', 'content', 'content_length', 'embeds', 'embed_chars', 'size')
+
+    def __init__(self, item: _BatchItem) -> None:
+        self.key: Tuple[Any, ...] = item.key
+        self.content: List[str] = []
+        self.content_length: int = 0
+        self.embeds: List[Embed] = []
+        self.embed_chars: int = 0
+        self.size: int = 0
+        self.add(item)
+
+    def fits(self, item: _BatchItem) -> bool:
+        if item.key != self.key:
+            return False
+
+        if item.content:
+            # joined with a newline
+            length = self.content_length + len(item.content) + (1 if self.content else 0)
+            if length > _MAX_CONTENT:
+                return False
+
+        if item.embeds:
+            if len(self.embeds) + len(item.embeds) > _MAX_EMBEDS:
+                return False
+            if self.embed_chars + sum(len(e) for e in item.embeds) > _MAX_EMBED_CHARS:
+                return False
+
+        return True
+
+    def add(self, item: _BatchItem) -> None:
+        if item.content:
+            self.content_length += len(item.content) + (1 if self.content else 0)
+            self.content.append(item.content)
+        if item.embeds:
+            self.embeds.extend(item.embeds)
+            self.embed_chars += sum(len(e) for e in item.embeds)
+        self.size += 1
+
+
+class _WebhookQueue:
+    __slots__ = ('webhook', 'queue', 'carry', 'task')
+
+    def __init__(self, webhook: Webhook, maxsize: int) -> None:
+        self.webhook: Webhook = webhook
+        self.queue: asyncio.Queue[_BatchItem] = asyncio.Queue(maxsize)
+        # an item that was taken off the queue but didn't fit the previous batch
+        self.carry: Optional[_BatchItem] = None
+        self.task: Optional[asyncio.Task[None]] = None
+
+
+class WebhookBatcher:
+    """Queues messages per webhook and sends them in as few executions as possible.
+
+    Messages sent to the same webhook are queued and coalesced into a single
+    execution, up to 2000 characters of content (joined by newlines) and
+    10 embeds. Only messages with the same ``username``, ``avatar_url``,
+    ``thread`` and ``allowed_mentions`` are coalesced together.
+
+    Every webhook is drained by its own task, so different webhooks are
+    sent to concurrently. A task sends its next batch as soon as the
+    webhook's rate limit bucket allows it, and everything queued while
+    it waited goes into that batch.
+
+    This is meant for high volume, fire and forget messages such as logs.
+    Messages with files or views should be sent with :meth:`Webhook.send`.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_queue_size: :class:`int`
+        The maximum number of messages queued per webhook. Defaults to ``1000``.
+    overflow: :class:`str`
+        What to do when a webhook's queue is full. ``'block'`` (the default)
+        makes :meth:`send` wait until there is room. ``'drop_newest'`` discards
+        the message being sent. ``'drop_oldest'`` discards the oldest queued message
+        to make room for it.
+    idle_timeout: :class:`float`
+        The number of seconds a webhook's drain task waits for new messages before
+        it exits. Defaults to ``60``.
+
+    Attributes
+    -----------
+    dropped: :class:`int`
+        The number of messages that were discarded due to a full queue.
+    sent: :class:`int`
+        The number of messages that were sent.
+    executions: :class:`int`
+        The number of webhook executions used to send them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 1000,
+        overflow: OverflowPolicy = 'block',
+        idle_timeout: float = 60.0,
+    ) -> None:
+        if overflow not in ('block', 'drop_newest', 'drop_oldest'):
+            raise InvalidArgument(f'unknown overflow policy {overflow!r}')
+        if max_queue_size <= 0:
+            raise InvalidArgument('max_queue_size must be positive')
+
+        self.max_queue_size: int = max_queue_size
+        self.overflow: OverflowPolicy = overflow
+        self.idle_timeout: float = idle_timeout
+        self.dropped: int = 0
+        self.sent: int = 0
+        self.executions: int = 0
+        self._queues: Dict[int, _WebhookQueue] = {}
+        self._closed: bool = False
+
+    def __repr__(self) -> str:
+        return f'<WebhookBatcher webhooks={len(self._queues)} pending={self.pending}>'
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The number of messages that are queued and not sent yet."""
+        return sum(q.queue.qsize() + (q.carry is not None) for q in self._queues.values())
+
+    async def send(
+        self,
+        webhook: Webhook,
+        content: Optional[str] = MISSING,
+        *,
+        embed: Embed = MISSING,
+        embeds: List[Embed] = MISSING,
+        username: str = MISSING,
+        avatar_url: Any = MISSING,
+        thread: Snowflake = MISSING,
+        allowed_mentions: AllowedMentions = MISSING,
+    ) -> bool:
+        """|coro|
+
+        Queues a message to be sent with the given webhook.
+
+        Parameters
+        ------------
+        webhook: :class:`Webhook`
+            The webhook to send the message with.
+        content: Optional[:class:`str`]
+            The content of the message.
+        embed: :class:`Embed`
+            An embed to send. This cannot be mixed with the ``embeds`` parameter.
+        embeds: List[:class:`Embed`]
+            A list of embeds to send. This cannot be mixed with the ``embed`` parameter.
+        username: :class:`str`
+            The username to send the message with.
+        avatar_url: :class:`str`
+            The avatar URL to send the message with.
+        thread: :class:`~discord.abc.Snowflake`
+            The thread to send the message to.
+        allowed_mentions: :class:`AllowedMentions`
+            Controls the mentions being processed in this message.
+
+        Raises
+        --------
+        InvalidArgument
+            The batcher is closed, the webhook has no token, no content or embeds
+            were given, or both ``embed`` and ``embeds`` were given.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether the message was queued. This is only ``False`` if it was
+            discarded due to the ``'drop_newest'`` overflow policy.
+        """
+
+        if self._closed:
+            raise InvalidArgument('this batcher is closed')
+        if webhook.token is None:
+            raise InvalidArgument('This webhook does not have a token associated with it')
+        if embed is not MISSING and embeds is not MISSING:
+            raise InvalidArgument('Cannot mix embed and embeds keyword arguments.')
+
+        if embed is not MISSING:
+            embeds = [embed]
+        elif embeds is MISSING:
+            embeds = []
+
+        text = str(content) if content is not MISSING and content is not None else None
+        if not text and not embeds:
+            raise InvalidArgument('A message needs content or embeds')
+
+        key = (username, avatar_url, None if thread is MISSING else thread.id, allowed_mentions)
+        item = _BatchItem(text, embeds, key)
+
+        entry = self._queues.get(webhook.id)
+        if entry is None:
+            entry = self._queues[webhook.id] = _WebhookQueue(webhook, self.max_queue_size)
+
+        queue = entry.queue
+        if queue.full():
+            if self.overflow == 'drop_newest':
+                self.dropped += 1
+                return False
+            if self.overflow == 'drop_oldest':
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                else:
+                    queue.task_done()
+                    self.dropped += 1
+
+        # the task is started first so that a full queue is always being drained
+        self._start(entry)
+        await queue.put(item)
+        self._start(entry)
+        return True
+
+    def _start(self, entry: _WebhookQueue) -> None:
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.create_task(self._drain(entry), name=f'discord-webhook-batcher-{entry.webhook.id}')
+
+    async def flush(self) -> None:
+        """|coro|
+
+        Waits until every message queued so far has been sent.
+        """
+        entries = list(self._queues.values())
+        for entry in entries:
+            if not entry.queue.empty():
+                self._start(entry)
+        await asyncio.gather(*(entry.queue.join() for entry in entries))
+
+    async def close(self) -> None:
+        """|coro|
+
+        Sends the remaining queued messages and stops the batcher.
+
+        No messages can be queued after this is called.
+        """
+        self._closed = True
+        await self.flush()
+        for entry in self._queues.values():
+            if entry.task is not None:
+                entry.task.cancel()
+        self._queues.clear()
+
+    async def on_error(self, webhook: Webhook, error: Exception, count: int) -> None:
+        """|coro|
+
+        Called when sending a batch of messages fails. The messages are not retried.
+
+        The default implementation logs the error.
+
+        Parameters
+        ------------
+        webhook: :class:`Webhook`
+            The webhook that failed to send.
+        error: :class:`Exception`
+            The exception that was raised.
+        count: :class:`int`
+            The number of messages that were lost.
+        """
+        _log.error('Failed to send %s batched message(s) with webhook ID %s.', count, webhook.id, exc_info=error)
+
+    def _next_batch(self, entry: _WebhookQueue, first: _BatchItem) -> _Batch:
+        batch = _Batch(first)
+        queue = entry.queue
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return batch
+
+            if not batch.fits(item):
+                entry.carry = item
+                return batch
+            batch.add(item)
+
+    async def _drain(self, entry: _WebhookQueue) -> None:
+        queue = entry.queue
+        webhook = entry.webhook
+        route = Route('POST', '/webhooks/{webhook_id}/{webhook_token}', webhook_id=webhook.id, webhook_token=webhook.token)
+        first: Optional[_BatchItem] = None
+        try:
+            while True:
+                first = entry.carry
+                entry.carry = None
+                if first is None:
+                    try:
+                        first = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        # enqueue doesn't start a new task while this one is still
+                        # running, so anything queued meanwhile is this task's to send
+                        if not queue.empty():
+                            continue
+                        if self._queues.get(webhook.id) is entry:
+                            del self._queues[webhook.id]
+                        return
+
+                # the batch is only built once the webhook's bucket has room, so
+                # everything queued while it was depleted goes into this execution
+                await async_context.get().wait_for_bucket(route, webhook.session)
+                batch = self._next_batch(entry, first)
+                first = None
+                username, avatar_url, thread_id, allowed_mentions = batch.key
+                try:
+                    await webhook.send(
+                        '\n'.join(batch.content) if batch.content else MISSING,
+                        embeds=batch.embeds or MISSING,
+                        username=username,
+                        avatar_url=avatar_url,
+                        thread=MISSING if thread_id is None else Object(id=thread_id),
+                        allowed_mentions=allowed_mentions,
+                    )
+                except Exception as exc:
+                    try:
+                        await self.on_error(webhook, exc, batch.size)
+                    except Exception:
+                        _log.exception('Ignoring exception in WebhookBatcher.on_error')
+                else:
+                    self.sent += batch.size
+                    self.executions += 1
+                finally:
+                    for _ in range(batch.size):
+                        queue.task_done()
+        finally:
+            # messages that were taken off the queue but not sent are given up
+            # on, otherwise flush() would wait for them forever
+            for item in (first, entry.carry):
+                if item is not None:
+                    queue.task_done()
+            entry.carry = None
+
@@ -32,12 +32,17 @@ from __future__ import annotations
 
 import threading
 import logging
+import heapq
 import json
 import time
 import re
+import os
+
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from urllib.parse import quote as urlquote
-from typing import Any, Dict, List, Literal, Optional, TYPE_CHECKING, Tuple, Type, TypeVar, Union, overload
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, TYPE_CHECKING, Tuple, Type, TypeVar, Union, overload
 
 from .. import utils
 from ..errors import InvalidArgument, HTTPException, Forbidden, NotFound, DiscordServerError
@@ -71,27 +76,55 @@ if TYPE_CHECKING:
 MISSING = utils.MISSING
 
 
-class DeferredLock:
-    def __init__(self, lock: threading.Lock):
-        self.lock = lock
-        self.delta: Optional[float] = None
+# Defaults for the session and worker pool shared by every SyncWebhook,
+# see SyncWebhook.configure_pool
+_DEFAULT_POOL_SIZE = 10
+_DEFAULT_MAX_WORKERS = 8
+_DEFAULT_MAX_PENDING = 1000
 
-    def __enter__(self):
-        self.lock.acquire()
-        return self
 
-    def delay_by(self, delta: float) -> None:
-        self.delta = delta
+class _Bucket:
+    __slots__ = ('lock', 'reset_at', 'last_used')
 
-    def __exit__(self, type, value, traceback):
-        if self.delta:
-            time.sleep(self.delta)
-        self.lock.release()
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        # when the bucket has refilled after being depleted
+        self.reset_at: float = 0.0
+        self.last_used: float = time.monotonic()
 
 
 class WebhookAdapter:
-    def __init__(self):
-        self._locks: Dict[Any, threading.Lock] = {}
+    def __init__(self, *, max_buckets: int = 4096, bucket_ttl: float = 300.0):
+        self.max_buckets: int = max_buckets
+        self.bucket_ttl: float = bucket_ttl
+        self._buckets: OrderedDict[Any, _Bucket] = OrderedDict()
+        self._buckets_lock: threading.Lock = threading.Lock()
+
+    def _bucket_for(self, key: Any) -> _Bucket:
+        with self._buckets_lock:
+            buckets = self._buckets
+            bucket = buckets.pop(key, None)
+            if bucket is None:
+                bucket = _Bucket()
+                self._prune()
+            bucket.last_used = time.monotonic()
+            buckets[key] = bucket
+            return bucket
+
+    def _prune(self) -> None:
+        # only the least recently used buckets are looked at, one that is
+        # still locked is in use and is kept
+        buckets = self._buckets
+        now = time.monotonic()
+        expiry = now - self.bucket_ttl
+        for _ in range(min(len(buckets), 8)):
+            key, bucket = next(iter(buckets.items()))
+            if len(buckets) < self.max_buckets and bucket.last_used > expiry:
+                return
+            if bucket.lock.locked() or bucket.reset_at > now:
+                buckets.move_to_end(key)
+                continue
+            del buckets[key]
 
     def request(
         self,
@@ -108,12 +141,7 @@ class WebhookAdapter:
         headers: Dict[str, str] = {}
         files = files or []
         to_send: Optional[Union[str, Dict[str, Any]]] = None
-        bucket = (route.webhook_id, route.webhook_token)
-
-        try:
-            lock = self._locks[bucket]
-        except KeyError:
-            self._locks[bucket] = lock = threading.Lock()
+        bucket = self._bucket_for(route.bucket)
 
         if payload is not None:
             headers['Content-Type'] = 'application/json'
@@ -132,7 +160,13 @@ class WebhookAdapter:
         url = route.url
         webhook_id = route.webhook_id
 
-        with DeferredLock(lock) as lock:
+        with bucket.lock:
+            # the bucket was depleted by an earlier request, the caller that
+            # depleted it has already returned and only this request waits
+            delay = bucket.reset_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
             for attempt in range(5):
                 for file in files:
                     file.reset(seek=attempt)
@@ -171,7 +205,7 @@ class WebhookAdapter:
                             _log.debug(
                                 'Webhook ID %s has been pre-emptively rate limited, waiting %.2f seconds', webhook_id, delta
                             )
-                            lock.delay_by(delta)
+                            bucket.reset_at = time.monotonic() + delta
 
                         if 300 > response.status_code >= 200:
                             return data
@@ -348,17 +382,163 @@ class WebhookAdapter:
         return self.request(route, session=session)
 
 
-class _WebhookContext(threading.local):
-    adapter: Optional[WebhookAdapter] = None
-
+# shared by every thread so that buckets are coordinated process wide
+_shared_adapter = WebhookAdapter()
 
-_context = _WebhookContext()
 
+class _Job:
+    __slots__ = ('key', 'future', 'fn', 'args', 'kwargs')
 
-def _get_webhook_adapter() -> WebhookAdapter:
-    if _context.adapter is None:
-        _context.adapter = WebhookAdapter()
-    return _context.adapter
+    def __init__(
+        self,
+        key: Any,
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        self.key: Any = key
+        self.future: Future = Future()
+        self.fn: Callable[..., Any] = fn
+        self.args: Tuple[Any, ...] = args
+        self.kwargs: Dict[str, Any] = kwargs
+
+
+class _BoundedExecutor:
+    # Only one job per bucket is handed to the pool at a time, the others
+    # wait in that bucket's queue. A job whose bucket is depleted is held
+    # back by the timer thread until it refills, so workers never sit on
+    # a bucket's lock or sleep out its reset while other buckets are ready.
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers, thread_name_prefix='discord-sync-webhook')
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_pending)
+        self._cond: threading.Condition = threading.Condition()
+        self._waiting: Dict[Any, Deque[_Job]] = {}
+        self._delayed: List[Tuple[float, int, _Job]] = []
+        self._counter: int = 0
+        self._timer: Optional[threading.Thread] = None
+        self._closed: bool = False
+
+    def submit(self, key: Any, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        # blocks the caller once max_pending sends are queued or running
+        self._slots.acquire()
+        job = _Job(key, fn, args, kwargs)
+        job.future.add_done_callback(lambda _: self._slots.release())
+        with self._cond:
+            waiting = self._waiting.get(key)
+            if waiting is not None:
+                waiting.append(job)
+            else:
+                self._waiting[key] = deque()
+                self._dispatch(job)
+        return job.future
+
+    def _dispatch(self, job: _Job) -> None:
+        # called with the condition held
+        delay = _shared_adapter._bucket_for(job.key).reset_at - time.monotonic()
+        if delay <= 0:
+            self._executor.submit(self._run, job)
+            return
+
+        self._counter += 1
+        heapq.heappush(self._delayed, (time.monotonic() + delay, self._counter, job))
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run_timer, name='discord-sync-webhook-timer', daemon=True)
+            self._timer.start()
+        elif self._delayed[0][2] is job:
+            self._cond.notify()
+
+    def _run(self, job: _Job) -> None:
+        future = job.future
+        if future.set_running_or_notify_cancel():
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        with self._cond:
+            waiting = self._waiting[job.key]
+            if waiting:
+                self._dispatch(waiting.popleft())
+                return
+            del self._waiting[job.key]
+            if self._closed and not self._waiting:
+                self._executor.shutdown(wait=False)
+                self._cond.notify()
+
+    def _run_timer(self) -> None:
+        cond = self._cond
+        delayed = self._delayed
+        with cond:
+            while True:
+                if not delayed:
+                    if self._closed:
+                        self._timer = None
+                        return
+                    cond.wait()
+                    continue
+                delay = delayed[0][0] - time.monotonic()
+                if delay > 0:
+                    cond.wait(delay)
+                    continue
+                _, _, job = heapq.heappop(delayed)
+                self._executor.submit(self._run, job)
+
+    def shutdown(self) -> None:
+        # jobs that were already submitted still run, the pool and the
+        # timer thread stop once the last of them has finished
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            if not self._waiting:
+                self._executor.shutdown(wait=False)
+
+
+class _SharedPool:
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.session: Optional[Session] = None
+        self.executor: Optional[_BoundedExecutor] = None
+        self.pool_size: int = _DEFAULT_POOL_SIZE
+        self.max_workers: int = _DEFAULT_MAX_WORKERS
+        self.max_pending: int = _DEFAULT_MAX_PENDING
+
+    def get_session(self) -> Session:
+        with self.lock:
+            if self.session is None:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.session = session
+            return self.session
+
+    def get_executor(self) -> _BoundedExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = _BoundedExecutor(self.max_workers, self.max_pending)
+            return self.executor
+
+
+_pool = _SharedPool()
+
+
+def _reset_after_fork() -> None:
+    # the pool's threads and the session's connections belong to the parent,
+    # and any of these locks could have been held by one of its threads
+    global _pool
+
+    _pool = _SharedPool()
+    _shared_adapter._buckets.clear()
+    _shared_adapter._buckets_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 class SyncWebhookMessage(Message):
@@ -539,8 +719,8 @@ class SyncWebhook(BaseWebhook):
         session: :class:`requests.Session`
             The session to use to send requests with. Note
             that the library does not manage the session and
-            will not close it. If not given, the ``requests``
-            auto session creation functions are used instead.
+            will not close it. If not given, a session shared by all
+            webhooks is used so that connections are pooled.
         bot_token: Optional[:class:`str`]
             The bot authentication token for authenticated requests
             involving the webhook.
@@ -562,7 +742,7 @@ class SyncWebhook(BaseWebhook):
             if not isinstance(session, requests.Session):
                 raise TypeError(f'expected requests.Session not {session.__class__!r}')
         else:
-            session = requests  # type: ignore
+            session = _pool.get_session()
         return cls(data, session, token=bot_token)
 
     @classmethod
@@ -576,8 +756,8 @@ class SyncWebhook(BaseWebhook):
         session: :class:`requests.Session`
             The session to use to send requests with. Note
             that the library does not manage the session and
-            will not close it. If not given, the ``requests``
-            auto session creation functions are used instead.
+            will not close it. If not given, a session shared by all
+            webhooks is used so that connections are pooled.
         bot_token: Optional[:class:`str`]
             The bot authentication token for authenticated requests
             involving the webhook.
@@ -605,7 +785,7 @@ class SyncWebhook(BaseWebhook):
             if not isinstance(session, requests.Session):
                 raise TypeError(f'expected requests.Session not {session.__class__!r}')
         else:
-            session = requests  # type: ignore
+            session = _pool.get_session()
         return cls(data, session, token=bot_token)  # type: ignore
 
     def fetch(self, *, prefer_auth: bool = True) -> SyncWebhook:
@@ -639,7 +819,7 @@ class SyncWebhook(BaseWebhook):
         :class:`SyncWebhook`
             The fetched webhook.
         """
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
 
         if prefer_auth and self.auth_token:
             data = adapter.fetch_webhook(self.id, self.auth_token, session=self.session)
@@ -677,7 +857,7 @@ class SyncWebhook(BaseWebhook):
         if self.token is None and self.auth_token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
 
         if prefer_auth and self.auth_token:
             adapter.delete_webhook(self.id, token=self.auth_token, session=self.session, reason=reason)
@@ -736,7 +916,7 @@ class SyncWebhook(BaseWebhook):
         if avatar is not MISSING:
             payload['avatar'] = utils._bytes_to_base64_data(avatar) if avatar is not None else None
 
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
 
         data: Optional[WebhookPayload] = None
         # If a channel is given, always use the authenticated endpoint
@@ -901,7 +1081,7 @@ class SyncWebhook(BaseWebhook):
             allowed_mentions=allowed_mentions,
             previous_allowed_mentions=previous_mentions,
         )
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
         thread_id: Optional[int] = None
         if thread is not MISSING:
             thread_id = thread.id
@@ -919,6 +1099,107 @@ class SyncWebhook(BaseWebhook):
         if wait:
             return self._create_message(data)
 
+    def send_async(
+        self,
+        content: str = MISSING,
+        *,
+        username: str = MISSING,
+        avatar_url: Any = MISSING,
+        tts: bool = False,
+        file: File = MISSING,
+        files: List[File] = MISSING,
+        embed: Embed = MISSING,
+        embeds: List[Embed] = MISSING,
+        allowed_mentions: AllowedMentions = MISSING,
+        thread: Snowflake = MISSING,
+        wait: bool = False,
+    ) -> Future:
+        """Sends a message using the webhook from a shared worker pool.
+
+        This takes the same parameters as :meth:`send`, but returns immediately
+        instead of waiting for the request and any rate limits or retries.
+        The request is made by a bounded pool of worker threads shared by
+        every webhook. If too many messages are already pending, this blocks
+        until one of them finishes. See :meth:`configure_pool` for the limits.
+
+        Messages sent to the same webhook are sent one at a time in the order
+        they were queued. While the webhook is rate limited its messages wait
+        without holding on to a worker thread.
+
+        .. versionadded:: 2.0
+
+        Raises
+        --------
+        InvalidArgument
+            There was no token associated with this webhook.
+
+        Returns
+        ---------
+        :class:`concurrent.futures.Future`
+            A future that resolves to what :meth:`send` returns, or to the
+            exception it raised.
+        """
+
+        if self.token is None:
+            raise InvalidArgument('This webhook does not have a token associated with it')
+
+        route = Route('POST', '/webhooks/{webhook_id}/{webhook_token}', webhook_id=self.id, webhook_token=self.token)
+        return _pool.get_executor().submit(
+            route.bucket,
+            self.send,
+            content,
+            username=username,
+            avatar_url=avatar_url,
+            tts=tts,
+            file=file,
+            files=files,
+            embed=embed,
+            embeds=embeds,
+            allowed_mentions=allowed_mentions,
+            thread=thread,
+            wait=wait,
+        )
+
+    @staticmethod
+    def configure_pool(
+        *,
+        pool_size: int = MISSING,
+        max_workers: int = MISSING,
+        max_pending: int = MISSING,
+    ) -> None:
+        """Configures the session and worker pool shared by all webhooks.
+
+        This affects webhooks created without an explicit session, and
+        :meth:`send_async`. Webhooks that already use the shared session keep
+        using the old one until they are created again.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ------------
+        pool_size: :class:`int`
+            The number of connections kept open to Discord. Defaults to ``10``.
+        max_workers: :class:`int`
+            The number of threads used by :meth:`send_async`. Defaults to ``8``.
+        max_pending: :class:`int`
+            The number of :meth:`send_async` calls that can be queued or running
+            before further calls block. Defaults to ``1000``.
+        """
+
+        with _pool.lock:
+            if pool_size is not MISSING:
+                _pool.pool_size = pool_size
+                _pool.session = None
+            if max_workers is not MISSING or max_pending is not MISSING:
+                if max_workers is not MISSING:
+                    _pool.max_workers = max_workers
+                if max_pending is not MISSING:
+                    _pool.max_pending = max_pending
+                if _pool.executor is not None:
+                    # pending sends still finish on the old pool
+                    _pool.executor.shutdown()
+                    _pool.executor = None
+
     def fetch_message(self, id: int, /) -> SyncWebhookMessage:
         """Retrieves a single :class:`~discord.SyncWebhookMessage` owned by this webhook.
 
@@ -949,7 +1230,7 @@ class SyncWebhook(BaseWebhook):
         if self.token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
         data = adapter.get_webhook_message(
             self.id,
             self.token,
@@ -1023,7 +1304,7 @@ class SyncWebhook(BaseWebhook):
             allowed_mentions=allowed_mentions,
             previous_allowed_mentions=previous_mentions,
         )
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
         data = adapter.edit_webhook_message(
             self.id,
             self.token,
@@ -1058,7 +1339,7 @@ class SyncWebhook(BaseWebhook):
         if self.token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter: WebhookAdapter = _get_webhook_adapter()
+        adapter: WebhookAdapter = _shared_adapter
         adapter.delete_webhook_message(
             self.id,
             self.token,
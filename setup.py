@@ -42,6 +42,7 @@ extras_require = {
     ],
     'speed': [
         'orjson>=3.5.4',
+        'numpy',
     ]
 }
 
@@ -50,6 +51,7 @@ packages = [
     'discord.types',
     'discord.ui',
     'discord.webhook',
+    'discord.testing',
     'discord.ext.commands',
     'discord.ext.tasks',
 ]